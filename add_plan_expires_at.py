@@ -0,0 +1,29 @@
+import sqlite3
+
+# Connect to database
+conn = sqlite3.connect('sql_app.db')
+cursor = conn.cursor()
+
+try:
+    # Indexed datetime expiry used by the plan-expiry sweeper
+    try:
+        cursor.execute("ALTER TABLE user ADD COLUMN plan_expires_at DATETIME")
+        print("Successfully added plan_expires_at column")
+    except sqlite3.OperationalError as e:
+        if "duplicate column name" in str(e):
+            print("Column already exists")
+        else:
+            raise
+    cursor.execute("CREATE INDEX IF NOT EXISTS ix_user_plan_expires_at ON user (plan_expires_at)")
+
+    # Backfill from the ISO strings in plan_expiry ("2025-01-01T10:00:00" -> "2025-01-01 10:00:00")
+    cursor.execute(
+        "UPDATE user SET plan_expires_at = replace(plan_expiry, 'T', ' ') "
+        "WHERE plan_expiry IS NOT NULL AND plan_expires_at IS NULL"
+    )
+    print(f"Backfilled {cursor.rowcount} expiry dates")
+    conn.commit()
+except sqlite3.OperationalError as e:
+    print(f"Error: {e}")
+finally:
+    conn.close()
@@ -0,0 +1,20 @@
+import sqlite3
+
+# Connect to database
+conn = sqlite3.connect('sql_app.db')
+cursor = conn.cursor()
+
+try:
+    # Indexes for the admin dashboard counts and filters (same names SQLAlchemy gives new databases)
+    for column in ("is_paid", "is_verified", "is_active"):
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS ix_user_{column} ON user ({column})")
+        print(f"Index ix_user_{column} ready")
+    # Expression index for the case-insensitive email prefix search
+    cursor.execute("CREATE INDEX IF NOT EXISTS ix_user_email_lower ON user (lower(email))")
+    print("Index ix_user_email_lower ready")
+    cursor.execute("ANALYZE user")
+    conn.commit()
+except sqlite3.OperationalError as e:
+    print(f"Error: {e}")
+finally:
+    conn.close()
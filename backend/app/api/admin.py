@@ -1,10 +1,13 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from datetime import datetime
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import FileResponse
+from sqlalchemy import case, func, select
 from pydantic import BaseModel, EmailStr
 
 from backend.app.api import deps
+from backend.app.core import profiler
+from backend.app.db.session import engine
 from backend.app.models.user import User
 
 router = APIRouter()
@@ -32,93 +35,167 @@ class GrantPremiumRequest(BaseModel):
     user_id: int
     plan_type: str = "lifetime"
 
-def get_current_admin(current_user: User = Depends(deps.get_current_user)) -> User:
+async def get_current_admin(current_user: User = Depends(deps.get_current_user)) -> User:
     if not current_user.is_admin:
         raise HTTPException(status_code=403, detail="Admin access required")
     return current_user
 
 @router.get("/stats", response_model=AdminStatsResponse)
-def get_admin_stats(
-    db: Session = Depends(deps.get_db),
+async def get_admin_stats(
+    db=Depends(deps.get_db),
     admin: User = Depends(get_current_admin)
 ) -> Any:
-    total_users = db.query(func.count(User.id)).scalar()
-    verified_users = db.query(func.count(User.id)).filter(User.is_verified == True).scalar()
-    premium_users = db.query(func.count(User.id)).filter(User.is_paid == True).scalar()
-    active_users = db.query(func.count(User.id)).filter(User.is_active == True).scalar()
-    
-    return {
-        "total_users": total_users,
-        "verified_users": verified_users,
-        "premium_users": premium_users,
-        "active_users": active_users
+    stats = deps.admin_stats_cache.get("stats")
+    if stats is not None:
+        return stats
+
+    def count_where(condition):
+        return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+    # One pass over the table instead of a COUNT per figure
+    row = (await db.execute(select(
+        func.count(User.id),
+        count_where(User.is_verified == True),
+        count_where(User.is_paid == True),
+        count_where(User.is_active == True)
+    ))).one()
+    stats = {
+        "total_users": row[0],
+        "verified_users": row[1],
+        "premium_users": row[2],
+        "active_users": row[3]
     }
+    deps.admin_stats_cache.set("stats", stats)
+    return stats
+
+def _email_prefix_match(prefix: str, dialect: str):
+    """
+    Case-insensitive prefix match on lower(email) that the ix_user_email_lower
+    expression index serves. Stored emails keep their original case.
+
+    Postgres gets LIKE 'prefix%' with the wildcards in the prefix escaped (the
+    index uses text_pattern_ops, so LIKE can use it under any collation).
+    SQLite's LIKE cannot use an expression index, so it gets the equivalent
+    range, which compares bytes and needs no escaping.
+    """
+    prefix = prefix.lower()
+    email = func.lower(User.email)
+    if dialect == "sqlite":
+        upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+        return (email >= prefix) & (email < upper)
+    escaped = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return email.like(escaped + "%", escape="\\")
 
 @router.get("/users", response_model=List[UserListResponse])
-def get_all_users(
-    skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(deps.get_db),
+async def get_all_users(
+    response: Response,
+    cursor: Optional[int] = Query(None, description="X-Next-Cursor from the previous page"),
+    limit: int = Query(100, ge=1, le=500),
+    skip: Optional[int] = Query(None, ge=0, deprecated=True, description="Offset paging; ignored when cursor is given"),
+    email: Optional[str] = Query(None, min_length=1, description="Email prefix, case-insensitive"),
+    is_paid: Optional[bool] = None,
+    is_verified: Optional[bool] = None,
+    plan_type: Optional[str] = None,
+    expires_after: Optional[datetime] = None,
+    expires_before: Optional[datetime] = None,
+    include_total: bool = Query(False, description="Also count all matches into X-Total-Count"),
+    db=Depends(deps.get_db),
     admin: User = Depends(get_current_admin)
 ) -> Any:
-    users = db.query(User).offset(skip).limit(limit).all()
+    """
+    Users ordered by id, paged by keyset: pass the X-Next-Cursor header of a
+    page as cursor to get the next one (no header on the last page).
+    """
+    filters = []
+    if email:
+        filters.append(_email_prefix_match(email, engine.dialect.name))
+    if is_paid is not None:
+        filters.append(User.is_paid == is_paid)
+    if is_verified is not None:
+        filters.append(User.is_verified == is_verified)
+    if plan_type:
+        filters.append(User.plan_type == plan_type)
+    if expires_after:
+        filters.append(User.plan_expires_at >= expires_after)
+    if expires_before:
+        filters.append(User.plan_expires_at < expires_before)
+
+    query = select(User).where(*filters).order_by(User.id)
+    if cursor is not None:
+        query = query.where(User.id > cursor)
+    elif skip:
+        query = query.offset(skip)
+    # One extra row tells whether there is a next page
+    users = (await db.execute(query.limit(limit + 1))).scalars().all()
+    if len(users) > limit:
+        users = users[:limit]
+        response.headers["X-Next-Cursor"] = str(users[-1].id)
+
+    if include_total:
+        total = await db.scalar(select(func.count(User.id)).where(*filters))
+        response.headers["X-Total-Count"] = str(total)
     return users
 
 @router.post("/grant-premium")
-def grant_premium(
+async def grant_premium(
     request: GrantPremiumRequest,
-    db: Session = Depends(deps.get_db),
+    db=Depends(deps.get_db),
     admin: User = Depends(get_current_admin)
 ) -> Any:
-    user = db.query(User).filter(User.id == request.user_id).first()
+    user = await db.get(User, request.user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
     user.is_paid = True
     user.plan_type = request.plan_type
     user.plan_expiry = None  # Lifetime
-    db.commit()
+    user.plan_expires_at = None
+    await db.commit()
+    deps.invalidate_user(user.email)
     
     return {"message": f"Premium access granted to {user.email}"}
 
 @router.post("/revoke-premium")
-def revoke_premium(
+async def revoke_premium(
     user_id: int,
-    db: Session = Depends(deps.get_db),
+    db=Depends(deps.get_db),
     admin: User = Depends(get_current_admin)
 ) -> Any:
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
     user.is_paid = False
     user.plan_type = None
     user.plan_expiry = None
-    db.commit()
+    user.plan_expires_at = None
+    await db.commit()
+    deps.invalidate_user(user.email)
     
     return {"message": f"Premium access revoked from {user.email}"}
 
 @router.post("/create-super-user")
-def create_super_user(
-    db: Session = Depends(deps.get_db)
+async def create_super_user(
+    db=Depends(deps.get_db)
 ) -> Any:
     # Check if admin already exists
-    user = db.query(User).filter(User.email == "admin@example.com").first()
+    user = (await db.execute(select(User).where(User.email == "admin@example.com"))).scalars().first()
     if user:
         user.is_admin = True
         user.is_paid = True
         user.plan_type = "lifetime"
         # Reset password to ensure it's known
-        from backend.app.core.security import get_password_hash
-        user.hashed_password = get_password_hash("adminpassword")
-        db.commit()
+        from backend.app.core.security import hash_password
+        user.hashed_password = await hash_password("adminpassword")
+        await db.commit()
+        deps.invalidate_user(user.email)
         return {"message": "Admin user updated successfully. Login with admin@example.com / adminpassword"}
     
     # Create new admin
-    from backend.app.core.security import get_password_hash
+    from backend.app.core.security import hash_password
     user = User(
         email="admin@example.com",
-        hashed_password=get_password_hash("adminpassword"),
+        hashed_password=await hash_password("adminpassword"),
         is_active=True,
         is_paid=True,
         is_verified=True,
@@ -127,5 +204,18 @@ def create_super_user(
         full_name="Admin User"
     )
     db.add(user)
-    db.commit()
+    await db.commit()
+    deps.invalidate_user(user.email)
     return {"message": "Admin user created successfully. Login with admin@example.com / adminpassword"}
+
+@router.get("/profiles")
+def list_profiles(admin: User = Depends(get_current_admin)) -> Any:
+    """Collapsed-stack request profiles, newest first"""
+    return profiler.list_profiles()
+
+@router.get("/profiles/{name}")
+def download_profile(name: str, admin: User = Depends(get_current_admin)) -> Any:
+    path = profiler.profile_path(name)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, media_type="text/plain", filename=name)
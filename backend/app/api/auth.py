@@ -2,13 +2,15 @@ import random
 import string
 from datetime import timedelta
 from typing import Any
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel, EmailStr
 
 from backend.app.api import deps
 from backend.app.core import security
+from backend.app.core.google_auth import GoogleTokenError, verify_id_token
 from backend.app.models.user import User
 from backend.app.services.email_service import EmailService
 
@@ -38,37 +40,45 @@ class VerifyOtpRequest(BaseModel):
     email: EmailStr
     otp: str
 
+def hashing_busy(e: security.PasswordHashingBusy) -> HTTPException:
+    return HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+
 def generate_otp(length=6):
     return ''.join(random.choices(string.digits, k=length))
 
 @router.post("/register", response_model=UserResponse)
-def register(
+async def register(
     user_in: UserCreate,
-    background_tasks: BackgroundTasks,
-    db: Session = Depends(deps.get_db),
+    db=Depends(deps.get_db),
 ) -> Any:
-    user = db.query(User).filter(User.email == user_in.email).first()
+    user = (await db.execute(select(User).where(User.email == user_in.email))).scalars().first()
     if user:
         raise HTTPException(
             status_code=400,
             detail="The user with this email already exists in the system.",
         )
     
+    try:
+        hashed_password = await security.hash_password(user_in.password)
+    except security.PasswordHashingBusy as e:
+        raise hashing_busy(e)
+
     otp = generate_otp()
     print(f"🔐 GENERATED OTP FOR {user_in.email}: {otp}")
     
     user = User(
         email=user_in.email,
-        hashed_password=security.get_password_hash(user_in.password),
+        hashed_password=hashed_password,
         full_name=user_in.full_name,
         is_verified=False,
         otp=otp
     )
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    deps.invalidate_user(user.email)
+    await db.refresh(user)
     
-    # Send OTP Email in Background
+    # Send OTP Email (queued, delivered in the background)
     email_service = EmailService()
     subject = "Verify your email - Exceldrill AI"
     html_content = f"""
@@ -80,16 +90,16 @@ def register(
         </body>
     </html>
     """
-    background_tasks.add_task(email_service.send_email, user.email, subject, html_content)
+    email_service.send_email(user.email, subject, html_content)
         
     return user
 
 @router.post("/verify-otp")
-def verify_otp(
+async def verify_otp(
     request: VerifyOtpRequest,
-    db: Session = Depends(deps.get_db),
+    db=Depends(deps.get_db),
 ) -> Any:
-    user = db.query(User).filter(User.email == request.email).first()
+    user = (await db.execute(select(User).where(User.email == request.email))).scalars().first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
         
@@ -98,16 +108,26 @@ def verify_otp(
         
     user.is_verified = True
     user.otp = None # Clear OTP after successful verification
-    db.commit()
+    await db.commit()
+    deps.invalidate_user(user.email)
     
     return {"message": "Email verified successfully"}
 
 @router.post("/login", response_model=Token)
-def login(
-    db: Session = Depends(deps.get_db), form_data: OAuth2PasswordRequestForm = Depends()
+async def login(
+    db=Depends(deps.get_db), form_data: OAuth2PasswordRequestForm = Depends()
 ) -> Any:
-    user = db.query(User).filter(User.email == form_data.username).first()
-    if not user or not security.verify_password(form_data.password, user.hashed_password):
+    user = (await db.execute(select(User).where(User.email == form_data.username))).scalars().first()
+    try:
+        password_ok = user is not None and await security.check_password(form_data.password, user.hashed_password)
+        if password_ok and security.needs_rehash(user.hashed_password):
+            # BCRYPT_ROUNDS changed since this hash was made; upgrade it while we have the password
+            user.hashed_password = await security.hash_password(form_data.password)
+            await db.commit()
+            deps.invalidate_user(user.email)
+    except security.PasswordHashingBusy as e:
+        raise hashing_busy(e)
+    if not password_ok:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -127,7 +147,7 @@ def login(
     return {"access_token": access_token, "token_type": "bearer"}
 
 @router.get("/me", response_model=UserResponse)
-def read_users_me(
+async def read_users_me(
     current_user: User = Depends(deps.get_current_user),
 ) -> Any:
     return current_user
@@ -136,54 +156,51 @@ class GoogleAuthRequest(BaseModel):
     credential: str
 
 @router.post("/google", response_model=Token)
-def google_auth(
+async def google_auth(
     request: GoogleAuthRequest,
-    db: Session = Depends(deps.get_db),
+    db=Depends(deps.get_db),
 ) -> Any:
-    import requests
-    
-    # 1. Verify Google Token
+    # 1. Verify Google Token (locally, against Google's cached signing keys)
     try:
-        # Verify using Google's tokeninfo endpoint
-        google_response = requests.get(f"https://oauth2.googleapis.com/tokeninfo?id_token={request.credential}")
-        if google_response.status_code != 200:
-            raise HTTPException(status_code=400, detail="Invalid Google token")
-            
-        google_data = google_response.json()
-        
-        # Verify Audience (Client ID)
-        if google_data['aud'] != security.settings.GOOGLE_CLIENT_ID:
-             raise HTTPException(status_code=400, detail="Invalid token audience")
-             
-        email = google_data['email']
-        name = google_data.get('name')
-        
+        google_data = await run_in_threadpool(verify_id_token, request.credential)
+    except GoogleTokenError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid Google token: {e}")
     except Exception as e:
+        # Signing keys could not be fetched
         raise HTTPException(status_code=400, detail=f"Google authentication failed: {str(e)}")
 
+    email = google_data['email']
+    name = google_data.get('name')
+
     # 2. Check if user exists
-    user = db.query(User).filter(User.email == email).first()
+    user = (await db.execute(select(User).where(User.email == email))).scalars().first()
     
     if not user:
         # 3. Register new user
         # Generate a random password since they use Google to login
         random_password = ''.join(random.choices(string.ascii_letters + string.digits, k=16))
+        try:
+            hashed_password = await security.hash_password(random_password)
+        except security.PasswordHashingBusy as e:
+            raise hashing_busy(e)
         
         user = User(
             email=email,
-            hashed_password=security.get_password_hash(random_password),
+            hashed_password=hashed_password,
             full_name=name,
             is_verified=True, # Google emails are verified
             is_active=True
         )
         db.add(user)
-        db.commit()
-        db.refresh(user)
+        await db.commit()
+        deps.invalidate_user(user.email)
+        await db.refresh(user)
     else:
         # If user exists but wasn't verified (e.g. started normal signup but didn't finish), verify them now
         if not user.is_verified:
             user.is_verified = True
-            db.commit()
+            await db.commit()
+            deps.invalidate_user(user.email)
 
     # 4. Create Access Token
     access_token_expires = timedelta(minutes=security.settings.ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -1,27 +1,63 @@
-from typing import Generator, Optional
+from typing import AsyncGenerator, Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.orm import make_transient_to_detached
+from backend.app.core.cache import TTLCache
 from backend.app.core.config import settings
-from backend.app.db.session import SessionLocal
+from backend.app.db.session import SessionLocal, AsyncSessionLocal, ThreadpoolSession
 from backend.app.models.user import User
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/auth/login")
 
+# Column values of recently authenticated users, keyed by email (the token subject)
+user_cache = TTLCache("user", settings.USER_CACHE_TTL_SECONDS, settings.USER_CACHE_MAX_ENTRIES)
+# Aggregate user counts for /api/admin/stats
+admin_stats_cache = TTLCache("admin_stats", settings.ADMIN_STATS_CACHE_TTL_SECONDS, maxsize=1)
+
+def invalidate_user(email: str):
+    """Drop cached data for a user; call after committing any insert or change to that user's row"""
+    user_cache.invalidate(email)
+    admin_stats_cache.clear()
+
+def _cached_user(db, email: str) -> Optional[User]:
+    """
+    Rebuild the user from cached column values and attach it to this session
+    without a query, so routes can still modify and commit it as usual.
+    """
+    values = user_cache.get(email)
+    if values is None:
+        return None
+    user = User(**values)
+    make_transient_to_detached(user)
+    db.add(user)
+    return user
+
+def _cache_user(user: User):
+    user_cache.set(user.email, {column.key: getattr(user, column.key) for column in User.__table__.columns})
+
 class TokenData(BaseModel):
     email: Optional[str] = None
 
-def get_db() -> Generator:
+async def get_db() -> AsyncGenerator:
+    """
+    An AsyncSession when the async engine is available, else a ThreadpoolSession;
+    both are used the same way (await db.execute(select(...)), await db.commit()).
+    """
+    if AsyncSessionLocal is not None:
+        async with AsyncSessionLocal() as db:
+            yield db
+        return
+    db = ThreadpoolSession(SessionLocal(expire_on_commit=False))
     try:
-        db = SessionLocal()
         yield db
     finally:
-        db.close()
+        await db.close()
 
 async def get_current_user(
-    db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)
+    db=Depends(get_db), token: str = Depends(oauth2_scheme)
 ) -> User:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -39,18 +75,12 @@ async def get_current_user(
     except JWTError:
         raise credentials_exception
     
-    user = db.query(User).filter(User.email == token_data.email).first()
+    user = _cached_user(db, token_data.email)
     if user is None:
-        raise credentials_exception
-        
-    # Check for plan expiry
-    if user.is_paid and user.plan_expiry:
-        from datetime import datetime
-        expiry = datetime.fromisoformat(user.plan_expiry)
-        if datetime.utcnow() > expiry:
-            user.is_paid = False
-            user.plan_type = None
-            user.plan_expiry = None
-            db.commit()
-            
+        user = (await db.execute(select(User).where(User.email == token_data.email))).scalars().first()
+        if user is None:
+            raise credentials_exception
+        _cache_user(user)
+
+    # Expired plans are downgraded by PlanExpirySweeper; routes check user.has_active_plan
     return user
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException, Body, Depends, BackgroundTasks
+from fastapi import APIRouter, UploadFile, File, HTTPException, Body, Depends, Request
 from fastapi.responses import StreamingResponse, FileResponse
 from typing import Dict, Any, Optional
 from backend.app.services.data_processing import DataProcessor
@@ -8,62 +8,97 @@ from backend.app.services.excel_service import ExcelService
 from backend.app.services.html_dashboard_service import HtmlDashboardService
 from backend.app.services.data_quality_service import DataQualityService
 from backend.app.services.statistical_tests import StatisticalTestsService
+from backend.app.services.export_service import ExportService
 from backend.app.api import deps
+from backend.app.core.config import settings
+from backend.app.core.instrumentation import PhaseTimer
+from backend.app.core.scheduler import ReportScheduler, QueueFull
+from backend.app.core.metrics import REGISTRY, record_report_job, request_span
 from backend.app.models.user import User
 import io
 import uuid
 import os
+import gzip
+import time
 import asyncio
 
 router = APIRouter()
 
 # In-memory job store
-# Key: job_id, Value: {status: str, progress: int, result: str|None, error: str|None}
+# Key: job_id, Value: {status: str, progress: int, result: str|None, error: str|None, phases: list}
 jobs: Dict[str, Dict[str, Any]] = {}
 
+# Report generation runs on its own worker threads, shared fairly between users
+report_scheduler = ReportScheduler(
+    workers=settings.REPORT_WORKERS,
+    max_per_user=settings.REPORT_MAX_RUNNING_PER_USER,
+    max_queue=settings.REPORT_QUEUE_SIZE,
+    max_queued_per_user=settings.REPORT_MAX_QUEUED_PER_USER,
+    plan_weights=settings.REPORT_PLAN_WEIGHTS
+)
+
 def update_progress(job_id: str, progress: int):
     if job_id in jobs:
         jobs[job_id]['progress'] = progress
 
 def generate_report_task(job_id: str, report_format: str, processor: DataProcessor, ai_service: AIService, report_service: ReportService, color_scheme: str = 'kpmg'):
+    timer = PhaseTimer(trace_memory=settings.REPORT_TRACE_MEMORY)
+    # Share the span list with the job record so /report/status shows phases as they finish
+    jobs[job_id]['phases'] = timer.spans
+    started = time.perf_counter()
     try:
-        jobs[job_id]['status'] = 'processing'
-        jobs[job_id]['progress'] = 10
-        
-        stats = processor.get_statistics()
-        insights = ai_service.generate_insights(stats)
-        
-        jobs[job_id]['progress'] = 20
-        
-        # Define callback
-        def progress_callback(p):
-            update_progress(job_id, p)
-
-        # Initialize service with color scheme
-        report_service = ReportService(color_scheme=color_scheme)
-
-        if report_format == "word":
-            buffer = report_service.generate_word_report(processor.df, stats, insights, progress_callback)
-            filename = f"report_{job_id}.docx"
-        elif report_format == "ppt":
-            buffer = report_service.generate_ppt_report(processor.df, stats, insights, progress_callback)
-            filename = f"report_{job_id}.pptx"
-        elif report_format == "excel":
-            excel_service = ExcelService()
-            buffer = excel_service.generate_excel_report(processor.df, stats, insights)
-            filename = f"report_{job_id}.xlsx"
-        elif report_format == "html":
-            html_service = HtmlDashboardService()
-            buffer = html_service.generate_dashboard(processor.df, stats, insights)
-            filename = f"report_{job_id}.html"
-        else:
-            raise ValueError(f"Unsupported format: {report_format}")
-        
-        # Save to temp file
-        temp_path = os.path.join("temp", filename)
-        os.makedirs("temp", exist_ok=True)
-        with open(temp_path, "wb") as f:
-            f.write(buffer.getvalue())
+        with timer:
+            jobs[job_id]['status'] = 'processing'
+            jobs[job_id]['progress'] = 10
+            
+            with timer.span("statistics"):
+                stats = processor.get_statistics()
+            with timer.span("insights"):
+                insights = ai_service.generate_insights(stats)
+            
+            jobs[job_id]['progress'] = 20
+            
+            # Define callback
+            def progress_callback(p):
+                update_progress(job_id, p)
+
+            # Initialize service with color scheme
+            report_service = ReportService(color_scheme=color_scheme)
+            os.makedirs("temp", exist_ok=True)
+            buffer = None
+
+            if report_format == "word":
+                buffer = report_service.generate_word_report(processor.df, stats, insights, progress_callback, timer=timer)
+                filename = f"report_{job_id}.docx"
+            elif report_format == "ppt":
+                buffer = report_service.generate_ppt_report(processor.df, stats, insights, progress_callback, timer=timer)
+                filename = f"report_{job_id}.pptx"
+            elif report_format == "excel":
+                excel_service = ExcelService()
+                filename = f"report_{job_id}.xlsx"
+                if settings.EXCEL_STREAMING_EXPORT:
+                    # Streams straight to the temp file, no in-memory buffer
+                    excel_service.write_excel_report(processor.df, stats, insights, os.path.join("temp", filename), timer=timer)
+                else:
+                    buffer = excel_service.generate_excel_report(processor.df, stats, insights, timer=timer)
+            elif report_format == "html":
+                html_service = HtmlDashboardService()
+                buffer = html_service.generate_dashboard(processor.df, stats, insights, timer=timer)
+                filename = f"report_{job_id}.html"
+                if settings.DASHBOARD_GZIP:
+                    # Compressed once here, then served as-is on every download
+                    with timer.span("compression"):
+                        buffer = io.BytesIO(gzip.compress(buffer.getvalue(), compresslevel=9))
+                    filename += ".gz"
+            else:
+                raise ValueError(f"Unsupported format: {report_format}")
+            
+            # Save to temp file
+            temp_path = os.path.join("temp", filename)
+            if buffer is not None:
+                with timer.span("disk write"):
+                    with open(temp_path, "wb") as f:
+                        f.write(buffer.getvalue())
             
         jobs[job_id]['status'] = 'completed'
         jobs[job_id]['progress'] = 100
@@ -73,6 +108,8 @@ def generate_report_task(job_id: str, report_format: str, processor: DataProcess
         jobs[job_id]['status'] = 'failed'
         jobs[job_id]['error'] = str(e)
 
+    record_report_job(report_format, jobs[job_id]['status'], time.perf_counter() - started, timer)
+
 # ... (keep existing data_store and get_processor) ...
 # In-memory storage for simplicity (not production ready)
 # Key: session_id (or just 'default' for single user), Value: DataProcessor instance
@@ -83,6 +120,44 @@ def get_processor(session_id: str = "default") -> DataProcessor:
         data_store[session_id] = DataProcessor()
     return data_store[session_id]
 
+def _dataset_store_usage():
+    # Sizes are measured on load/clean; a deep measure per scrape would block the event loop
+    loaded = [p for p in list(data_store.values()) if p.df is not None]
+    return {
+        ('bytes',): sum(p.memory_bytes for p in loaded),
+        ('datasets',): len(loaded)
+    }
+
+def _report_queue_usage():
+    stats = report_scheduler.stats()
+    return {('queued',): stats['queued'], ('running',): stats['running'], ('workers',): stats['workers']}
+
+REGISTRY.gauge("dataset_store", "Loaded datasets and their in-memory size", ("measure",), callback=_dataset_store_usage)
+REGISTRY.gauge("report_scheduler_jobs", "Report jobs queued and running, and the worker count", ("state",),
+               callback=_report_queue_usage)
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """
+    Whether an Accept-Encoding header allows gzip. An explicit gzip entry wins
+    over "*", and q=0 means refused.
+    """
+    qualities = {}
+    for entry in accept_encoding.lower().split(","):
+        coding, _, params = entry.partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        qualities[coding.strip()] = q
+    for coding in ("gzip", "x-gzip", "*"):
+        if coding in qualities:
+            return qualities[coding] > 0
+    return False
+
 @router.post("/upload")
 async def upload_file(file: UploadFile = File(...)):
     processor = get_processor()
@@ -97,16 +172,43 @@ async def upload_file(file: UploadFile = File(...)):
 async def clean_data(action: str = Body(...), params: Dict[str, Any] = Body(default={})):
     processor = get_processor()
     try:
-        preview = processor.clean_data(action, params)
+        with request_span("clean"):
+            preview = processor.clean_data(action, params)
         return {"message": "Data cleaned", "preview": preview}
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+@router.get("/export/{export_format}")
+async def export_data(export_format: str):
+    """Stream the current (cleaned) dataset as csv, csv.gz, parquet or xlsx"""
+    processor = get_processor()
+    if processor.df is None:
+        raise HTTPException(status_code=400, detail="No data loaded")
+
+    export_service = ExportService()
+    try:
+        # Validation can scan the whole frame (Parquet schema inference): keep it off the event loop
+        stream = await asyncio.to_thread(export_service.stream, processor.df, export_format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    base_name = os.path.splitext(os.path.basename(processor.filename or "data"))[0]
+    file_format = ExportService.FORMATS[export_format]
+    filename = f"{base_name}_cleaned.{file_format['extension']}"
+
+    # Sync iterators are consumed in the threadpool, chunk by chunk
+    return StreamingResponse(
+        stream,
+        media_type=file_format['media_type'],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
 @router.get("/analyze")
 async def analyze_data():
     processor = get_processor()
     try:
-        stats = processor.get_statistics()
+        with request_span("statistics"):
+            stats = processor.get_statistics()
         return stats
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -115,7 +217,8 @@ async def analyze_data():
 async def analyze_univariate(column: str = Body(..., embed=True)):
     processor = get_processor()
     try:
-        result = processor.get_univariate_analysis(column)
+        with request_span("analysis"):
+            result = processor.get_univariate_analysis(column)
         return result
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -124,7 +227,8 @@ async def analyze_univariate(column: str = Body(..., embed=True)):
 async def analyze_bivariate(col1: str = Body(...), col2: str = Body(...)):
     processor = get_processor()
     try:
-        result = processor.get_bivariate_analysis(col1, col2)
+        with request_span("analysis"):
+            result = processor.get_bivariate_analysis(col1, col2)
         return result
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -133,7 +237,8 @@ async def analyze_bivariate(col1: str = Body(...), col2: str = Body(...)):
 async def analyze_multivariate(columns: list[str] = Body(..., embed=True)):
     processor = get_processor()
     try:
-        result = processor.get_multivariate_analysis(columns)
+        with request_span("analysis"):
+            result = processor.get_multivariate_analysis(columns)
         return result
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -142,7 +247,8 @@ async def analyze_multivariate(columns: list[str] = Body(..., embed=True)):
 async def chart_data(x_col: str = Body(...), y_col: str = Body(default=None), chart_type: str = Body(default="bar")):
     processor = get_processor()
     try:
-        data = processor.get_chart_data(x_col, y_col, chart_type)
+        with request_span("analysis"):
+            data = processor.get_chart_data(x_col, y_col, chart_type)
         return data
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -152,8 +258,10 @@ async def get_insights():
     processor = get_processor()
     ai_service = AIService()
     try:
-        stats = processor.get_statistics()
-        insights = ai_service.generate_insights(stats)
+        with request_span("statistics"):
+            stats = processor.get_statistics()
+        with request_span("insights"):
+            insights = ai_service.generate_insights(stats)
         return {"insights": insights}
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -161,10 +269,9 @@ async def get_insights():
 @router.post("/report/start/{report_format}")
 async def start_report_generation(
     report_format: str,
-    background_tasks: BackgroundTasks,
     current_user: User = Depends(deps.get_current_user)
 ):
-    if not current_user.is_paid:
+    if not current_user.has_active_plan:
         raise HTTPException(status_code=403, detail="Payment required to download reports.")
         
     if report_format not in ["word", "ppt", "excel", "html"]:
@@ -179,13 +286,19 @@ async def start_report_generation(
         "status": "pending",
         "progress": 0,
         "result": None,
-        "error": None
+        "error": None,
+        "phases": []
     }
     
     ai_service = AIService()
     report_service = ReportService(color_scheme=current_user.preferred_color_scheme or 'kpmg')
     
-    background_tasks.add_task(generate_report_task, job_id, report_format, processor, ai_service, report_service, current_user.preferred_color_scheme or 'kpmg')
+    try:
+        report_scheduler.submit(current_user.id, current_user.plan_type, generate_report_task,
+                                job_id, report_format, processor, ai_service, report_service, current_user.preferred_color_scheme or 'kpmg')
+    except QueueFull as e:
+        del jobs[job_id]
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(e.retry_after)})
     
     return {"job_id": job_id}
 
@@ -196,7 +309,7 @@ async def get_report_status(job_id: str):
     return jobs[job_id]
 
 @router.get("/report/download/{job_id}")
-async def download_generated_report(job_id: str):
+async def download_generated_report(job_id: str, request: Request):
     if job_id not in jobs:
         raise HTTPException(status_code=404, detail="Job not found")
         
@@ -209,6 +322,32 @@ async def download_generated_report(job_id: str):
         raise HTTPException(status_code=500, detail="File not found")
         
     filename = os.path.basename(file_path)
+
+    # Pre-gzipped dashboards: send the stored bytes with Content-Encoding, or
+    # inflate on the fly for clients that do not accept gzip
+    if filename.endswith(".html.gz"):
+        download_name = filename[:-len(".gz")]
+        if _accepts_gzip(request.headers.get("accept-encoding", "")):
+            return FileResponse(
+                file_path,
+                media_type="text/html",
+                filename=download_name,
+                headers={"Content-Encoding": "gzip", "Vary": "Accept-Encoding"}
+            )
+
+        def inflate():
+            with gzip.open(file_path, "rb") as f:
+                while True:
+                    chunk = f.read(1024 * 1024)
+                    if not chunk:
+                        break
+                    yield chunk
+
+        return StreamingResponse(
+            inflate(),
+            media_type="text/html",
+            headers={"Content-Disposition": f'attachment; filename="{download_name}"', "Vary": "Accept-Encoding"}
+        )
     
     # Determine media type based on file extension
     if filename.endswith(".docx"):
@@ -237,7 +376,8 @@ async def analyze_data_quality():
     
     try:
         quality_service = DataQualityService()
-        quality_report = quality_service.analyze_quality(processor.df)
+        with request_span("quality"):
+            quality_report = quality_service.analyze_quality(processor.df)
         return quality_report
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -255,16 +395,17 @@ async def run_statistical_test(
     try:
         stats_service = StatisticalTestsService()
         
-        if test_type == "anova":
-            result = stats_service.run_anova(processor.df, params['categorical_col'], params['numeric_col'])
-        elif test_type == "t_test":
-            result = stats_service.run_t_test(processor.df, params['group_col'], params['numeric_col'], params.get('test_type', 'independent'))
-        elif test_type == "normality":
-            result = stats_service.run_normality_test(processor.df, params['column'])
-        elif test_type == "chi_square":
-            result = stats_service.run_chi_square_test(processor.df, params['col1'], params['col2'])
-        else:
-            raise HTTPException(status_code=400, detail=f"Unknown test type: {test_type}")
+        with request_span("test"):
+            if test_type == "anova":
+                result = stats_service.run_anova(processor.df, params['categorical_col'], params['numeric_col'])
+            elif test_type == "t_test":
+                result = stats_service.run_t_test(processor.df, params['group_col'], params['numeric_col'], params.get('test_type', 'independent'))
+            elif test_type == "normality":
+                result = stats_service.run_normality_test(processor.df, params['column'])
+            elif test_type == "chi_square":
+                result = stats_service.run_chi_square_test(processor.df, params['col1'], params['col2'])
+            else:
+                raise HTTPException(status_code=400, detail=f"Unknown test type: {test_type}")
         
         return result
     except Exception as e:
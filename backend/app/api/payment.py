@@ -1,18 +1,15 @@
-import razorpay
 from datetime import datetime, timedelta
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from backend.app.api import deps
-from backend.app.core.config import settings
 from backend.app.models.user import User
+from backend.app.services import payment_gateway
+from backend.app.services.payment_gateway import PaymentGatewayError
 
 router = APIRouter()
 
-# Initialize Razorpay Client
-client = razorpay.Client(auth=(settings.RAZORPAY_KEY_ID, settings.RAZORPAY_KEY_SECRET))
-
 class OrderCreateRequest(BaseModel):
     plan_id: str = "lifetime" # '24h', 'monthly', 'lifetime'
 
@@ -30,45 +27,38 @@ PLANS = {
 }
 
 @router.post("/create-order", response_model=OrderResponse)
-def create_order(
+async def create_order(
     request: OrderCreateRequest,
     current_user: User = Depends(deps.get_current_user),
 ):
-    print(f"🔵 Creating order for user: {current_user.email} (ID: {current_user.id}), Plan: {request.plan_id}")
-    
     if request.plan_id not in PLANS:
         raise HTTPException(status_code=400, detail="Invalid plan ID")
     
     plan = PLANS[request.plan_id]
     
     try:
-        data = {
-            "amount": plan["amount"] * 100, # Convert to paise
-            "currency": "INR",
-            "receipt": f"receipt_order_{current_user.id}_{request.plan_id}",
-            "payment_capture": 1,
-            "notes": {
+        order = await run_in_threadpool(
+            payment_gateway.gateway.create_order,
+            current_user.id,
+            request.plan_id,
+            plan["amount"] * 100, # Convert to paise
+            notes={
                 "plan_id": request.plan_id,
                 "user_id": str(current_user.id),
                 "user_email": current_user.email
             }
-        }
-        print(f"🔵 Razorpay order data: {data}")
-        order = client.order.create(data=data)
-        print(f"✅ Razorpay order created: {order['id']}")
-        
-        return {
-            "id": order['id'],
-            "amount": order['amount'],
-            "currency": order['currency'],
-            "key_id": settings.RAZORPAY_KEY_ID,
-            "plan_id": request.plan_id
-        }
-    except Exception as e:
-        print(f"❌ Error creating Razorpay order: {str(e)}")
-        import traceback
-        traceback.print_exc()
-        raise HTTPException(status_code=400, detail=f"Failed to create order: {str(e)}")
+        )
+    except PaymentGatewayError as e:
+        print(f"❌ Error creating Razorpay order for user {current_user.id}: {str(e)}")
+        raise HTTPException(status_code=502 if e.unavailable else 400, detail=f"Failed to create order: {str(e)}")
+    
+    return {
+        "id": order['id'],
+        "amount": order['amount'],
+        "currency": order['currency'],
+        "key_id": payment_gateway.gateway.key_id,
+        "plan_id": request.plan_id
+    }
 
 class PaymentVerifyRequest(BaseModel):
     razorpay_order_id: str
@@ -77,25 +67,19 @@ class PaymentVerifyRequest(BaseModel):
     plan_id: str
 
 @router.post("/verify-payment")
-def verify_payment(
+async def verify_payment(
     request: PaymentVerifyRequest,
-    db: Session = Depends(deps.get_db),
+    db=Depends(deps.get_db),
     current_user: User = Depends(deps.get_current_user),
 ):
-    print(f"🔵 Verifying payment for user: {current_user.email}, Plan: {request.plan_id}")
-    
+    # Verify signature (a local HMAC check, no gateway round-trip)
+    if not payment_gateway.gateway.verify_signature(
+        request.razorpay_order_id, request.razorpay_payment_id, request.razorpay_signature
+    ):
+        print(f"❌ Signature verification failed for user {current_user.id}, order {request.razorpay_order_id}")
+        raise HTTPException(status_code=400, detail="Payment verification failed")
+
     try:
-        # Verify signature
-        params_dict = {
-            'razorpay_order_id': request.razorpay_order_id,
-            'razorpay_payment_id': request.razorpay_payment_id,
-            'razorpay_signature': request.razorpay_signature
-        }
-        
-        print(f"🔵 Verifying Razorpay signature...")
-        client.utility.verify_payment_signature(params_dict)
-        print(f"✅ Razorpay signature verified")
-        
         # Update user status based on plan
         if request.plan_id not in PLANS:
              raise HTTPException(status_code=400, detail="Invalid plan ID")
@@ -107,13 +91,15 @@ def verify_payment(
         if plan["duration"]:
             expiry = datetime.utcnow() + plan["duration"]
             current_user.plan_expiry = expiry.isoformat()
+            current_user.plan_expires_at = expiry
         else:
             current_user.plan_expiry = None # Lifetime
+            current_user.plan_expires_at = None
         
-        print(f"🔵 Updating user in database...")
-        db.commit()
-        db.refresh(current_user)
-        print(f"✅ User updated: is_paid={current_user.is_paid}, plan_type={current_user.plan_type}")
+        await db.commit()
+        deps.invalidate_user(current_user.email)
+        payment_gateway.gateway.order_paid(current_user.id, request.plan_id)
+        print(f"✅ Payment verified for user {current_user.id}: plan_type={current_user.plan_type}")
         
         # Send Welcome Email
         try:
@@ -122,17 +108,15 @@ def verify_payment(
             # Use full_name if available, otherwise fallback
             user_name = current_user.full_name if current_user.full_name else "Valued User"
             email_service.send_welcome_premium_email(current_user.email, user_name)
-            print(f"✅ Welcome email sent to {current_user.email}")
         except Exception as e:
-            print(f"⚠️ Failed to send welcome email: {e}")
+            print(f"⚠️ Failed to queue welcome email: {e}")
 
         return {"status": "success", "message": "Payment verified successfully"}
-    except razorpay.errors.SignatureVerificationError as e:
-        print(f"❌ Signature verification failed: {str(e)}")
-        raise HTTPException(status_code=400, detail="Payment verification failed")
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"❌ Error verifying payment: {str(e)}")
         import traceback
         traceback.print_exc()
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=400, detail=f"Payment verification error: {str(e)}")
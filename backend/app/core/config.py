@@ -1,4 +1,5 @@
 import os
+from typing import Dict
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
@@ -9,17 +10,44 @@ class Settings(BaseSettings):
     SECRET_KEY: str = "YOUR_SUPER_SECRET_KEY_CHANGE_IN_PRODUCTION"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    # bcrypt cost for new password hashes (4-31); older hashes are upgraded on the next successful login
+    BCRYPT_ROUNDS: int = 12
+    # Password hashing runs on its own worker threads, not the threadpool shared with analytics
+    PASSWORD_HASH_WORKERS: int = 2
+    # Hash/verify requests waiting beyond this many are refused with 503
+    PASSWORD_HASH_MAX_PENDING: int = 64
     
     # Database
     # Database
     SQLALCHEMY_DATABASE_URI: str = os.getenv("DATABASE_URL", "sqlite:///./sql_app.db")
     if SQLALCHEMY_DATABASE_URI.startswith("postgres://"):
         SQLALCHEMY_DATABASE_URI = SQLALCHEMY_DATABASE_URI.replace("postgres://", "postgresql://", 1)
-    
+    # Async engine for auth, admin and payment routes (needs sqlalchemy[asyncio] plus
+    # aiosqlite or asyncpg); otherwise they run the sync session in the threadpool
+    DB_ASYNC: bool = True
+    # Connection pool for server databases (ignored for SQLite)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    # Reconnect connections older than this (seconds; -1 = never) and test them on checkout
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # SQLite: WAL journal (readers do not block the writer) with synchronous=NORMAL,
+    # and wait this long for a lock instead of failing with "database is locked"
+    SQLITE_WAL: bool = True
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+
     # Payment (Razorpay)
     # Get these from https://dashboard.razorpay.com/app/keys
     RAZORPAY_KEY_ID: str = os.getenv("RAZORPAY_KEY_ID", "rzp_live_Rm0j31foB7ikg9")
     RAZORPAY_KEY_SECRET: str = os.getenv("RAZORPAY_KEY_SECRET", "")
+    RAZORPAY_BASE_URL: str = "https://api.razorpay.com"
+    # Razorpay API calls share a keep-alive connection pool of this size
+    RAZORPAY_POOL_SIZE: int = 10
+    RAZORPAY_CONNECT_TIMEOUT_SECONDS: float = 3.0
+    RAZORPAY_READ_TIMEOUT_SECONDS: float = 10.0
+    # A repeated checkout for the same user and plan reuses the unpaid order this long
+    PAYMENT_ORDER_REUSE_SECONDS: float = 900.0
     
     # Email Settings (Gmail)
     SMTP_HOST: str = "smtp.gmail.com"
@@ -28,9 +56,79 @@ class Settings(BaseSettings):
     SMTP_PASSWORD: str = os.getenv("SMTP_PASSWORD", "ualr sjom xojb mncg") # Use env var or default app password
     EMAILS_FROM_EMAIL: str = "meettheanalyst@gmail.com"
     EMAILS_FROM_NAME: str = "ExcelDrill AI"
+    SMTP_STARTTLS: bool = True
+    SMTP_TIMEOUT_SECONDS: float = 10.0
+    # Outgoing mail is queued and sent by a background worker over one reused connection
+    EMAIL_QUEUE_SIZE: int = 1000
+    EMAIL_BATCH_SIZE: int = 20
+    EMAIL_MAX_RETRIES: int = 5
+    # First retry delay; doubles per attempt up to 60 s
+    EMAIL_RETRY_BACKOFF_SECONDS: float = 2.0
+    # Close the SMTP connection after this long without mail
+    SMTP_IDLE_TIMEOUT_SECONDS: float = 30.0
     
     # Google SSO
     GOOGLE_CLIENT_ID: str = "90600034364-o8r416gis9gqplo3ldt0a4tbpdonbm4q.apps.googleusercontent.com"
+    # ID tokens are verified locally against Google's signing keys, fetched from here
+    GOOGLE_JWKS_URL: str = "https://www.googleapis.com/oauth2/v3/certs"
+    # Signing keys are refetched after this long, or sooner when a token names an unknown key
+    GOOGLE_JWKS_CACHE_TTL_SECONDS: float = 3600.0
+    GOOGLE_JWKS_TIMEOUT_SECONDS: float = 5.0
+    # Allowed clock skew when checking token expiry
+    GOOGLE_TOKEN_LEEWAY_SECONDS: int = 60
+
+    # Authenticated user lookups are cached per token subject for this long;
+    # payment, admin and verification changes invalidate the entry (0 = off)
+    USER_CACHE_TTL_SECONDS: float = 30.0
+    USER_CACHE_MAX_ENTRIES: int = 10000
+    # Admin dashboard counts are cached this long, and dropped on any user change
+    ADMIN_STATS_CACHE_TTL_SECONDS: float = 30.0
+    # Expired plans are downgraded in bulk by a background sweep this often (0 = off)
+    PLAN_SWEEP_INTERVAL_SECONDS: float = 60.0
+
+    # Report job instrumentation
+    # Peak memory per phase uses tracemalloc, which slows allocation-heavy phases
+    # (openpyxl/python-docx object churn) several times over, so it is opt-in
+    REPORT_TRACE_MEMORY: bool = False
+    # Write Excel reports with a write-only workbook straight to disk (full raw data, flat memory)
+    EXCEL_STREAMING_EXPORT: bool = True
+
+    # Report scheduling (dedicated worker threads, fair share by plan)
+    REPORT_WORKERS: int = 2
+    REPORT_MAX_RUNNING_PER_USER: int = 1
+    REPORT_MAX_QUEUED_PER_USER: int = 5
+    REPORT_QUEUE_SIZE: int = 50
+    # On shutdown queued reports are dropped; running ones get this long to finish
+    REPORT_SHUTDOWN_TIMEOUT_SECONDS: float = 30.0
+    # Relative share of worker time per plan_type; unknown plans get the smallest weight
+    REPORT_PLAN_WEIGHTS: Dict[str, float] = {"lifetime": 3.0, "monthly": 2.0, "24h": 1.0}
+
+    # Request profiler: admins send PROFILE_HEADER: 1 to profile one request;
+    # PROFILE_SAMPLE_RATE profiles that fraction of all traffic (0 = off)
+    PROFILE_HEADER: str = "X-Profile"
+    PROFILE_SAMPLE_RATE: float = 0.0
+    PROFILE_INTERVAL_MS: float = 5.0
+    PROFILE_DIR: str = "profiles"
+    # Only the newest PROFILE_MAX_FILES collapsed-stack files are kept
+    PROFILE_MAX_FILES: int = 50
+
+    # HTML dashboard
+    # "figures" embeds a full Plotly figure per chart; "client" embeds the data once
+    # and draws the charts in the browser (much smaller files for large datasets)
+    DASHBOARD_RENDER_MODE: str = "figures"
+    # gzip + base64 the embedded data block in "client" mode
+    DASHBOARD_COMPRESS_DATA: bool = True
+    # Scatter trendlines: "ols", "lowess" or "none"
+    DASHBOARD_TRENDLINE: str = "ols"
+    # Scatter rendering by point count: SVG up to the first threshold, WebGL (scattergl)
+    # up to the second, a 2D density heatmap beyond it
+    DASHBOARD_SVG_MAX_POINTS: int = 5000
+    DASHBOARD_WEBGL_MAX_POINTS: int = 200000
+    DASHBOARD_DENSITY_BINS: int = 100
+    # Inline plotly.js and CSS instead of loading them from CDNs (self-contained, ~4.5 MB larger)
+    DASHBOARD_OFFLINE: bool = False
+    # Store finished dashboards as .html.gz and serve them with Content-Encoding: gzip
+    DASHBOARD_GZIP: bool = True
 
     class Config:
         case_sensitive = True
@@ -0,0 +1,163 @@
+import queue
+import smtplib
+import threading
+import time
+from typing import Callable, List, Optional, Tuple
+from email.message import Message
+from backend.app.core.metrics import REGISTRY
+
+EMAIL_MESSAGES = REGISTRY.counter("email_messages_total", "Outgoing emails by outcome (sent/retried/failed/dropped)", ("status",))
+
+
+def is_transient(error: Exception) -> bool:
+    """Dropped connections, network errors and 4xx replies are worth a retry; 5xx rejections are not"""
+    if isinstance(error, (smtplib.SMTPServerDisconnected, OSError)):
+        return True
+    if isinstance(error, smtplib.SMTPResponseException):
+        return 400 <= error.smtp_code < 500
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(400 <= code < 500 for code, _ in error.recipients.values())
+    return False
+
+
+class EmailQueue:
+    """
+    Delivers queued messages from one background thread over a persistent SMTP
+    connection. Messages are sent in batches of up to batch_size on the same
+    connection; the connection is reopened when the server drops it and closed
+    after idle_timeout seconds without mail. Transient failures are retried
+    with exponential backoff up to max_retries times; enqueue never blocks.
+    """
+
+    # Upper bound on a single backoff sleep
+    MAX_BACKOFF = 60.0
+
+    def __init__(self, connect: Callable[[], smtplib.SMTP], max_queue: int = 1000, batch_size: int = 20,
+                 max_retries: int = 5, backoff: float = 2.0, idle_timeout: float = 60.0):
+        self.connect = connect
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.idle_timeout = idle_timeout
+        self._queue: "queue.Queue[Optional[Tuple[Message, int]]]" = queue.Queue(maxsize=max_queue)
+        self._connection: Optional[smtplib.SMTP] = None
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._worker, name="email-queue", daemon=True)
+                self._thread.start()
+
+    def enqueue(self, message: Message) -> bool:
+        """Queue a message for delivery; False when the queue is full and the message was dropped"""
+        try:
+            self._queue.put_nowait((message, 0))
+        except queue.Full:
+            EMAIL_MESSAGES.inc(status="dropped")
+            print(f"❌ Email queue full, dropped message to {message['To']}")
+            return False
+        self._ensure_started()
+        return True
+
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    def _open(self) -> smtplib.SMTP:
+        if self._connection is None:
+            self._connection = self.connect()
+        return self._connection
+
+    def _close(self, graceful: bool = True):
+        connection, self._connection = self._connection, None
+        if connection is None:
+            return
+        try:
+            if graceful:
+                connection.quit()
+            else:
+                connection.close()
+        except Exception:
+            pass
+
+    def _next_batch(self) -> List[Optional[Tuple[Message, int]]]:
+        try:
+            batch = [self._queue.get(timeout=self.idle_timeout)]
+        except queue.Empty:
+            return []
+        while len(batch) < self.batch_size and batch[-1] is not None:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _send_batch(self, batch: List[Tuple[Message, int]]):
+        pending = list(batch)
+        while pending:
+            message, attempts = pending[0]
+            reused = self._connection is not None
+            try:
+                self._open().send_message(message)
+            except (smtplib.SMTPException, OSError) as e:
+                if reused and isinstance(e, smtplib.SMTPServerDisconnected):
+                    # The server closed an idle or long-lived connection: reconnect right away
+                    self._close(graceful=False)
+                    continue
+                if not is_transient(e):
+                    # Rejected sender, recipient or message: retrying will not help
+                    EMAIL_MESSAGES.inc(status="failed")
+                    print(f"❌ Failed to send email to {message['To']}: {e}")
+                    pending.pop(0)
+                    continue
+                self._close(graceful=False)
+                if attempts + 1 > self.max_retries:
+                    EMAIL_MESSAGES.inc(status="failed")
+                    print(f"❌ Failed to send email to {message['To']} after {attempts + 1} attempts: {e}")
+                    pending.pop(0)
+                    continue
+                EMAIL_MESSAGES.inc(status="retried")
+                delay = min(self.backoff * (2 ** attempts), self.MAX_BACKOFF)
+                print(f"⚠️ Email delivery failed ({e}); retrying in {delay:.1f}s")
+                pending[0] = (message, attempts + 1)
+                # Everything behind it would hit the same server, so the whole batch waits
+                if self._stopping.wait(delay):
+                    return
+                continue
+            EMAIL_MESSAGES.inc(status="sent")
+            print(f"✅ Email sent to {message['To']}")
+            pending.pop(0)
+
+    def _worker(self):
+        while not self._stopping.is_set():
+            batch = self._next_batch()
+            if not batch:
+                # Idle: let the connection go rather than have the server time it out
+                self._close()
+                continue
+            # None is the wake-up sentinel from stop()
+            self._send_batch([item for item in batch if item is not None])
+            for _ in batch:
+                self._queue.task_done()
+        self._close()
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """Wait up to timeout seconds for queued messages to be delivered; True if the queue drained"""
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.05)
+        return not self._queue.unfinished_tasks
+
+    def stop(self, timeout: float = 10.0):
+        """Deliver what is queued (up to timeout seconds), then stop the worker and close the connection"""
+        self.flush(timeout)
+        self._stopping.set()
+        if self._thread is not None:
+            try:
+                self._queue.put_nowait(None)
+            except queue.Full:
+                pass
+            self._thread.join(timeout=5)
+            self._thread = None
@@ -0,0 +1,93 @@
+import threading
+import time
+from typing import Any, Dict, Optional
+import requests
+from jose import jwt, JWTError
+from backend.app.core.cache import TTLCache
+from backend.app.core.config import settings
+
+GOOGLE_ISSUERS = ("accounts.google.com", "https://accounts.google.com")
+
+
+class GoogleTokenError(ValueError):
+    """The credential is not a valid Google ID token for this app"""
+
+
+class GoogleKeySet:
+    """
+    Google's ID-token signing keys (JWKS), fetched from GOOGLE_JWKS_URL and cached
+    for GOOGLE_JWKS_CACHE_TTL_SECONDS. A token signed with a key we have not seen
+    triggers an early refetch, so key rotation is picked up without waiting for
+    the TTL; those refetches are rate limited.
+    """
+
+    # Minimum gap between refetches triggered by unknown key ids
+    MIN_REFRESH_INTERVAL = 60.0
+
+    def __init__(self):
+        self.cache = TTLCache("google_jwks", settings.GOOGLE_JWKS_CACHE_TTL_SECONDS, maxsize=1)
+        self._lock = threading.Lock()
+        self._last_fetch = 0.0
+
+    def _fetch(self) -> Dict[str, Dict[str, Any]]:
+        response = requests.get(settings.GOOGLE_JWKS_URL, timeout=settings.GOOGLE_JWKS_TIMEOUT_SECONDS)
+        response.raise_for_status()
+        keys = {key['kid']: key for key in response.json()['keys']}
+        self.cache.set("keys", keys)
+        self._last_fetch = time.monotonic()
+        print(f"🔵 Fetched {len(keys)} Google signing key(s)")
+        return keys
+
+    def _stale(self, keys: Optional[Dict[str, Any]], kid: str) -> bool:
+        if keys is None:
+            return True
+        return kid not in keys and time.monotonic() - self._last_fetch >= self.MIN_REFRESH_INTERVAL
+
+    def get(self, kid: str) -> Dict[str, Any]:
+        keys = self.cache.get("keys")
+        if self._stale(keys, kid):
+            with self._lock:
+                # Another request may have refreshed the keys while this one waited
+                keys = self.cache.get("keys")
+                if self._stale(keys, kid):
+                    keys = self._fetch()
+        if kid not in keys:
+            raise GoogleTokenError("Token signed with an unknown key")
+        return keys[kid]
+
+    def clear(self):
+        self.cache.clear()
+        self._last_fetch = 0.0
+
+
+google_keys = GoogleKeySet()
+
+
+def verify_id_token(token: str) -> Dict[str, Any]:
+    """
+    Verify a Google ID token's signature, audience, issuer and expiry locally and
+    return its claims. Blocks only when the signing keys have to be (re)fetched.
+    """
+    try:
+        header = jwt.get_unverified_header(token)
+    except JWTError as e:
+        raise GoogleTokenError(f"Malformed token: {e}")
+    if header.get('alg') != "RS256" or not header.get('kid'):
+        raise GoogleTokenError("Unexpected token signing algorithm")
+
+    key = google_keys.get(header['kid'])
+    try:
+        claims = jwt.decode(
+            token,
+            key,
+            algorithms=["RS256"],
+            audience=settings.GOOGLE_CLIENT_ID,
+            issuer=GOOGLE_ISSUERS,
+            options={"leeway": settings.GOOGLE_TOKEN_LEEWAY_SECONDS}
+        )
+    except JWTError as e:
+        raise GoogleTokenError(str(e))
+
+    if not claims.get('email') or claims.get('email_verified') not in (True, "true"):
+        raise GoogleTokenError("Google account email is not verified")
+    return claims
@@ -0,0 +1,118 @@
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional
+
+# tracemalloc is process-wide, so concurrent jobs share one tracing session.
+# Keep a reference count so the last job to finish switches it off again.
+_tracing_lock = threading.Lock()
+_tracing_users = 0
+_tracing_owned = False
+
+
+def _acquire_tracing():
+    global _tracing_users, _tracing_owned
+    with _tracing_lock:
+        if _tracing_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _tracing_owned = True
+        _tracing_users += 1
+
+
+def _release_tracing():
+    global _tracing_users, _tracing_owned
+    with _tracing_lock:
+        _tracing_users = max(_tracing_users - 1, 0)
+        if _tracing_users == 0 and _tracing_owned:
+            tracemalloc.stop()
+            _tracing_owned = False
+
+
+class PhaseTimer:
+    """
+    Records named spans for a unit of work (e.g. one report job).
+
+    Each span captures wall time, CPU time of the calling thread and, when
+    memory tracing is enabled, the peak traced allocation above the level at
+    which the span started. Peaks are measured with tracemalloc, which is
+    process-wide: with several jobs running at once a span's peak includes
+    allocations made by the other jobs.
+    """
+
+    def __init__(self, trace_memory: bool = False):
+        self.trace_memory = trace_memory
+        self.spans: List[Dict[str, Any]] = []
+        self._stack: List[Dict[str, Any]] = []
+        self._tracing = False
+
+    def __enter__(self):
+        if self.trace_memory and not self._tracing:
+            _acquire_tracing()
+            self._tracing = True
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def close(self):
+        if self._tracing:
+            _release_tracing()
+            self._tracing = False
+
+    def _observe_peak(self):
+        """Fold the current tracemalloc peak into every open span."""
+        if not self._tracing or not self._stack:
+            return
+        _, peak = tracemalloc.get_traced_memory()
+        for frame in self._stack:
+            if peak > frame['peak']:
+                frame['peak'] = peak
+
+    @contextmanager
+    def span(self, name: str):
+        frame = {'name': name, 'peak': 0, 'base': 0}
+        if self._tracing:
+            self._observe_peak()
+            current, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            frame['base'] = current
+            frame['peak'] = current
+
+        self._stack.append(frame)
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall_start
+            cpu = time.thread_time() - cpu_start
+            self._observe_peak()
+            self._stack.pop()
+
+            record = {
+                'name': name,
+                'parent': self._stack[-1]['name'] if self._stack else None,
+                'wall_ms': round(wall * 1000, 2),
+                'cpu_ms': round(cpu * 1000, 2),
+                'peak_memory_mb': None
+            }
+            if self._tracing:
+                record['peak_memory_mb'] = round((frame['peak'] - frame['base']) / (1024 * 1024), 3)
+            self.spans.append(record)
+
+    def totals(self) -> Dict[str, Dict[str, float]]:
+        """Aggregate spans by name (useful when a phase repeats per column)"""
+        totals: Dict[str, Dict[str, float]] = {}
+        for span in self.spans:
+            entry = totals.setdefault(span['name'], {'count': 0, 'wall_ms': 0.0, 'cpu_ms': 0.0})
+            entry['count'] += 1
+            entry['wall_ms'] += span['wall_ms']
+            entry['cpu_ms'] += span['cpu_ms']
+        return totals
+
+
+def ensure_timer(timer: Optional[PhaseTimer]) -> PhaseTimer:
+    """Return the given timer, or a throwaway one so callers can always use spans."""
+    return timer if timer is not None else PhaseTimer()
@@ -0,0 +1,310 @@
+import re
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Any, List, Optional, Tuple
+from backend.app.core.instrumentation import PhaseTimer
+
+# Default latency buckets (seconds)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+# Payload size buckets (bytes), 256 B to 256 MB
+SIZE_BUCKETS = tuple(256 * 4 ** i for i in range(11))
+# Report jobs and their phases run for seconds to minutes
+JOB_BUCKETS = (0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = ''
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(n, '')) for n in self.labelnames)
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self.samples())
+        return '\n'.join(lines)
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}" for k, v in items]
+
+
+class Gauge(_Metric):
+    """Gauge set directly, or computed at scrape time by a callback returning {label values: value}"""
+    kind = 'gauge'
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                 callback: Optional[Callable[[], Dict[Tuple[str, ...], float]]] = None):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self.callback = callback
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels):
+        self.inc(-amount, **labels)
+
+    def samples(self) -> List[str]:
+        if self.callback is not None:
+            try:
+                items = list(self.callback().items())
+            except Exception as e:
+                print(f"Metrics callback for {self.name} failed: {e}")
+                items = []
+        else:
+            with self._lock:
+                items = list(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}" for k, v in items]
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+        # label values -> [bucket counts..., sum, count]
+        self._values: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [0.0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry[i] += 1
+                    break
+            entry[-2] += value
+            entry[-1] += 1
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = [(k, list(v)) for k, v in self._values.items()]
+        lines = []
+        for key, entry in items:
+            cumulative = 0.0
+            for bound, count in zip(self.buckets, entry):
+                cumulative += count
+                le = ('le', _format_value(bound))
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {_format_value(cumulative)}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(entry[-2])}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {_format_value(entry[-1])}")
+        return lines
+
+
+class MetricsRegistry:
+    """Holds metrics in registration order and renders them in the Prometheus text format"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (), callback=None) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames, callback))
+
+    def histogram(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                  buckets: Tuple[float, ...] = LATENCY_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return '\n'.join(m.render() for m in metrics) + '\n'
+
+
+REGISTRY = MetricsRegistry()
+
+HTTP_REQUESTS = REGISTRY.counter("http_requests_total", "HTTP requests by route and status", ("method", "route", "status"))
+HTTP_LATENCY = REGISTRY.histogram("http_request_duration_seconds", "HTTP request latency", ("method", "route"))
+HTTP_REQUEST_SIZE = REGISTRY.histogram("http_request_size_bytes", "HTTP request body size", ("route",), SIZE_BUCKETS)
+HTTP_RESPONSE_SIZE = REGISTRY.histogram("http_response_size_bytes", "HTTP response body size", ("route",), SIZE_BUCKETS)
+HTTP_IN_FLIGHT = REGISTRY.gauge("http_requests_in_flight", "HTTP requests currently being handled")
+REPORT_JOB_DURATION = REGISTRY.histogram("report_job_duration_seconds", "Report job duration", ("format", "status"), JOB_BUCKETS)
+REPORT_PHASE_DURATION = REGISTRY.histogram("report_phase_duration_seconds", "Report job phase duration", ("format", "phase"), JOB_BUCKETS)
+CACHE_REQUESTS = REGISTRY.counter("cache_requests_total", "Cache lookups by cache and result (hit/miss)", ("cache", "result"))
+
+
+def _threadpool_usage() -> Dict[Tuple[str, ...], float]:
+    # anyio's default limiter backs FastAPI's threadpool (sync routes, StreamingResponse iterators);
+    # only readable from the event loop thread, which is where /metrics renders
+    from anyio.to_thread import current_default_thread_limiter
+    limiter = current_default_thread_limiter()
+    statistics = limiter.statistics()
+    return {
+        ('in_use',): statistics.borrowed_tokens,
+        ('waiting',): statistics.tasks_waiting,
+        ('limit',): limiter.total_tokens
+    }
+
+
+REGISTRY.gauge("threadpool_tasks", "Web threadpool tokens in use, tasks waiting for a token, and the limit", ("state",),
+               callback=_threadpool_usage)
+
+
+def record_cache(cache: str, hit: bool):
+    CACHE_REQUESTS.inc(cache=cache, result='hit' if hit else 'miss')
+
+
+def record_report_job(report_format: str, status: str, seconds: float, timer: PhaseTimer):
+    REPORT_JOB_DURATION.observe(seconds, format=report_format, status=status)
+    for span in timer.spans:
+        # Per-column spans ("chart:age") are folded into their phase to keep label cardinality bounded
+        phase = span['name'].split(':', 1)[0]
+        REPORT_PHASE_DURATION.observe(span['wall_ms'] / 1000, format=report_format, phase=phase)
+
+
+# Route label for requests no route matched (404s for arbitrary paths)
+UNMATCHED_ROUTE = '<unmatched>'
+
+# Per-request phase timer for Server-Timing, set by MetricsMiddleware on analysis routes
+_request_timer: ContextVar[Optional[PhaseTimer]] = ContextVar("request_timer", default=None)
+
+# Route prefixes whose responses carry a Server-Timing header
+SERVER_TIMING_PREFIXES = ("/api/analyze", "/api/insights", "/api/chart-data", "/api/clean")
+
+
+@contextmanager
+def request_span(name: str):
+    """Time a phase of the current request; a no-op outside routes with Server-Timing"""
+    timer = _request_timer.get()
+    if timer is None:
+        yield
+        return
+    with timer.span(name):
+        yield
+
+
+def _server_timing(timer: PhaseTimer, total_ms: float) -> str:
+    entries = []
+    for name, totals in timer.totals().items():
+        token = re.sub(r'[^A-Za-z0-9_-]', '_', name)
+        entries.append(f'{token};dur={totals["wall_ms"]:.1f};desc="{_escape(name)}"')
+    entries.append(f'total;dur={total_ms:.1f}')
+    return ', '.join(entries)
+
+
+def _route_template(scope) -> str:
+    """
+    Route label for a finished request: the path template of the route the
+    router matched, so label cardinality stays bounded. Unmatched paths share
+    one label.
+
+    scope['route'] is the route as declared; FastAPI versions that keep
+    include_router() prefixes out of it record the full template in the
+    effective route context instead.
+    """
+    context = (scope.get('fastapi') or {}).get('effective_route_context')
+    path = getattr(context, 'path', None) or getattr(scope.get('route'), 'path', None)
+    return path if path else UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording request count, latency, sizes and in-flight requests"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        state = {'status': 500, 'request_bytes': 0, 'response_bytes': 0}
+        timer = PhaseTimer() if scope['path'].startswith(SERVER_TIMING_PREFIXES) else None
+        token = _request_timer.set(timer)
+
+        async def receive_wrapper():
+            message = await receive()
+            if message['type'] == 'http.request':
+                state['request_bytes'] += len(message.get('body', b''))
+            return message
+
+        async def send_wrapper(message):
+            if message['type'] == 'http.response.start':
+                state['status'] = message['status']
+                if timer is not None:
+                    elapsed = (time.perf_counter() - started) * 1000
+                    headers = list(message.get('headers', []))
+                    headers.append((b'server-timing', _server_timing(timer, elapsed).encode('latin-1')))
+                    message = dict(message, headers=headers)
+            elif message['type'] == 'http.response.body':
+                state['response_bytes'] += len(message.get('body', b''))
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            _request_timer.reset(token)
+            route_path = _route_template(scope)
+            method = scope.get('method', '')
+            HTTP_REQUESTS.inc(method=method, route=route_path, status=state['status'])
+            HTTP_LATENCY.observe(time.perf_counter() - started, method=method, route=route_path)
+            HTTP_REQUEST_SIZE.observe(state['request_bytes'], route=route_path)
+            HTTP_RESPONSE_SIZE.observe(state['response_bytes'], route=route_path)
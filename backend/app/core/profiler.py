@@ -0,0 +1,171 @@
+import os
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+from backend.app.core.config import settings
+
+
+class StackSampler:
+    """
+    Samples one thread's Python stack at a fixed interval from a background
+    thread and aggregates the samples as collapsed stacks ("a;b;c count"),
+    the input format of flamegraph.pl / speedscope.
+    """
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                frame = frame.f_back
+            self.stacks[';'.join(reversed(names))] += 1
+            self.samples += 1
+
+    def collapsed(self) -> str:
+        return '\n'.join(f"{stack} {count}" for stack, count in self.stacks.most_common()) + '\n'
+
+
+def _profile_dir() -> str:
+    os.makedirs(settings.PROFILE_DIR, exist_ok=True)
+    return settings.PROFILE_DIR
+
+
+def _enforce_retention(directory: str):
+    files = [os.path.join(directory, f) for f in os.listdir(directory) if f.endswith('.collapsed')]
+    files.sort(key=os.path.getmtime, reverse=True)
+    for path in files[settings.PROFILE_MAX_FILES:]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def profile_name(method: str, path: str) -> str:
+    slug = re.sub(r'[^A-Za-z0-9]+', '_', path).strip('_')[:60] or 'root'
+    return f"{datetime.utcnow().strftime('%Y%m%dT%H%M%S')}_{method.lower()}_{slug}_{uuid.uuid4().hex[:8]}.collapsed"
+
+
+def save_profile(sampler: StackSampler, name: str):
+    """Write the samples under PROFILE_DIR and prune the oldest files beyond PROFILE_MAX_FILES"""
+    directory = _profile_dir()
+    with open(os.path.join(directory, name), 'w') as f:
+        f.write(sampler.collapsed())
+    _enforce_retention(directory)
+
+
+def list_profiles() -> List[Dict[str, Any]]:
+    directory = _profile_dir()
+    profiles = []
+    for name in os.listdir(directory):
+        if not name.endswith('.collapsed'):
+            continue
+        stat = os.stat(os.path.join(directory, name))
+        profiles.append({
+            'name': name,
+            'size_bytes': stat.st_size,
+            'created_at': datetime.utcfromtimestamp(stat.st_mtime).isoformat()
+        })
+    profiles.sort(key=lambda p: p['created_at'], reverse=True)
+    return profiles
+
+
+def profile_path(name: str) -> Optional[str]:
+    """Resolve a profile name from list_profiles() to its file, rejecting anything else"""
+    if os.path.basename(name) != name or not name.endswith('.collapsed'):
+        return None
+    path = os.path.join(_profile_dir(), name)
+    return path if os.path.isfile(path) else None
+
+
+def _admin_from_token(token: str) -> bool:
+    from jose import jwt, JWTError
+    from backend.app.db.session import SessionLocal
+    from backend.app.models.user import User
+
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except JWTError:
+        return False
+    email = payload.get("sub")
+    if not email:
+        return False
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.email == email).first()
+        return bool(user and user.is_admin)
+    finally:
+        db.close()
+
+
+class ProfilerMiddleware:
+    """
+    Profiles a request with StackSampler when an admin sends the PROFILE_HEADER
+    header, or for a random PROFILE_SAMPLE_RATE fraction of traffic. The event
+    loop thread is sampled, which is where async routes (/clean, /analyze/*)
+    do their work; other requests running on the loop at the same time show
+    up in the samples too.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def _should_profile(self, scope) -> bool:
+        headers = {k.decode('latin-1').lower(): v.decode('latin-1') for k, v in scope.get('headers', [])}
+        if headers.get(settings.PROFILE_HEADER.lower(), '').lower() in ('1', 'true', 'yes'):
+            auth = headers.get('authorization', '')
+            if auth.lower().startswith('bearer '):
+                from starlette.concurrency import run_in_threadpool
+                return await run_in_threadpool(_admin_from_token, auth[7:])
+            return False
+        return settings.PROFILE_SAMPLE_RATE > 0 and random.random() < settings.PROFILE_SAMPLE_RATE
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or not await self._should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        # Named up front so the response can point at it
+        name = profile_name(scope.get('method', ''), scope['path'])
+        sampler = StackSampler(threading.get_ident(), settings.PROFILE_INTERVAL_MS / 1000)
+        started = time.perf_counter()
+        sampler.start()
+
+        async def send_wrapper(message):
+            if message['type'] == 'http.response.start':
+                headers = list(message.get('headers', []))
+                headers.append((b'x-profile-id', name.encode('latin-1')))
+                message = dict(message, headers=headers)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            sampler.stop()
+            save_profile(sampler, name)
+            print(f"Profiled {scope.get('method')} {scope['path']}: {sampler.samples} samples in "
+                  f"{(time.perf_counter() - started) * 1000:.0f} ms -> {name}")
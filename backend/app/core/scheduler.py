@@ -0,0 +1,173 @@
+import math
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Any, Optional, Tuple
+
+
+class QueueFull(Exception):
+    """Raised by ReportScheduler.submit when a job cannot be queued"""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class ReportScheduler:
+    """
+    Runs heavy jobs (report generation) on a fixed pool of worker threads,
+    separate from the web server's threadpool.
+
+    Jobs are queued per user and dispatched by weighted fair queueing: each job
+    gets a virtual finish tag of start + 1 / weight, where the weight comes from
+    the user's plan, and the eligible job with the smallest tag runs next. A
+    user never has more than max_per_user jobs running, and the total number of
+    waiting jobs is bounded by max_queue.
+    """
+
+    # Smoothing factor for the job duration average used to estimate drain rate
+    EWMA_ALPHA = 0.3
+    # Retry-After used before any job has completed
+    DEFAULT_RETRY_AFTER = 30
+
+    def __init__(self, workers: int, max_per_user: int, max_queue: int, max_queued_per_user: int,
+                 plan_weights: Dict[str, float]):
+        self.workers = workers
+        self.max_per_user = max_per_user
+        self.max_queue = max_queue
+        self.max_queued_per_user = max_queued_per_user
+        self.plan_weights = plan_weights
+
+        self._cond = threading.Condition()
+        self._queues: Dict[Any, Deque[Tuple[float, Callable, tuple, dict]]] = {}
+        self._running: Dict[Any, int] = {}
+        self._last_finish: Dict[Any, float] = {}
+        self._virtual_time = 0.0
+        self._queued = 0
+        self._avg_duration: Optional[float] = None
+        self._threads = []
+        self._stopping = False
+
+    def _weight(self, plan_type: Optional[str]) -> float:
+        return self.plan_weights.get(plan_type or "", min(self.plan_weights.values(), default=1.0))
+
+    def _ensure_started(self):
+        # Caller holds the lock
+        if self._threads:
+            return
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._worker, name=f"report-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def submit(self, user_key: Any, plan_type: Optional[str], fn: Callable, *args, **kwargs):
+        """Queue fn(*args, **kwargs) for user_key; raises QueueFull when it cannot be accepted"""
+        with self._cond:
+            if self._stopping:
+                raise QueueFull("Report scheduler is shutting down", self.DEFAULT_RETRY_AFTER)
+            if self._queued >= self.max_queue:
+                raise QueueFull("Report queue is full", self._retry_after())
+            queue = self._queues.setdefault(user_key, deque())
+            if len(queue) >= self.max_queued_per_user:
+                # The user's jobs drain at most max_per_user at a time, not at the pool's full rate
+                raise QueueFull("Too many reports queued for this user",
+                                self._retry_after(len(queue), min(self.workers, self.max_per_user)))
+
+            # Idle users restart at the current virtual time so they cannot bank credit
+            start = max(self._virtual_time, self._last_finish.get(user_key, 0.0))
+            finish = start + 1.0 / self._weight(plan_type)
+            self._last_finish[user_key] = finish
+            queue.append((finish, fn, args, kwargs))
+            self._queued += 1
+
+            self._ensure_started()
+            self._cond.notify()
+
+    def _next_job(self):
+        # Caller holds the lock; pick the eligible head-of-queue job with the smallest finish tag
+        best_key = None
+        best_finish = None
+        for key, queue in self._queues.items():
+            if not queue or self._running.get(key, 0) >= self.max_per_user:
+                continue
+            if best_finish is None or queue[0][0] < best_finish:
+                best_key, best_finish = key, queue[0][0]
+        if best_key is None:
+            return None
+
+        finish, fn, args, kwargs = self._queues[best_key].popleft()
+        if not self._queues[best_key]:
+            del self._queues[best_key]
+        self._queued -= 1
+        self._running[best_key] = self._running.get(best_key, 0) + 1
+        self._virtual_time = max(self._virtual_time, finish)
+        return best_key, fn, args, kwargs
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                job = self._next_job()
+                while job is None and not self._stopping:
+                    self._cond.wait()
+                    job = self._next_job()
+                if job is None:
+                    return
+
+            user_key, fn, args, kwargs = job
+            started = time.perf_counter()
+            try:
+                fn(*args, **kwargs)
+            except Exception as e:
+                print(f"Report job failed: {e}")
+            duration = time.perf_counter() - started
+
+            with self._cond:
+                running = self._running[user_key] - 1
+                if running:
+                    self._running[user_key] = running
+                else:
+                    del self._running[user_key]
+                    if user_key not in self._queues:
+                        self._last_finish.pop(user_key, None)
+                if self._avg_duration is None:
+                    self._avg_duration = duration
+                else:
+                    self._avg_duration = self.EWMA_ALPHA * duration + (1 - self.EWMA_ALPHA) * self._avg_duration
+                self._cond.notify_all()
+
+    def _retry_after(self, ahead: int = 1, parallelism: Optional[int] = None) -> int:
+        """Seconds until `ahead` queued jobs have drained, running `parallelism` (default: all workers) at a time"""
+        if self._avg_duration is None:
+            return self.DEFAULT_RETRY_AFTER
+        drain_rate = (parallelism or self.workers) / max(self._avg_duration, 1e-3)  # jobs per second
+        return max(1, math.ceil(ahead / drain_rate))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                'workers': self.workers,
+                'queued': self._queued,
+                'running': sum(self._running.values()),
+                'avg_job_seconds': round(self._avg_duration, 2) if self._avg_duration is not None else None
+            }
+
+    def shutdown(self, wait: bool = True, timeout: Optional[float] = None):
+        """
+        Stop accepting jobs and drop the queued ones; running jobs finish. With
+        wait, block until the workers exit, at most timeout seconds in total.
+        """
+        with self._cond:
+            self._stopping = True
+            dropped = self._queued
+            self._queues.clear()
+            self._queued = 0
+            running = sum(self._running.values())
+            self._cond.notify_all()
+        if dropped or running:
+            print(f"⚠️ Report scheduler stopping: {dropped} queued job(s) dropped, waiting for {running} running")
+        if wait:
+            deadline = None if timeout is None else time.monotonic() + timeout
+            for thread in self._threads:
+                thread.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
+            if any(thread.is_alive() for thread in self._threads):
+                print(f"❌ Report jobs still running after {timeout}s; abandoning them")
@@ -1,3 +1,6 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional, Union, Any
 from jose import jwt
@@ -20,4 +23,59 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 
 def get_password_hash(password: str) -> str:
     # bcrypt.hashpw returns bytes, we need to decode to store as string
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)).decode('utf-8')
+
+def needs_rehash(hashed_password: str) -> bool:
+    """True when the hash was made with a different cost than BCRYPT_ROUNDS ("$2b$<cost>$...")"""
+    parts = hashed_password.split('$')
+    return len(parts) < 4 or not parts[2].isdigit() or int(parts[2]) != settings.BCRYPT_ROUNDS
+
+
+class PasswordHashingBusy(Exception):
+    """Raised when too many hash/verify calls are already waiting for a worker"""
+
+    def __init__(self, message: str, retry_after: int = 1):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+# bcrypt is deliberately slow: it gets PASSWORD_HASH_WORKERS threads of its own so
+# signup and login spikes queue here instead of starving the shared threadpool
+_hash_executor: Optional[ThreadPoolExecutor] = None
+_hash_lock = threading.Lock()
+_hash_pending = 0
+
+def _executor() -> ThreadPoolExecutor:
+    global _hash_executor
+    with _hash_lock:
+        if _hash_executor is None:
+            _hash_executor = ThreadPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash")
+        return _hash_executor
+
+async def _run_hashing(fn, *args):
+    global _hash_pending
+    with _hash_lock:
+        if _hash_pending >= settings.PASSWORD_HASH_MAX_PENDING:
+            raise PasswordHashingBusy("Too many sign-in attempts in progress, please retry shortly")
+        _hash_pending += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_executor(), fn, *args)
+    finally:
+        with _hash_lock:
+            _hash_pending -= 1
+
+async def hash_password(password: str) -> str:
+    """get_password_hash on the password-hashing workers"""
+    return await _run_hashing(get_password_hash, password)
+
+async def check_password(plain_password: str, hashed_password: str) -> bool:
+    """verify_password on the password-hashing workers"""
+    return await _run_hashing(verify_password, plain_password, hashed_password)
+
+def shutdown_password_hashing():
+    """Stop the hashing workers; the next hash/verify call starts new ones"""
+    global _hash_executor
+    with _hash_lock:
+        executor, _hash_executor = _hash_executor, None
+    if executor is not None:
+        executor.shutdown(wait=True)
@@ -0,0 +1,70 @@
+import threading
+from datetime import datetime
+from typing import Callable, List, Optional
+from sqlalchemy import update
+
+
+class PlanExpirySweeper:
+    """
+    Downgrades expired plans in one bulk UPDATE every interval seconds on a
+    daemon thread, so request handling never writes to expire a plan.
+    Between sweeps, User.has_active_plan already treats the plan as expired.
+    """
+
+    def __init__(self, session_factory: Callable, interval: float,
+                 on_expired: Optional[Callable[[List[str]], None]] = None):
+        self.session_factory = session_factory
+        self.interval = interval
+        # Called with the emails of downgraded users (cache invalidation)
+        self.on_expired = on_expired
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def sweep(self, now: Optional[datetime] = None) -> int:
+        """Expire every paid plan whose plan_expires_at has passed; returns the number of users downgraded"""
+        from backend.app.models.user import User
+        now = now or datetime.utcnow()
+        expired = (User.is_paid == True) & (User.plan_expires_at.isnot(None)) & (User.plan_expires_at <= now)
+        db = self.session_factory()
+        try:
+            emails = [email for (email,) in db.query(User.email).filter(expired).all()]
+            if not emails:
+                return 0
+            db.execute(
+                update(User).where(expired).values(is_paid=False, plan_type=None, plan_expiry=None, plan_expires_at=None)
+            )
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+        if self.on_expired:
+            self.on_expired(emails)
+        print(f"Plan sweeper: expired {len(emails)} plan(s)")
+        return len(emails)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.sweep()
+            except Exception as e:
+                print(f"Plan sweeper failed: {e}")
+
+    def start(self):
+        if self._thread is not None or self.interval <= 0:
+            return
+        # Catch up on anything that expired while the server was down
+        try:
+            self.sweep()
+        except Exception as e:
+            print(f"Plan sweeper failed: {e}")
+        self._thread = threading.Thread(target=self._run, name="plan-expiry-sweeper", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
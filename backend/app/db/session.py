@@ -1,12 +1,131 @@
-from sqlalchemy import create_engine
+import logging
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+from anyio import to_thread
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from backend.app.core.config import settings
 
-connect_args = {}
-if "sqlite" in settings.SQLALCHEMY_DATABASE_URI:
-    connect_args["check_same_thread"] = False
+logger = logging.getLogger(__name__)
 
-engine = create_engine(
-    settings.SQLALCHEMY_DATABASE_URI, connect_args=connect_args
-)
+
+def _pool_options(url: str) -> Dict[str, Any]:
+    """Pool sizing, recycling and pre-ping from settings; SQLite keeps SQLAlchemy's defaults"""
+    if url.startswith("sqlite"):
+        return {}
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def sqlite_pragmas(wal: bool, busy_timeout_ms: int):
+    """A connect listener that applies the journal, sync and lock-wait pragmas to each new SQLite connection"""
+    def apply(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        if wal:
+            # Persistent in the database file; readers no longer block the writer
+            cursor.execute("PRAGMA journal_mode=WAL")
+            # Safe with WAL: a crash can lose the last commits but never corrupts the file
+            cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA busy_timeout={int(busy_timeout_ms)}")
+        cursor.close()
+    return apply
+
+
+def build_engine(url: str, wal: Optional[bool] = None, busy_timeout_ms: Optional[int] = None):
+    """The sync engine for url; SQLite pragmas default to the settings"""
+    connect_args = {}
+    if "sqlite" in url:
+        connect_args["check_same_thread"] = False
+    new_engine = create_engine(url, connect_args=connect_args, **_pool_options(url))
+    if url.startswith("sqlite"):
+        event.listen(new_engine, "connect", sqlite_pragmas(
+            settings.SQLITE_WAL if wal is None else wal,
+            settings.SQLITE_BUSY_TIMEOUT_MS if busy_timeout_ms is None else busy_timeout_ms
+        ))
+    return new_engine
+
+
+engine = build_engine(settings.SQLALCHEMY_DATABASE_URI)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def _async_url(url: str) -> Optional[str]:
+    """The async-driver form of the database URL, or None when there is no async driver for it"""
+    if url.startswith("sqlite:"):
+        return "sqlite+aiosqlite:" + url[len("sqlite:"):]
+    if url.startswith("postgresql:"):
+        # asyncpg takes ssl=... where libpq URLs (and most hosting providers) use sslmode=...
+        parts = urlsplit("postgresql+asyncpg:" + url[len("postgresql:"):])
+        query = [("ssl" if key == "sslmode" else key, value) for key, value in parse_qsl(parts.query)]
+        return urlunsplit(parts._replace(query=urlencode(query)))
+    return None
+
+
+def build_async_sessionmaker(url: str):
+    """
+    An async_sessionmaker over the async driver for url (aiosqlite or asyncpg,
+    which also need greenlet); raises ImportError when that is not installed.
+    """
+    async_url = _async_url(url)
+    if async_url is None:
+        raise ImportError(f"no async driver for {url.split(':', 1)[0]}")
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+    import greenlet  # noqa: F401  (create_async_engine only fails on first use without it)
+    async_engine = create_async_engine(async_url, **_pool_options(async_url))
+    if async_url.startswith("sqlite"):
+        event.listen(async_engine.sync_engine, "connect",
+                     sqlite_pragmas(settings.SQLITE_WAL, settings.SQLITE_BUSY_TIMEOUT_MS))
+    return async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+
+# Async sessions for the auth, admin and payment routes (DB_ASYNC). Without an
+# async driver installed they fall back to ThreadpoolSession over the sync engine.
+AsyncSessionLocal = None
+if settings.DB_ASYNC:
+    try:
+        AsyncSessionLocal = build_async_sessionmaker(settings.SQLALCHEMY_DATABASE_URI)
+    except ImportError as e:
+        logger.warning("Async database access unavailable (%s); using the threadpool", e)
+
+
+class ThreadpoolSession:
+    """
+    The subset of AsyncSession the routes use, backed by a sync Session whose
+    blocking calls run in the threadpool. Results are buffered before they
+    come back to the event loop, and attributes are not expired on commit, as
+    with the async session.
+    """
+
+    def __init__(self, session):
+        self.session = session
+
+    def add(self, instance):
+        self.session.add(instance)
+
+    async def execute(self, statement):
+        def run():
+            return self.session.execute(statement).freeze()
+        return (await to_thread.run_sync(run))()
+
+    async def scalar(self, statement):
+        return await to_thread.run_sync(self.session.scalar, statement)
+
+    async def get(self, entity, ident):
+        return await to_thread.run_sync(self.session.get, entity, ident)
+
+    async def commit(self):
+        await to_thread.run_sync(self.session.commit)
+
+    async def rollback(self):
+        await to_thread.run_sync(self.session.rollback)
+
+    async def refresh(self, instance):
+        await to_thread.run_sync(self.session.refresh, instance)
+
+    async def close(self):
+        await to_thread.run_sync(self.session.close)
@@ -1,16 +1,28 @@
-from sqlalchemy import Boolean, Column, Integer, String
+from datetime import datetime
+from sqlalchemy import Boolean, Column, DateTime, Index, Integer, String, func
 from backend.app.db.base import Base
 
 class User(Base):
     id = Column(Integer, primary_key=True, index=True)
     email = Column(String, unique=True, index=True, nullable=False)
     hashed_password = Column(String, nullable=False)
-    is_active = Column(Boolean(), default=True)
-    is_paid = Column(Boolean(), default=False)
+    is_active = Column(Boolean(), default=True, index=True)
+    is_paid = Column(Boolean(), default=False, index=True)
     plan_type = Column(String, nullable=True) # '24h', 'monthly', 'lifetime'
     plan_expiry = Column(String, nullable=True) # ISO format datetime string
+    plan_expires_at = Column(DateTime, nullable=True, index=True) # UTC; NULL for lifetime/free, swept by PlanExpirySweeper
     preferred_color_scheme = Column(String, default="kpmg")
     full_name = Column(String, nullable=True)
-    is_verified = Column(Boolean(), default=False)
+    is_verified = Column(Boolean(), default=False, index=True)
     otp = Column(String, nullable=True)
     is_admin = Column(Boolean(), default=False)
+
+    # Case-insensitive email prefix search in the admin user list
+    # text_pattern_ops lets Postgres use it for LIKE 'prefix%' whatever the database collation
+    __table_args__ = (Index("ix_user_email_lower", func.lower(email).label("email_lower"),
+                            postgresql_ops={"email_lower": "text_pattern_ops"}),)
+
+    @property
+    def has_active_plan(self) -> bool:
+        """Paid and not past expiry, even if the sweeper has not downgraded the row yet"""
+        return bool(self.is_paid) and (self.plan_expires_at is None or self.plan_expires_at > datetime.utcnow())
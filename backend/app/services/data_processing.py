@@ -7,6 +7,11 @@ class DataProcessor:
     def __init__(self):
         self.df = None
         self.filename = None
+        # Deep in-memory size of df, measured when it is loaded or cleaned (for the dataset_store gauge)
+        self.memory_bytes = 0
+
+    def _measure(self):
+        self.memory_bytes = int(self.df.memory_usage(deep=True).sum()) if self.df is not None else 0
 
     def load_data(self, file_content: bytes, filename: str):
         self.filename = filename
@@ -16,6 +21,7 @@ class DataProcessor:
             self.df = pd.read_excel(io.BytesIO(file_content))
         else:
             raise ValueError("Unsupported file format")
+        self._measure()
         
         # Basic cleanup: convert object columns to string if needed, etc.
         return self.get_preview()
@@ -74,6 +80,7 @@ class DataProcessor:
                 elif dtype == 'datetime':
                     self.df[col] = pd.to_datetime(self.df[col], errors='coerce')
         
+        self._measure()
         return self.get_preview()
 
     def get_statistics(self) -> Dict[str, Any]:
@@ -237,7 +244,7 @@ class DataProcessor:
                      agg = self.df.groupby(x_col)[y_col].mean().reset_index()
                      data = agg.to_dict(orient='records')
                 else:
-                    data = self.df[[x_col, y_col]].dropna().head(1000).to_dict(orient='records')
+                    data = self._sample_points(self.df[[x_col, y_col]].dropna()).to_dict(orient='records')
             else:
                 counts = self.df[x_col].value_counts().reset_index()
                 counts.columns = [x_col, 'count']
@@ -245,10 +252,19 @@ class DataProcessor:
         
         elif chart_type == "scatter":
              if x_col and y_col:
-                 data = self.df[[x_col, y_col]].dropna().head(1000).to_dict(orient='records')
+                 data = self._sample_points(self.df[[x_col, y_col]].dropna()).to_dict(orient='records')
 
         return data
 
+    def _sample_points(self, points: pd.DataFrame, limit: int = 1000) -> pd.DataFrame:
+        """
+        Uniform random sample (fixed seed, original row order) for SVG charts,
+        so large files are represented across their whole range, not just the first rows.
+        """
+        if len(points) <= limit:
+            return points
+        return points.sample(n=limit, random_state=0).sort_index()
+
     def is_identifier(self, col: str) -> bool:
         """
         Enhanced identifier detection:
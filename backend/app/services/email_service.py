@@ -2,35 +2,48 @@ import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from backend.app.core.config import settings
+from backend.app.core.email_queue import EmailQueue
+
+def smtp_connect() -> smtplib.SMTP:
+    """Open an authenticated SMTP connection from the current settings"""
+    server = smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT, timeout=settings.SMTP_TIMEOUT_SECONDS)
+    try:
+        if settings.SMTP_STARTTLS:
+            server.starttls()
+        if settings.SMTP_USER:
+            server.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
+    except Exception:
+        server.close()
+        raise
+    return server
+
+# Shared by every EmailService; the worker thread starts with the first message
+email_queue = EmailQueue(
+    smtp_connect,
+    max_queue=settings.EMAIL_QUEUE_SIZE,
+    batch_size=settings.EMAIL_BATCH_SIZE,
+    max_retries=settings.EMAIL_MAX_RETRIES,
+    backoff=settings.EMAIL_RETRY_BACKOFF_SECONDS,
+    idle_timeout=settings.SMTP_IDLE_TIMEOUT_SECONDS
+)
 
 class EmailService:
     def __init__(self):
-        self.smtp_host = settings.SMTP_HOST
-        self.smtp_port = settings.SMTP_PORT
-        self.smtp_user = settings.SMTP_USER
-        self.smtp_password = settings.SMTP_PASSWORD
         self.from_email = settings.EMAILS_FROM_EMAIL
         self.from_name = settings.EMAILS_FROM_NAME
 
-    def send_email(self, to_email: str, subject: str, html_content: str):
-        try:
-            msg = MIMEMultipart()
-            msg['From'] = f"{self.from_name} <{self.from_email}>"
-            msg['To'] = to_email
-            msg['Subject'] = subject
+    def build_message(self, to_email: str, subject: str, html_content: str) -> MIMEMultipart:
+        msg = MIMEMultipart()
+        msg['From'] = f"{self.from_name} <{self.from_email}>"
+        msg['To'] = to_email
+        msg['Subject'] = subject
 
-            msg.attach(MIMEText(html_content, 'html'))
+        msg.attach(MIMEText(html_content, 'html'))
+        return msg
 
-            server = smtplib.SMTP(self.smtp_host, self.smtp_port)
-            server.starttls()
-            server.login(self.smtp_user, self.smtp_password)
-            server.send_message(msg)
-            server.quit()
-            print(f"✅ Email sent to {to_email}")
-            return True
-        except Exception as e:
-            print(f"❌ Failed to send email to {to_email}: {e}")
-            return False
+    def send_email(self, to_email: str, subject: str, html_content: str):
+        """Queue the email for background delivery; returns False only if the queue is full"""
+        return email_queue.enqueue(self.build_message(to_email, subject, html_content))
 
     def send_welcome_premium_email(self, to_email: str, user_name: str = "Valued User"):
         subject = "Welcome to Exceldrill AI Premium! 🚀"
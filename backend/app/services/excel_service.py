@@ -1,211 +1,395 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Iterator, Tuple
 import io
 import pandas as pd
 import numpy as np
 from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-from openpyxl.chart import BarChart, LineChart, Reference
-from openpyxl.utils.dataframe import dataframe_to_rows
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, PatternFill, Alignment, NamedStyle
+from openpyxl.chart import BarChart, Reference
+from openpyxl.utils import get_column_letter
+from backend.app.core.instrumentation import PhaseTimer, ensure_timer
 
 class ExcelService:
     # KPMG Blue color scheme
     KPMG_BLUE = "00338D"
     KPMG_LIGHT_BLUE = "0091DA"
     HEADER_FILL = "00338D"
-    
-    def generate_excel_report(self, df: pd.DataFrame, stats: Dict[str, Any], insights: List[str]) -> io.BytesIO:
+
+    # Excel's hard limit on rows per worksheet
+    EXCEL_MAX_ROWS = 1048576
+    # Rows above the data on every raw data sheet (title, spacer, header)
+    RAW_DATA_HEADER_ROWS = 3
+    # Raw data rows kept by the in-memory report
+    RAW_DATA_PREVIEW_ROWS = 1000
+    # Rows converted to Python values at a time when streaming raw data
+    RAW_DATA_CHUNK_ROWS = 10000
+
+    # Charts sheet limits: columns charted per kind, bars per chart, rows per chart block
+    CHART_MAX_COLUMNS = 10
+    CHART_MAX_BINS = 30
+    CHART_TOP_CATEGORIES = 10
+    CHART_TOP_PAIRS = 10
+    CHART_BLOCK_ROWS = 18
+
+    # Shared named styles. Cells reference these by name instead of each
+    # carrying its own Font/PatternFill objects.
+    STYLES = {
+        'ed_title': {'font': {'size': 16, 'bold': True, 'color': "FFFFFF"}, 'fill': HEADER_FILL},
+        'ed_raw_title': {'font': {'size': 14, 'bold': True, 'color': "FFFFFF"}, 'fill': HEADER_FILL},
+        'ed_section': {'font': {'size': 14, 'bold': True, 'color': KPMG_BLUE}},
+        'ed_header': {'font': {'bold': True, 'color': "FFFFFF"}, 'fill': KPMG_LIGHT_BLUE, 'align': 'center'},
+        'ed_bold': {'font': {'bold': True}},
+        'ed_wrap': {'wrap': True},
+        'ed_warning': {'fill': "FFC7CE"},
+        'ed_corr': {'number_format': '0.00'},
+        'ed_corr_strong': {'fill': "90EE90", 'number_format': '0.00'},
+        'ed_corr_moderate': {'fill': "FFFFE0", 'number_format': '0.00'},
+    }
+
+    def generate_excel_report(self, df: pd.DataFrame, stats: Dict[str, Any], insights: List[str], timer: Optional[PhaseTimer] = None) -> io.BytesIO:
         """Generate comprehensive Excel report with multiple sheets"""
+        timer = ensure_timer(timer)
         wb = Workbook()
-        
+
         # Remove default sheet
         wb.remove(wb.active)
-        
-        # Create sheets
-        self._create_summary_sheet(wb, df, insights)
-        self._create_data_quality_sheet(wb, df)
-        self._create_statistics_sheet(wb, df, stats)
-        self._create_correlation_sheet(wb, df)
-        self._create_raw_data_sheet(wb, df)
-        
+
+        self._build_report(wb, df, stats, insights, self.RAW_DATA_PREVIEW_ROWS, timer)
+
         # Save to BytesIO
-        buffer = io.BytesIO()
-        wb.save(buffer)
-        buffer.seek(0)
+        with timer.span("serialization"):
+            buffer = io.BytesIO()
+            wb.save(buffer)
+            buffer.seek(0)
         return buffer
-    
+
+    def write_excel_report(self, df: pd.DataFrame, stats: Dict[str, Any], insights: List[str], output_path: str, timer: Optional[PhaseTimer] = None) -> str:
+        """
+        Write the report straight to disk with a write-only workbook.
+
+        Rows are streamed to the sheet as they are produced, so memory stays
+        flat regardless of row count. The raw data sheet holds the full
+        dataset and continues on additional sheets past Excel's row limit.
+        """
+        timer = ensure_timer(timer)
+        wb = Workbook(write_only=True)
+
+        self._build_report(wb, df, stats, insights, None, timer)
+
+        with timer.span("serialization"):
+            wb.save(output_path)
+        return output_path
+
+    def write_dataset(self, df: pd.DataFrame, output_path: str) -> str:
+        """Write just the dataset (header + rows, no report sheets) with a write-only workbook"""
+        wb = Workbook(write_only=True)
+        self._register_styles(wb)
+        self._create_raw_data_sheet(wb, df, sheet_name="Data", with_title=False)
+        wb.save(output_path)
+        return output_path
+
+    def _build_report(self, wb: Workbook, df: pd.DataFrame, stats: Dict[str, Any], insights: List[str], raw_data_limit: Optional[int], timer: PhaseTimer):
+        self._register_styles(wb)
+
+        # Create sheets
+        with timer.span("summary"):
+            self._create_summary_sheet(wb, df, insights)
+        with timer.span("data quality"):
+            self._create_data_quality_sheet(wb, df)
+        with timer.span("statistics"):
+            self._create_statistics_sheet(wb, df, stats)
+        with timer.span("heatmap"):
+            self._create_correlation_sheet(wb, df)
+        with timer.span("charts"):
+            self._create_charts_sheet(wb, df)
+        with timer.span("raw data"):
+            self._create_raw_data_sheet(wb, df, raw_data_limit)
+
+    def _register_styles(self, wb: Workbook):
+        """Register the shared named styles on the workbook (once per workbook)"""
+        existing = set(wb.named_styles)
+        for name, spec in self.STYLES.items():
+            if name in existing:
+                continue
+            style = NamedStyle(name=name)
+            if 'font' in spec:
+                style.font = Font(**spec['font'])
+            if 'fill' in spec:
+                style.fill = PatternFill(start_color=spec['fill'], end_color=spec['fill'], fill_type="solid")
+            if 'align' in spec:
+                style.alignment = Alignment(horizontal=spec['align'])
+            if spec.get('wrap'):
+                style.alignment = Alignment(wrap_text=True)
+            if 'number_format' in spec:
+                style.number_format = spec['number_format']
+            wb.add_named_style(style)
+
+    def _cell(self, ws, value, style: Optional[str] = None):
+        """Build a cell for ws.append(); works for both normal and write-only sheets"""
+        cell = WriteOnlyCell(ws, value=value)
+        if style:
+            cell.style = style
+        return cell
+
+    def _append_title(self, ws, title: str, width: int = 1, style: str = 'ed_title'):
+        ws.append([self._cell(ws, title, style)])
+        if width > 1:
+            ws.merged_cells.add(f"A1:{get_column_letter(width)}1")
+
+    def _set_widths(self, ws, widths: List[int]):
+        # Must happen before any rows are written on write-only sheets
+        for idx, width in enumerate(widths, 1):
+            ws.column_dimensions[get_column_letter(idx)].width = width
+
     def _create_summary_sheet(self, wb: Workbook, df: pd.DataFrame, insights: List[str]):
         """Create executive summary sheet"""
         ws = wb.create_sheet("Executive Summary")
-        
+        self._set_widths(ws, [30, 20])
+
         # Title
-        ws['A1'] = "Data Analysis Report - Executive Summary"
-        ws['A1'].font = Font(size=16, bold=True, color="FFFFFF")
-        ws['A1'].fill = PatternFill(start_color=self.HEADER_FILL, end_color=self.HEADER_FILL, fill_type="solid")
-        ws.merge_cells('A1:D1')
-        
+        self._append_title(ws, "Data Analysis Report - Executive Summary", 4)
+        ws.append([])
+
         # Dataset Overview
-        row = 3
-        ws[f'A{row}'] = "Dataset Overview"
-        ws[f'A{row}'].font = Font(size=14, bold=True, color=self.KPMG_BLUE)
-        row += 1
-        
+        ws.append([self._cell(ws, "Dataset Overview", 'ed_section')])
+
+        total_missing = int(df.isnull().sum().sum())
         overview_data = [
             ["Total Records", len(df)],
             ["Total Columns", len(df.columns)],
-            ["Total Missing Values", df.isnull().sum().sum()],
-            ["Missing Percentage", f"{(df.isnull().sum().sum() / df.size * 100):.2f}%"]
+            ["Total Missing Values", total_missing],
+            ["Missing Percentage", f"{(total_missing / df.size * 100) if df.size else 0:.2f}%"]
         ]
-        
+
         for metric, value in overview_data:
-            ws[f'A{row}'] = metric
-            ws[f'B{row}'] = value
-            ws[f'A{row}'].font = Font(bold=True)
-            row += 1
-        
+            ws.append([self._cell(ws, metric, 'ed_bold'), value])
+
         # Key Insights
-        row += 1
-        ws[f'A{row}'] = "Key Insights"
-        ws[f'A{row}'].font = Font(size=14, bold=True, color=self.KPMG_BLUE)
-        row += 1
-        
+        ws.append([])
+        ws.append([self._cell(ws, "Key Insights", 'ed_section')])
+
         for i, insight in enumerate(insights[:5], 1):
-            ws[f'A{row}'] = f"{i}. {insight[:100]}..."
-            ws[f'A{row}'].alignment = Alignment(wrap_text=True)
-            row += 1
-        
-        # Auto-adjust column widths
-        ws.column_dimensions['A'].width = 30
-        ws.column_dimensions['B'].width = 20
-    
+            ws.append([self._cell(ws, f"{i}. {insight[:100]}...", 'ed_wrap')])
+
     def _create_data_quality_sheet(self, wb: Workbook, df: pd.DataFrame):
         """Create data quality report sheet"""
         ws = wb.create_sheet("Data Quality")
-        
+        self._set_widths(ws, [18] * 5)
+
         # Title
-        ws['A1'] = "Data Quality Report"
-        ws['A1'].font = Font(size=16, bold=True, color="FFFFFF")
-        ws['A1'].fill = PatternFill(start_color=self.HEADER_FILL, end_color=self.HEADER_FILL, fill_type="solid")
-        ws.merge_cells('A1:E1')
-        
+        self._append_title(ws, "Data Quality Report", 5)
+        ws.append([])
+
         # Headers
         headers = ["Column", "Data Type", "Missing Count", "Missing %", "Unique Values"]
-        for col_idx, header in enumerate(headers, 1):
-            cell = ws.cell(row=3, column=col_idx, value=header)
-            cell.font = Font(bold=True, color="FFFFFF")
-            cell.fill = PatternFill(start_color=self.KPMG_LIGHT_BLUE, end_color=self.KPMG_LIGHT_BLUE, fill_type="solid")
-            cell.alignment = Alignment(horizontal="center")
-        
+        ws.append([self._cell(ws, header, 'ed_header') for header in headers])
+
         # Data
-        row = 4
+        missing_counts = df.isnull().sum()
+        unique_counts = df.nunique()
         for col in df.columns:
-            missing_count = df[col].isnull().sum()
-            missing_pct = (missing_count / len(df) * 100)
-            
-            ws.cell(row=row, column=1, value=str(col))
-            ws.cell(row=row, column=2, value=str(df[col].dtype))
-            ws.cell(row=row, column=3, value=missing_count)
-            ws.cell(row=row, column=4, value=f"{missing_pct:.2f}%")
-            ws.cell(row=row, column=5, value=df[col].nunique())
-            
+            missing_count = int(missing_counts[col])
+            missing_pct = (missing_count / len(df) * 100) if len(df) else 0
+            values = [str(col), str(df[col].dtype), missing_count, f"{missing_pct:.2f}%", int(unique_counts[col])]
+
             # Highlight high missing values
-            if missing_pct > 20:
-                for col_idx in range(1, 6):
-                    ws.cell(row=row, column=col_idx).fill = PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="solid")
-            
-            row += 1
-        
-        # Auto-adjust column widths
-        for col in ['A', 'B', 'C', 'D', 'E']:
-            ws.column_dimensions[col].width = 18
-    
+            style = 'ed_warning' if missing_pct > 20 else None
+            ws.append([self._cell(ws, value, style) for value in values])
+
     def _create_statistics_sheet(self, wb: Workbook, df: pd.DataFrame, stats: Dict[str, Any]):
         """Create statistical summary sheet"""
         ws = wb.create_sheet("Statistical Summary")
-        
+        self._set_widths(ws, [15] * 6)
+
         # Title
-        ws['A1'] = "Statistical Summary - Numeric Variables"
-        ws['A1'].font = Font(size=16, bold=True, color="FFFFFF")
-        ws['A1'].fill = PatternFill(start_color=self.HEADER_FILL, end_color=self.HEADER_FILL, fill_type="solid")
-        ws.merge_cells('A1:F1')
-        
+        self._append_title(ws, "Statistical Summary - Numeric Variables", 6)
+        ws.append([])
+
         # Get numeric columns
         numeric_df = df.select_dtypes(include=[np.number])
-        
+
         if not numeric_df.empty:
             # Headers
             headers = ["Column", "Mean", "Median", "Std Dev", "Min", "Max"]
-            for col_idx, header in enumerate(headers, 1):
-                cell = ws.cell(row=3, column=col_idx, value=header)
-                cell.font = Font(bold=True, color="FFFFFF")
-                cell.fill = PatternFill(start_color=self.KPMG_LIGHT_BLUE, end_color=self.KPMG_LIGHT_BLUE, fill_type="solid")
-            
+            ws.append([self._cell(ws, header, 'ed_header') for header in headers])
+
             # Data
-            row = 4
             for col in numeric_df.columns:
-                ws.cell(row=row, column=1, value=str(col))
-                ws.cell(row=row, column=2, value=round(numeric_df[col].mean(), 2))
-                ws.cell(row=row, column=3, value=round(numeric_df[col].median(), 2))
-                ws.cell(row=row, column=4, value=round(numeric_df[col].std(), 2))
-                ws.cell(row=row, column=5, value=round(numeric_df[col].min(), 2))
-                ws.cell(row=row, column=6, value=round(numeric_df[col].max(), 2))
-                row += 1
-        
-        # Auto-adjust column widths
-        for col in ['A', 'B', 'C', 'D', 'E', 'F']:
-            ws.column_dimensions[col].width = 15
-    
+                series = numeric_df[col]
+                ws.append([
+                    str(col),
+                    round(float(series.mean()), 2),
+                    round(float(series.median()), 2),
+                    round(float(series.std()), 2),
+                    round(float(series.min()), 2),
+                    round(float(series.max()), 2)
+                ])
+
     def _create_correlation_sheet(self, wb: Workbook, df: pd.DataFrame):
         """Create correlation matrix sheet"""
         ws = wb.create_sheet("Correlation Matrix")
-        
+
         # Title
-        ws['A1'] = "Correlation Matrix - Numeric Variables"
-        ws['A1'].font = Font(size=16, bold=True, color="FFFFFF")
-        ws['A1'].fill = PatternFill(start_color=self.HEADER_FILL, end_color=self.HEADER_FILL, fill_type="solid")
-        
+        self._append_title(ws, "Correlation Matrix - Numeric Variables")
+        ws.append([])
+
         numeric_df = df.select_dtypes(include=[np.number])
-        
+
         if not numeric_df.empty and numeric_df.shape[1] >= 2:
             corr_matrix = numeric_df.corr()
-            
-            # Write correlation matrix
-            for r_idx, row in enumerate(dataframe_to_rows(corr_matrix, index=True, header=True), 3):
-                for c_idx, value in enumerate(row, 1):
-                    cell = ws.cell(row=r_idx, column=c_idx, value=value)
-                    
-                    # Format correlation values
-                    if isinstance(value, (int, float)) and r_idx > 4 and c_idx > 1:
-                        cell.number_format = '0.00'
-                        # Color code correlations
-                        if abs(value) > 0.7:
-                            cell.fill = PatternFill(start_color="90EE90", end_color="90EE90", fill_type="solid")
-                        elif abs(value) > 0.4:
-                            cell.fill = PatternFill(start_color="FFFFE0", end_color="FFFFE0", fill_type="solid")
-            
-            # Format headers
-            for col_idx in range(1, len(corr_matrix.columns) + 2):
-                ws.cell(row=3, column=col_idx).font = Font(bold=True)
-                ws.cell(row=4, column=col_idx).font = Font(bold=True, color="FFFFFF")
-                ws.cell(row=4, column=col_idx).fill = PatternFill(start_color=self.KPMG_LIGHT_BLUE, end_color=self.KPMG_LIGHT_BLUE, fill_type="solid")
-    
-    def _create_raw_data_sheet(self, wb: Workbook, df: pd.DataFrame):
-        """Create raw data sheet (limited to first 1000 rows)"""
-        ws = wb.create_sheet("Raw Data")
-        
-        # Title
-        ws['A1'] = f"Raw Data (First {min(1000, len(df))} rows)"
-        ws['A1'].font = Font(size=14, bold=True, color="FFFFFF")
-        ws['A1'].fill = PatternFill(start_color=self.HEADER_FILL, end_color=self.HEADER_FILL, fill_type="solid")
-        
-        # Write data (limit to 1000 rows for performance)
-        limited_df = df.head(1000)
-        
-        for r_idx, row in enumerate(dataframe_to_rows(limited_df, index=False, header=True), 3):
-            for c_idx, value in enumerate(row, 1):
-                ws.cell(row=r_idx, column=c_idx, value=value)
-        
-        # Format headers
-        for col_idx in range(1, len(df.columns) + 1):
-            cell = ws.cell(row=3, column=col_idx)
-            cell.font = Font(bold=True, color="FFFFFF")
-            cell.fill = PatternFill(start_color=self.KPMG_LIGHT_BLUE, end_color=self.KPMG_LIGHT_BLUE, fill_type="solid")
+
+            ws.append([self._cell(ws, None, 'ed_header')] + [self._cell(ws, str(col), 'ed_header') for col in corr_matrix.columns])
+
+            for row_name, row in corr_matrix.iterrows():
+                cells = [self._cell(ws, str(row_name), 'ed_bold')]
+                for value in row.values:
+                    if pd.isna(value):
+                        cells.append(None)
+                        continue
+                    # Color code correlations
+                    if abs(value) > 0.7:
+                        style = 'ed_corr_strong'
+                    elif abs(value) > 0.4:
+                        style = 'ed_corr_moderate'
+                    else:
+                        style = 'ed_corr'
+                    cells.append(self._cell(ws, float(value), style))
+                ws.append(cells)
+
+    def _create_charts_sheet(self, wb: Workbook, df: pd.DataFrame):
+        """
+        Create native Excel charts over small summary tables.
+
+        Each block is a two-column table (label, value) with a chart next to it
+        that references the table, so Excel draws the visuals itself and the
+        file only carries the aggregated numbers.
+        """
+        ws = wb.create_sheet("Charts")
+        self._set_widths(ws, [28, 14])
+
+        self._append_title(ws, "Charts - Distributions, Categories & Correlations", 8)
+        ws.append([])
+        row = 3
+
+        numeric_cols = df.select_dtypes(include=[np.number]).columns
+        categorical_cols = df.select_dtypes(include=['object', 'category']).columns
+
+        # Histogram bins
+        for col in numeric_cols[:self.CHART_MAX_COLUMNS]:
+            data = df[col].dropna()
+            data = data[np.isfinite(data)]
+            if data.empty:
+                continue
+            # Sturges' rule, capped so the table stays small
+            bins = int(min(self.CHART_MAX_BINS, np.ceil(np.log2(len(data)) + 1)))
+            counts, edges = np.histogram(data.to_numpy(dtype=float), bins=bins)
+            labels = [f"{edges[i]:.4g} - {edges[i + 1]:.4g}" for i in range(len(counts))]
+            chart = BarChart()
+            chart.type = "col"
+            chart.gapWidth = 10
+            chart.y_axis.title = "Count"
+            row = self._append_chart_block(ws, row, f"Distribution of {col}", ["Bin", "Count"], zip(labels, counts.tolist()), chart)
+
+        # Top categories
+        for col in categorical_cols[:self.CHART_MAX_COLUMNS]:
+            counts = df[col].value_counts().head(self.CHART_TOP_CATEGORIES)
+            if counts.empty:
+                continue
+            chart = BarChart()
+            chart.type = "bar"
+            chart.x_axis.scaling.orientation = "maxMin"  # Largest category on top
+            row = self._append_chart_block(ws, row, f"Top Categories in {col}", ["Category", "Count"],
+                                           zip([str(c) for c in counts.index], counts.astype(int).tolist()), chart)
+
+        # Correlation ranking
+        if len(numeric_cols) >= 2:
+            corr = df[numeric_cols].corr()
+            upper = corr.where(np.triu(np.ones(corr.shape), k=1).astype(bool)).stack()
+            ranked = upper.reindex(upper.abs().sort_values(ascending=False).index).head(self.CHART_TOP_PAIRS)
+            if not ranked.empty:
+                chart = BarChart()
+                chart.type = "bar"
+                chart.x_axis.scaling.orientation = "maxMin"
+                chart.y_axis.scaling.min = -1
+                chart.y_axis.scaling.max = 1
+                pairs = [(f"{c1} vs {c2}", round(float(r), 4)) for (c1, c2), r in ranked.items()]
+                self._append_chart_block(ws, row, "Strongest Correlations", ["Pair", "Correlation"], pairs, chart)
+
+    def _append_chart_block(self, ws, row: int, title: str, headers: List[str], rows, chart: BarChart) -> int:
+        """Write a summary table starting at `row`, anchor the chart beside it and return the next free row"""
+        ws.append([self._cell(ws, title, 'ed_section')])
+        header_row = row + 1
+        ws.append([self._cell(ws, header, 'ed_header') for header in headers])
+        last_row = header_row
+        for label, value in rows:
+            ws.append([label, value])
+            last_row += 1
+
+        chart.title = title
+        chart.legend = None
+        chart.height = 7.5
+        chart.width = 16
+        data = Reference(ws, min_col=2, min_row=header_row, max_row=last_row)
+        categories = Reference(ws, min_col=1, min_row=header_row + 1, max_row=last_row)
+        chart.add_data(data, titles_from_data=True)
+        chart.set_categories(categories)
+        ws.add_chart(chart, f"D{row}")
+
+        # Pad so the next block starts below this chart
+        next_row = max(last_row + 2, row + self.CHART_BLOCK_ROWS)
+        for _ in range(next_row - last_row - 1):
+            ws.append([])
+        return next_row
+
+    def _create_raw_data_sheet(self, wb: Workbook, df: pd.DataFrame, limit: Optional[int] = None, sheet_name: str = "Raw Data", with_title: bool = True):
+        """
+        Create raw data sheet(s).
+
+        With a limit only the first rows are written (in-memory report). Without
+        one the full dataset is streamed in chunks, continuing on "Raw Data (2)",
+        "Raw Data (3)", ... whenever a sheet reaches Excel's row limit.
+        """
+        data = df.head(limit) if limit is not None else df
+        header_rows = self.RAW_DATA_HEADER_ROWS if with_title else 1
+        rows_per_sheet = self.EXCEL_MAX_ROWS - header_rows
+        total_rows = len(data)
+
+        sheet_count = max(1, -(-total_rows // rows_per_sheet))
+        rows = self._iter_rows(data)
+        for sheet_idx in range(sheet_count):
+            start = sheet_idx * rows_per_sheet
+            end = min(start + rows_per_sheet, total_rows)
+            ws = wb.create_sheet(sheet_name if sheet_idx == 0 else f"{sheet_name} ({sheet_idx + 1})")
+
+            # Title
+            if with_title:
+                if limit is not None:
+                    title = f"Raw Data (First {total_rows} rows)"
+                elif sheet_count > 1:
+                    title = f"Raw Data (Rows {start + 1}-{end} of {total_rows})"
+                else:
+                    title = f"Raw Data ({total_rows} rows)"
+                self._append_title(ws, title, style='ed_raw_title')
+                ws.append([])
+
+            # Headers
+            ws.append([self._cell(ws, str(col), 'ed_header') for col in data.columns])
+
+            for _ in range(end - start):
+                ws.append(next(rows))
+
+    def _iter_rows(self, df: pd.DataFrame) -> Iterator[Tuple]:
+        """Yield rows as tuples of Excel-compatible values, converting one chunk at a time"""
+        for start in range(0, len(df), self.RAW_DATA_CHUNK_ROWS):
+            chunk = df.iloc[start:start + self.RAW_DATA_CHUNK_ROWS]
+
+            # Excel has no timezone support
+            tz_cols = [col for col in chunk.columns if isinstance(chunk[col].dtype, pd.DatetimeTZDtype)]
+            if tz_cols:
+                chunk = chunk.copy()
+                for col in tz_cols:
+                    chunk[col] = chunk[col].dt.tz_localize(None)
+
+            chunk = chunk.astype(object)
+            chunk = chunk.where(chunk.notna(), None)
+            yield from chunk.itertuples(index=False, name=None)
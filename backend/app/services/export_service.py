@@ -0,0 +1,181 @@
+from typing import Dict, Iterator
+import io
+import os
+import tempfile
+import zlib
+import numpy as np
+import pandas as pd
+from backend.app.services.excel_service import ExcelService
+
+
+class _DrainableSink(io.RawIOBase):
+    """Write-only file object whose contents are handed out and discarded on drain()"""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+class ExportService:
+    """Streams a DataFrame out as CSV, gzip-compressed CSV, Parquet or XLSX in chunks"""
+
+    # Rows encoded per chunk
+    CHUNK_ROWS = 50000
+    # Rows (spread across the frame) the Parquet schema is inferred from
+    SCHEMA_SAMPLE_ROWS = 10000
+    # Bytes per read when streaming a finished file from disk
+    FILE_CHUNK_BYTES = 1024 * 1024
+
+    FORMATS: Dict[str, Dict[str, str]] = {
+        'csv': {'media_type': 'text/csv', 'extension': 'csv'},
+        'csv.gz': {'media_type': 'application/gzip', 'extension': 'csv.gz'},
+        'parquet': {'media_type': 'application/vnd.apache.parquet', 'extension': 'parquet'},
+        'xlsx': {'media_type': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', 'extension': 'xlsx'},
+    }
+
+    def stream(self, df: pd.DataFrame, export_format: str) -> Iterator[bytes]:
+        """
+        Return an iterator of encoded chunks for the given format.
+
+        Validation (unknown format, missing optional dependency) happens here,
+        before any bytes are produced, so callers can still answer with an error.
+        """
+        if export_format not in self.FORMATS:
+            raise ValueError(f"Unsupported export format: {export_format}")
+
+        if export_format == 'csv':
+            return self._iter_csv(df)
+        if export_format == 'csv.gz':
+            return self._iter_csv_gzip(df)
+        if export_format == 'parquet':
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError:
+                raise ValueError("Parquet export requires the 'pyarrow' package")
+            return self._iter_parquet(df, self._parquet_schema(df))
+        return self._iter_xlsx(df)
+
+    def _iter_chunks(self, df: pd.DataFrame) -> Iterator[pd.DataFrame]:
+        for start in range(0, len(df), self.CHUNK_ROWS):
+            yield df.iloc[start:start + self.CHUNK_ROWS]
+
+    def _iter_csv(self, df: pd.DataFrame) -> Iterator[bytes]:
+        if len(df) == 0:
+            yield df.to_csv(index=False).encode('utf-8')
+            return
+        for i, chunk in enumerate(self._iter_chunks(df)):
+            yield chunk.to_csv(index=False, header=(i == 0)).encode('utf-8')
+
+    def _iter_csv_gzip(self, df: pd.DataFrame) -> Iterator[bytes]:
+        # wbits=31 produces a gzip container (header + trailer) in one pass
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+        for piece in self._iter_csv(df):
+            data = compressor.compress(piece)
+            if data:
+                yield data
+        yield compressor.flush()
+
+    def _schema_sample(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        At most SCHEMA_SAMPLE_ROWS rows spread evenly over the frame (first and
+        last included), plus the first non-null row of any column that is empty
+        in that sample.
+        """
+        n = len(df)
+        if n <= self.SCHEMA_SAMPLE_ROWS:
+            return df
+        positions = set(np.linspace(0, n - 1, self.SCHEMA_SAMPLE_ROWS).astype(int).tolist())
+        sample = df.iloc[sorted(positions)]
+        for column in sample.columns[sample.isna().all().to_numpy()]:
+            present = df[column].notna().to_numpy()
+            if present.any():
+                positions.add(int(present.argmax()))
+        return df.iloc[sorted(positions)]
+
+    def _parquet_schema(self, df: pd.DataFrame):
+        """
+        Infer the schema from a bounded sample before any bytes go out, so
+        unconvertible columns fail as a ValueError instead of truncating the
+        download mid-stream, without converting the whole frame up front.
+        """
+        import pyarrow as pa
+
+        try:
+            schema = pa.Schema.from_pandas(self._schema_sample(df), preserve_index=False)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError) as e:
+            raise ValueError(f"Cannot export to Parquet: {e}")
+        for i, field in enumerate(schema):
+            if pa.types.is_null(field.type):
+                schema = schema.set(i, field.with_type(pa.string()))
+        return schema
+
+    def _iter_parquet(self, df: pd.DataFrame, schema) -> Iterator[bytes]:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        sink = _DrainableSink()
+        writer = pq.ParquetWriter(sink, schema, compression='snappy')
+        try:
+            # One row group per chunk; the encoded bytes are passed on as soon as each is written
+            for chunk in self._iter_chunks(df):
+                writer.write_table(self._parquet_table(chunk, schema))
+                data = sink.drain()
+                if data:
+                    yield data
+        finally:
+            writer.close()
+        yield sink.drain()
+
+    def _parquet_table(self, chunk: pd.DataFrame, schema):
+        """
+        Cast a chunk to the sampled schema. Rows outside the sample can still
+        disagree with it; name the offending column in the ValueError.
+        """
+        import pyarrow as pa
+
+        errors = (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError)
+        try:
+            return pa.Table.from_pandas(chunk, schema=schema, preserve_index=False, safe=False)
+        except errors as e:
+            for field in schema:
+                try:
+                    pa.array(chunk[field.name], type=field.type, from_pandas=True, safe=False)
+                except errors as column_error:
+                    raise ValueError(f"Cannot export to Parquet: column '{field.name}' does not fit "
+                                     f"{field.type} (inferred from a sample): {column_error}")
+            raise ValueError(f"Cannot export to Parquet: {e}")
+
+    def _iter_xlsx(self, df: pd.DataFrame) -> Iterator[bytes]:
+        # XLSX is a zip archive with its directory at the end, so it cannot be
+        # emitted incrementally; write it with the write-only workbook to a temp
+        # file (flat memory) and stream the file back.
+        fd, path = tempfile.mkstemp(suffix='.xlsx')
+        os.close(fd)
+        try:
+            ExcelService().write_dataset(df, path)
+            with open(path, 'rb') as f:
+                while True:
+                    data = f.read(self.FILE_CHUNK_BYTES)
+                    if not data:
+                        break
+                    yield data
+        finally:
+            os.remove(path)
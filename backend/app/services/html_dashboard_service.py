@@ -3,11 +3,155 @@ import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 import plotly.io as pio
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 import io
+import math
 import json
+import gzip
+import base64
+from functools import lru_cache
+from backend.app.core.config import settings
+from backend.app.core.instrumentation import PhaseTimer, ensure_timer
+
+# Client-side renderer for render_mode="client": reads the shared data block and
+# the chart specs, then draws each chart when it scrolls into view.
+CLIENT_SCRIPT = """
+<script>
+(function () {
+    async function loadData() {
+        var el = document.getElementById('dashboard-data');
+        if (el.dataset.encoding !== 'gzip-base64') {
+            return JSON.parse(el.textContent);
+        }
+        var raw = atob(el.textContent.trim());
+        var bytes = new Uint8Array(raw.length);
+        for (var i = 0; i < raw.length; i++) bytes[i] = raw.charCodeAt(i);
+        var stream = new Blob([bytes]).stream().pipeThrough(new DecompressionStream('gzip'));
+        return JSON.parse(await new Response(stream).text());
+    }
+
+    function column(data, name) {
+        var col = data[name];
+        if (col.t === 'n') return col.v;
+        return col.c.map(function (code) { return code < 0 ? null : col.k[code]; });
+    }
+
+    function traces(spec, data) {
+        switch (spec.kind) {
+            case 'histogram':
+                return [{type: 'bar', x: spec.x, y: spec.y, width: spec.width}];
+            case 'bar':
+                return [{type: 'bar', x: spec.x, y: spec.y}];
+            case 'scatter':
+                return [{type: spec.webgl ? 'scattergl' : 'scatter', mode: 'markers', x: column(data, spec.x), y: column(data, spec.y)}];
+            case 'density':
+                return [{type: 'heatmap', x: spec.grid_x, y: spec.grid_y, z: spec.z, colorscale: 'Blues',
+                         colorbar: {title: {text: 'points'}}}];
+            case 'box':
+                return [{type: 'box', x: spec.x, q1: spec.q1, median: spec.median, q3: spec.q3, mean: spec.mean,
+                         lowerfence: spec.lowerfence, upperfence: spec.upperfence}];
+            case 'stacked_bar':
+                return spec.series.map(function (s) { return {type: 'bar', name: s.name, x: spec.x, y: s.y}; });
+            case 'heatmap':
+                return [{type: 'heatmap', x: spec.x, y: spec.y, z: spec.z, colorscale: 'RdBu', reversescale: true,
+                         zmin: -1, zmax: 1, texttemplate: '%{z:.2f}'}];
+        }
+        return [];
+    }
+
+    function withTrendline(spec, out) {
+        if (spec.trendline) {
+            out.push({type: 'scatter', mode: 'lines', name: spec.trendline.name, x: spec.trendline.x, y: spec.trendline.y,
+                      showlegend: false});
+        }
+        return out;
+    }
+
+    async function main() {
+        var payload = JSON.parse(document.getElementById('dashboard-specs').textContent);
+        var data = await loadData();
+        var pending = {};
+        payload.specs.forEach(function (spec) { pending[spec.id] = spec; });
+
+        function draw(id) {
+            var spec = pending[id];
+            if (!spec) return;
+            delete pending[id];
+            var layout = Object.assign({template: payload.template}, spec.layout);
+            Plotly.newPlot(id, withTrendline(spec, traces(spec, data)), layout, {responsive: true});
+        }
+
+        if ('IntersectionObserver' in window) {
+            var observer = new IntersectionObserver(function (entries) {
+                entries.forEach(function (entry) {
+                    if (entry.isIntersecting) {
+                        observer.unobserve(entry.target);
+                        draw(entry.target.id);
+                    }
+                });
+            }, {rootMargin: '200px'});
+            payload.specs.forEach(function (spec) { observer.observe(document.getElementById(spec.id)); });
+        } else {
+            Object.keys(pending).forEach(draw);
+        }
+        // Printing needs every chart, not just the ones scrolled past
+        window.addEventListener('beforeprint', function () { Object.keys(pending).forEach(draw); });
+    }
+
+    main();
+})();
+</script>
+"""
+
+# Minimal stand-in for the Bootstrap classes the template uses, inlined by the offline mode
+OFFLINE_CSS = (
+    "*,::after,::before{box-sizing:border-box}body{margin:0;line-height:1.5;color:#212529}"
+    "a{color:#0d6efd;text-decoration:none}h1,h5{margin:0 0 .5rem;font-weight:500;line-height:1.2}"
+    ".h2{font-size:2rem}h5{font-size:1.25rem}.small{font-size:.875em}.text-muted{color:#6c757d}"
+    ".container-fluid{width:100%;padding:0 .75rem}.row{display:flex;flex-wrap:wrap;margin:0 -.75rem}"
+    ".row>*{width:100%;max-width:100%;padding:0 .75rem}"
+    "@media(min-width:768px){.col-md-3{flex:0 0 auto;width:25%}.col-md-6{flex:0 0 auto;width:50%}"
+    ".col-md-9{flex:0 0 auto;width:75%}.d-md-block{display:block!important}.ms-sm-auto{margin-left:auto}"
+    ".px-md-4{padding-left:1.5rem;padding-right:1.5rem}.flex-md-nowrap{flex-wrap:nowrap}.mb-md-0{margin-bottom:0}}"
+    "@media(min-width:992px){.col-lg-2{flex:0 0 auto;width:16.666667%}.col-lg-10{flex:0 0 auto;width:83.333333%}}"
+    ".collapse:not(.show){display:none}.d-flex{display:flex}.flex-wrap{flex-wrap:wrap}.flex-column{flex-direction:column}"
+    ".justify-content-between{justify-content:space-between}.align-items-center{align-items:center}"
+    ".h-100{height:100%}.position-sticky{position:sticky}.border-bottom{border-bottom:1px solid #dee2e6}"
+    ".mb-2{margin-bottom:.5rem}.mb-3{margin-bottom:1rem}.mb-4{margin-bottom:1.5rem}.mb-5{margin-bottom:3rem}.mt-3{margin-top:1rem}"
+    ".pt-3{padding-top:1rem}.pb-2{padding-bottom:.5rem}.pb-3{padding-bottom:1rem}.px-3{padding-left:1rem;padding-right:1rem}"
+    ".nav{display:flex;flex-wrap:wrap;padding:0;margin:0;list-style:none}.nav-link{display:block}"
+    ".card{position:relative;display:flex;flex-direction:column;background:#fff}.card-body{flex:1 1 auto;padding:1rem}"
+    ".list-group{display:flex;flex-direction:column;padding:0;margin:0}"
+    ".list-group-item{padding:.5rem 1rem;border-bottom:1px solid rgba(0,0,0,.125)}.list-group-flush>.list-group-item:last-child{border-bottom:0}"
+    ".btn{display:inline-block;padding:.25rem .5rem;font-size:.875rem;border:1px solid #6c757d;border-radius:.25rem;"
+    "background:transparent;color:#6c757d;cursor:pointer}.btn:hover{background:#6c757d;color:#fff}"
+    ".table-responsive{overflow-x:auto}.table{width:100%;border-collapse:collapse;margin-bottom:1rem}"
+    ".table td,.table th{padding:.5rem;border-bottom:1px solid #dee2e6;text-align:left}"
+    ".table-striped tbody tr:nth-of-type(odd){background:rgba(0,0,0,.05)}.table-hover tbody tr:hover{background:rgba(0,0,0,.075)}"
+)
+
+
+@lru_cache(maxsize=1)
+def _plotly_bundle() -> str:
+    """Minified plotly.js shipped with the installed plotly package (pinned by its version)"""
+    from plotly.offline import get_plotlyjs
+    return get_plotlyjs()
+
+
+@lru_cache(maxsize=4)
+def _compile_template(source: str):
+    """Compile the Jinja template once per process instead of on every render"""
+    from jinja2 import Template
+    return Template(source)
+
 
 class HtmlDashboardService:
+    # Upper bound on histogram bins, whatever numpy's "auto" rule picks for huge columns
+    HISTOGRAM_MAX_BINS = 60
+    # LOWESS trendlines are fitted on this many equal-count bin means instead of every point
+    LOWESS_BINS = 200
+    LOWESS_FRAC = 0.3
+
     def __init__(self):
         self.template = """
 <!DOCTYPE html>
@@ -16,8 +160,13 @@ class HtmlDashboardService:
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Interactive Data Analysis Dashboard</title>
+    {% if offline %}
+    <style>{{ offline_css }}</style>
+    <script type="text/javascript">{{ plotly_js }}</script>
+    {% else %}
     <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/css/bootstrap.min.css" rel="stylesheet">
-    <script src="https://cdn.plot.ly/plotly-latest.min.js"></script>
+    <script src="https://cdn.plot.ly/plotly-{{ plotly_version }}.min.js"></script>
+    {% endif %}
     <style>
         body { background-color: #f8f9fa; font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; }
         .card { margin-bottom: 20px; border: none; box-shadow: 0 4px 6px rgba(0,0,0,0.1); border-radius: 12px; }
@@ -164,10 +313,18 @@ class HtmlDashboardService:
             </main>
         </div>
     </div>
+    {% if not offline %}
     <script src="https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/js/bootstrap.bundle.min.js"></script>
+    {% endif %}
+    {{ data_block | safe }}
+    {{ client_script | safe }}
 </body>
 </html>
 """
+        try:
+            self.compiled_template = _compile_template(self.template)
+        except ImportError:
+            self.compiled_template = None
 
 
     def _is_identifier(self, df: pd.DataFrame, col: str) -> bool:
@@ -188,228 +345,417 @@ class HtmlDashboardService:
         
         return False
 
-    def generate_dashboard(self, df: pd.DataFrame, stats: Dict[str, Any], insights: List[str]) -> io.BytesIO:
-        # 1. Prepare Overview Data
-        total_records = len(df)
-        total_columns = len(df.columns)
-        missing_cells = df.isnull().sum().sum()
-        duplicate_rows = df.duplicated().sum()
+    def _chart_layout(self, title: str, **extra) -> Dict[str, Any]:
+        layout = {'title': {'text': title}, 'margin': dict(l=20, r=20, t=40, b=20), 'height': 300}
+        layout.update(extra)
+        return layout
 
-        # 2. Prepare Data Quality Table
-        quality_df = pd.DataFrame({
-            'Column': df.columns,
-            'Type': df.dtypes.astype(str),
-            'Missing (%)': (df.isnull().sum() / len(df) * 100).round(1),
-            'Unique Values': df.nunique(),
-            'Memory Usage (KB)': (df.memory_usage(deep=True)[1:] / 1024).round(1).values
-        })
-        quality_table_html = quality_df.to_html(classes='table table-striped table-hover', index=False)
+    def _univariate_spec(self, df: pd.DataFrame, col: str) -> Optional[Dict[str, Any]]:
+        if pd.api.types.is_numeric_dtype(df[col]):
+            bins = self._histogram_bins(df[col])
+            return {
+                'kind': 'histogram', **bins, 'title': col,
+                'insight': f"Mean: {df[col].mean():.2f}, Std: {df[col].std():.2f}",
+                'layout': self._chart_layout(f"Distribution of {col}", bargap=0.2,
+                                             xaxis={'title': {'text': str(col)}}, yaxis={'title': {'text': 'count'}})
+            }
+        if df[col].nunique() < 20:
+            value_counts = df[col].value_counts()
+            return {
+                'kind': 'bar', 'x': [str(v) for v in value_counts.index], 'y': value_counts.astype(int).tolist(), 'title': col,
+                'insight': f"Top category: {df[col].mode()[0]}",
+                'layout': self._chart_layout(f"Count of {col}", bargap=0.3,
+                                             xaxis={'title': {'text': 'category'}}, yaxis={'title': {'text': 'count'}})
+            }
+        return None
 
-        # Filter out identifier columns for analysis
-        analysis_cols = [col for col in df.columns if not self._is_identifier(df, col)]
-        df_analysis = df[analysis_cols]
+    def _histogram_bins(self, series: pd.Series) -> Dict[str, List[float]]:
+        """Bin a numeric column server-side; returns bar centers, counts and widths"""
+        values = series.dropna().to_numpy(dtype=float)
+        values = values[np.isfinite(values)]
+        if len(values) == 0:
+            return {'x': [], 'y': [], 'width': []}
+        bins = min(len(np.histogram_bin_edges(values, bins='auto')) - 1, self.HISTOGRAM_MAX_BINS)
+        counts, edges = np.histogram(values, bins=max(bins, 1))
+        return {
+            'x': ((edges[:-1] + edges[1:]) / 2).tolist(),
+            'y': counts.tolist(),
+            'width': np.diff(edges).tolist()
+        }
 
-        # 3. Generate Univariate Plots
-        univariate_plots = []
-        for col in df_analysis.columns[:10]:  # Limit to 10 for performance
-            if pd.api.types.is_numeric_dtype(df_analysis[col]):
-                fig = px.histogram(df_analysis, x=col, title=f"Distribution of {col}", template="plotly_white")
-                fig.update_layout(margin=dict(l=20, r=20, t=40, b=20), height=300, bargap=0.2)
-                div = pio.to_html(fig, full_html=False, include_plotlyjs=False)
-                univariate_plots.append({'title': col, 'div': div, 'insight': f"Mean: {df_analysis[col].mean():.2f}, Std: {df_analysis[col].std():.2f}"})
-            elif df_analysis[col].nunique() < 20:
-                value_counts = df_analysis[col].value_counts().reset_index()
-                value_counts.columns = ['category', 'count']
-                fig = px.bar(value_counts, x='category', y='count', title=f"Count of {col}", template="plotly_white")
-                fig.update_layout(margin=dict(l=20, r=20, t=40, b=20), height=300, bargap=0.3)
-                div = pio.to_html(fig, full_html=False, include_plotlyjs=False)
-                univariate_plots.append({'title': col, 'div': div, 'insight': f"Top category: {df_analysis[col].mode()[0]}"})
+    def _box_stats(self, df: pd.DataFrame, cat_col: str, num_col: str) -> Optional[Dict[str, List[Any]]]:
+        """
+        Quartiles, mean and Tukey whiskers (furthest points within 1.5 IQR)
+        per category, so the box plot does not carry the raw rows. Only finite
+        values count; None when no row has both a category and a finite value.
+        """
+        data = df[[cat_col, num_col]].dropna()
+        data = data[np.isfinite(data[num_col].to_numpy(dtype=float))]
+        if data.empty:
+            return None
+        grouped = data.groupby(cat_col, sort=False, observed=True)[num_col]
+        quartiles = grouped.quantile([0.25, 0.5, 0.75]).unstack()
+        # astype(float): mapping a category-dtype column yields a Categorical, which has no arithmetic
+        q1 = data[cat_col].map(quartiles[0.25]).astype(float)
+        q3 = data[cat_col].map(quartiles[0.75]).astype(float)
+        iqr = q3 - q1
+        values = data[num_col]
+        inside = data[(values >= q1 - 1.5 * iqr) & (values <= q3 + 1.5 * iqr)].groupby(cat_col, sort=False, observed=True)[num_col]
+        lower = inside.min().reindex(quartiles.index)
+        upper = inside.max().reindex(quartiles.index)
+        return {
+            'x': [str(c) for c in quartiles.index],
+            'q1': quartiles[0.25].tolist(),
+            'median': quartiles[0.5].tolist(),
+            'q3': quartiles[0.75].tolist(),
+            'mean': grouped.mean().reindex(quartiles.index).tolist(),
+            'lowerfence': lower.tolist(),
+            'upperfence': upper.tolist()
+        }
 
-        # 4. Generate Bivariate Plots
-        bivariate_plots = []
-        numeric_cols = df_analysis.select_dtypes(include=['number']).columns.tolist()
-        categorical_cols = df_analysis.select_dtypes(include=['object', 'category']).columns.tolist()
-        categorical_cols = [c for c in categorical_cols if df_analysis[c].nunique() < 10]  # Only low-cardinality categoricals
+    def _trendline(self, x: pd.Series, y: pd.Series, method: str) -> Optional[Dict[str, Any]]:
+        """
+        Closed-form least-squares fit of y on x (slope, intercept, R²) plus the
+        points of the line to draw. method is "ols", "lowess" or "none".
+        """
+        if method == "none":
+            return None
+        xs = x.to_numpy(dtype=float, na_value=np.nan)
+        ys = y.to_numpy(dtype=float, na_value=np.nan)
+        mask = np.isfinite(xs) & np.isfinite(ys)
+        xs, ys = xs[mask], ys[mask]
+        if len(xs) < 2:
+            return None
+
+        dx = xs - xs.mean()
+        dy = ys - ys.mean()
+        sxx = dx @ dx
+        if sxx == 0:
+            return None
+        sxy = dx @ dy
+        syy = dy @ dy
+        slope = sxy / sxx
+        intercept = ys.mean() - slope * xs.mean()
+        r2 = (sxy * sxy) / (sxx * syy) if syy > 0 else 1.0
+
+        if method == "lowess":
+            line_x, line_y = self._binned_lowess(xs, ys)
+            name = "LOWESS"
+        else:
+            line_x = np.array([xs.min(), xs.max()])
+            line_y = intercept + slope * line_x
+            name = f"OLS (R²={r2:.3f})"
+        return {
+            'name': name, 'x': line_x.tolist(), 'y': line_y.tolist(),
+            'slope': float(slope), 'intercept': float(intercept), 'r2': float(r2)
+        }
+
+    def _binned_lowess(self, xs: np.ndarray, ys: np.ndarray):
+        """Locally weighted linear fit (tricube weights) over equal-count bin means of the sorted points"""
+        order = np.argsort(xs, kind='stable')
+        bins = min(self.LOWESS_BINS, len(xs))
+        bx = np.array([chunk.mean() for chunk in np.array_split(xs[order], bins)])
+        by = np.array([chunk.mean() for chunk in np.array_split(ys[order], bins)])
+
+        k = max(int(np.ceil(self.LOWESS_FRAC * bins)), 2)
+        fitted = np.empty(bins)
+        for i in range(bins):
+            dist = np.abs(bx - bx[i])
+            h = np.partition(dist, k - 1)[k - 1]
+            w = np.clip(1 - (dist / h) ** 3, 0, None) ** 3 if h > 0 else (dist == 0).astype(float)
+            sw = w.sum()
+            mx = (w @ bx) / sw
+            my = (w @ by) / sw
+            var = w @ (bx - mx) ** 2
+            fitted[i] = my + ((w @ ((bx - mx) * (by - my))) / var) * (bx[i] - mx) if var > 0 else my
+        return bx, fitted
+
+    def _density_grid(self, x: pd.Series, y: pd.Series) -> Dict[str, Any]:
+        """2D histogram of a scatter's points; empty cells are None so they render transparent"""
+        xs = x.to_numpy(dtype=float, na_value=np.nan)
+        ys = y.to_numpy(dtype=float, na_value=np.nan)
+        mask = np.isfinite(xs) & np.isfinite(ys)
+        counts, x_edges, y_edges = np.histogram2d(xs[mask], ys[mask], bins=settings.DASHBOARD_DENSITY_BINS)
+        z = counts.T.astype(object)
+        z[counts.T == 0] = None
+        return {
+            'grid_x': ((x_edges[:-1] + x_edges[1:]) / 2).tolist(),
+            'grid_y': ((y_edges[:-1] + y_edges[1:]) / 2).tolist(),
+            'z': [[None if v is None else int(v) for v in row] for row in z]
+        }
+
+    def _bivariate_specs(self, df: pd.DataFrame, numeric_cols: List[str], categorical_cols: List[str],
+                         trendline: str = "ols") -> List[Dict[str, Any]]:
+        specs = []
 
-        # 4a. Numeric-Numeric (Scatter plots with correlation)
+        # Numeric-Numeric (Scatter plots with correlation)
         if len(numeric_cols) >= 2:
-            corr = df_analysis[numeric_cols].corr().abs()
+            corr = df[numeric_cols].corr().abs()
             pairs = (corr.where(np.triu(np.ones(corr.shape), k=1).astype(bool))
                      .stack()
                      .sort_values(ascending=False)
                      .head(6))
-            
+
             for (col1, col2), val in pairs.items():
-                fig = px.scatter(df_analysis, x=col1, y=col2, title=f"{col1} vs {col2} (Corr: {val:.2f})", 
-                               template="plotly_white", trendline="ols")
-                fig.update_layout(margin=dict(l=20, r=20, t=40, b=20), height=300)
-                div = pio.to_html(fig, full_html=False, include_plotlyjs=False)
-                bivariate_plots.append({'title': f"{col1} vs {col2} (Numeric)", 'div': div})
+                spec = {
+                    'kind': 'scatter', 'x': col1, 'y': col2, 'trendline': self._trendline(df[col1], df[col2], trendline),
+                    'title': f"{col1} vs {col2} (Numeric)",
+                    'layout': self._chart_layout(f"{col1} vs {col2} (Corr: {val:.2f})",
+                                                 xaxis={'title': {'text': str(col1)}}, yaxis={'title': {'text': str(col2)}})
+                }
+                # SVG up to a few thousand points, WebGL beyond that, a density grid once even WebGL struggles
+                points = int((df[col1].notna() & df[col2].notna()).sum())
+                if points > settings.DASHBOARD_WEBGL_MAX_POINTS:
+                    spec.update(kind='density', **self._density_grid(df[col1], df[col2]))
+                else:
+                    spec['webgl'] = points > settings.DASHBOARD_SVG_MAX_POINTS
+                specs.append(spec)
 
-        # 4b. Categorical-Numeric (Box plots)
+        # Categorical-Numeric (Box plots)
         for cat_col in categorical_cols[:5]:  # Limit to 5
             for num_col in numeric_cols[:3]:  # Limit to 3 numeric per categorical
-                fig = px.box(df_analysis, x=cat_col, y=num_col, 
-                           title=f"{num_col} by {cat_col}", template="plotly_white")
-                fig.update_layout(margin=dict(l=20, r=20, t=40, b=20), height=300)
-                div = pio.to_html(fig, full_html=False, include_plotlyjs=False)
-                bivariate_plots.append({'title': f"{num_col} by {cat_col} (Cat-Num)", 'div': div})
+                box = self._box_stats(df, cat_col, num_col)
+                if box is None:
+                    continue
+                specs.append({
+                    'kind': 'box', **box,
+                    'title': f"{num_col} by {cat_col} (Cat-Num)",
+                    'layout': self._chart_layout(f"{num_col} by {cat_col}",
+                                                 xaxis={'title': {'text': str(cat_col)}}, yaxis={'title': {'text': str(num_col)}})
+                })
 
-        # 4c. Categorical-Categorical (Stacked bar charts)
+        # Categorical-Categorical (Stacked bar charts)
         if len(categorical_cols) >= 2:
             for i, cat1 in enumerate(categorical_cols[:3]):
                 for cat2 in categorical_cols[i+1:i+2]:  # Pair with next one
-                    crosstab = pd.crosstab(df_analysis[cat1], df_analysis[cat2])
-                    crosstab_reset = crosstab.reset_index()
-                    crosstab_melted = crosstab_reset.melt(id_vars=cat1, var_name=cat2, value_name='count')
-                    
-                    fig = px.bar(crosstab_melted, x=cat1, y='count', color=cat2,
-                               title=f"{cat1} vs {cat2}", template="plotly_white", barmode='stack')
-                    fig.update_layout(margin=dict(l=20, r=20, t=40, b=20), height=300, bargap=0.2)
-                    div = pio.to_html(fig, full_html=False, include_plotlyjs=False)
-                    bivariate_plots.append({'title': f"{cat1} vs {cat2} (Cat-Cat)", 'div': div})
+                    crosstab = pd.crosstab(df[cat1], df[cat2])
+                    specs.append({
+                        'kind': 'stacked_bar', 'x': [str(v) for v in crosstab.index],
+                        'series': [{'name': str(c), 'y': crosstab[c].astype(int).tolist()} for c in crosstab.columns],
+                        'title': f"{cat1} vs {cat2} (Cat-Cat)",
+                        'layout': self._chart_layout(f"{cat1} vs {cat2}", barmode='stack', bargap=0.2,
+                                                     xaxis={'title': {'text': str(cat1)}}, yaxis={'title': {'text': 'count'}},
+                                                     legend={'title': {'text': str(cat2)}})
+                    })
 
-        # 5. Generate Correlation Heatmap
-        if len(numeric_cols) > 1:
-            corr_matrix = df_analysis[numeric_cols].corr()
-            fig = px.imshow(corr_matrix, text_auto=True, aspect="auto", color_continuous_scale='RdBu_r', title="Correlation Heatmap")
-            fig.update_layout(height=600)
-            correlation_plot = pio.to_html(fig, full_html=False, include_plotlyjs=False)
+        return specs
+
+    def _heatmap_spec(self, df: pd.DataFrame, numeric_cols: List[str]) -> Dict[str, Any]:
+        corr_matrix = df[numeric_cols].corr()
+        z = corr_matrix.round(4).astype(object).where(corr_matrix.notna(), None).values.tolist()
+        return {
+            'kind': 'heatmap', 'x': [str(c) for c in corr_matrix.columns], 'y': [str(c) for c in corr_matrix.index], 'z': z,
+            'layout': {'title': {'text': "Correlation Heatmap"}, 'height': 600}
+        }
+
+    def _figure_from_spec(self, spec: Dict[str, Any], df: pd.DataFrame) -> go.Figure:
+        """Build the full Plotly figure for a chart spec (server-rendered "figures" mode)"""
+        kind = spec['kind']
+        if kind == 'histogram':
+            fig = go.Figure(go.Bar(x=spec['x'], y=spec['y'], width=spec['width']))
+            fig.update_layout(template="plotly_white")
+        elif kind == 'bar':
+            fig = px.bar(pd.DataFrame({'category': spec['x'], 'count': spec['y']}), x='category', y='count', template="plotly_white")
+        elif kind == 'scatter':
+            fig = px.scatter(df, x=spec['x'], y=spec['y'], template="plotly_white",
+                             render_mode='webgl' if spec.get('webgl') else 'svg')
+        elif kind == 'density':
+            fig = go.Figure(go.Heatmap(x=spec['grid_x'], y=spec['grid_y'], z=spec['z'], colorscale='Blues',
+                                       colorbar={'title': {'text': 'points'}}))
+            fig.update_layout(template="plotly_white")
+        elif kind == 'box':
+            fig = go.Figure(go.Box(x=spec['x'], q1=spec['q1'], median=spec['median'], q3=spec['q3'], mean=spec['mean'],
+                                   lowerfence=spec['lowerfence'], upperfence=spec['upperfence'], boxpoints=False))
+            fig.update_layout(template="plotly_white")
+        elif kind == 'stacked_bar':
+            fig = go.Figure([go.Bar(name=series['name'], x=spec['x'], y=series['y']) for series in spec['series']])
+            fig.update_layout(template="plotly_white")
+        elif kind == 'heatmap':
+            corr_matrix = pd.DataFrame(spec['z'], index=spec['y'], columns=spec['x'], dtype=float)
+            fig = px.imshow(corr_matrix, text_auto=True, aspect="auto", color_continuous_scale='RdBu_r')
         else:
-            correlation_plot = "<p>Not enough numeric columns for correlation analysis.</p>"
+            raise ValueError(f"Unknown chart kind: {kind}")
+        line = spec.get('trendline')
+        if line:
+            fig.add_trace(go.Scatter(x=line['x'], y=line['y'], mode='lines', name=line['name'], showlegend=False))
+        fig.update_layout(**spec['layout'])
+        return fig
 
-        # 6. Render Template using Jinja2
-        try:
-            from jinja2 import Template
-            t = Template(self.template)
-            html = t.render(
-                total_records=total_records,
-                total_columns=total_columns,
-                missing_cells=missing_cells,
-                duplicate_rows=duplicate_rows,
-                insights=insights,
-                quality_table=quality_table_html,
-                univariate_plots=univariate_plots,
-                bivariate_plots=bivariate_plots,
-                correlation_plot=correlation_plot
-            )
-        except ImportError:
-            print("Jinja2 not found, falling back to simple replacement (loops will fail)")
-            html = self.template
+    def _render_chart(self, spec: Dict[str, Any], df: pd.DataFrame, render_mode: str, client_specs: List[Dict[str, Any]]) -> str:
+        """Return the chart's HTML: a full Plotly div, or a placeholder filled in by CLIENT_SCRIPT"""
+        if render_mode == "client":
+            client_spec = {k: v for k, v in spec.items() if k not in ('title', 'insight')}
+            client_spec['id'] = f"chart-{len(client_specs)}"
+            client_specs.append(client_spec)
+            return f'<div id="{client_spec["id"]}" style="min-height: {spec["layout"].get("height", 300)}px"></div>'
+        fig = self._figure_from_spec(spec, df)
+        return pio.to_html(fig, full_html=False, include_plotlyjs=False)
+
+    def _script_json(self, text: str) -> str:
+        # Keep "</script>" inside string values from closing the tag early
+        return text.replace('</', '<\\/')
+
+    def _json_safe(self, value: Any) -> Any:
+        """NaN and ±inf become None (JSON.parse rejects them); numpy scalars and arrays become plain Python"""
+        if isinstance(value, dict):
+            return {k: self._json_safe(v) for k, v in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [self._json_safe(v) for v in value]
+        if isinstance(value, np.ndarray):
+            return self._json_safe(value.tolist())
+        if isinstance(value, np.generic):
+            value = value.item()
+        if isinstance(value, float) and not math.isfinite(value):
+            return None
+        return value
+
+    def _build_data_block(self, df: pd.DataFrame, specs: List[Dict[str, Any]], compress: bool) -> str:
+        """
+        Serialize every column the client specs reference, once, as
+        {name: {"t": "n", "v": [...]}} for numbers or
+        {name: {"t": "c", "c": [codes], "k": [categories]}} for everything else.
+        """
+        columns = []
+        for spec in specs:
+            if spec['kind'] == 'scatter':
+                for key in ('x', 'y'):
+                    if key in spec and spec[key] not in columns:
+                        columns.append(spec[key])
 
-        return io.BytesIO(html.encode('utf-8'))
+        parts = []
+        for col in columns:
+            series = df[col]
+            if pd.api.types.is_integer_dtype(series):
+                values = series.to_json(orient='values')
+                parts.append(f'{json.dumps(str(col))}:{{"t":"n","v":{values}}}')
+            elif pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+                # 7 significant digits at any magnitude (to_json's double_precision counts
+                # decimal places, which flattens small-scale columns to 0); non-finite -> null
+                floats = series.to_numpy(dtype=float, na_value=np.nan)
+                values = '[' + ','.join(
+                    '{:.7g}'.format(v) if ok else 'null' for v, ok in zip(floats.tolist(), np.isfinite(floats).tolist())
+                ) + ']'
+                parts.append(f'{json.dumps(str(col))}:{{"t":"n","v":{values}}}')
+            else:
+                codes, categories = pd.factorize(series)
+                codes_json = pd.Series(codes).to_json(orient='values')
+                parts.append(f'{json.dumps(str(col))}:{{"t":"c","c":{codes_json},"k":{json.dumps([str(c) for c in categories])}}}')
+        data_json = '{' + ','.join(parts) + '}'
 
-        total_columns = len(df.columns)
-        missing_cells = df.isnull().sum().sum()
-        duplicate_rows = df.duplicated().sum()
+        if compress:
+            encoded = base64.b64encode(gzip.compress(data_json.encode('utf-8'), compresslevel=6)).decode('ascii')
+            return f'<script type="application/octet-stream" id="dashboard-data" data-encoding="gzip-base64">{encoded}</script>'
+        return f'<script type="application/json" id="dashboard-data">{self._script_json(data_json)}</script>'
+
+    def generate_dashboard(self, df: pd.DataFrame, stats: Dict[str, Any], insights: List[str], timer: Optional[PhaseTimer] = None,
+                           render_mode: Optional[str] = None, compress_data: Optional[bool] = None,
+                           offline: Optional[bool] = None) -> io.BytesIO:
+        """
+        Build the interactive HTML dashboard.
+
+        render_mode "figures" embeds a complete Plotly figure per chart.
+        "client" embeds the needed columns once as a data block plus small
+        chart specs, and CLIENT_SCRIPT draws the charts in the browser.
+        offline inlines plotly.js and the CSS so the file needs no network.
+        """
+        timer = ensure_timer(timer)
+        render_mode = render_mode or settings.DASHBOARD_RENDER_MODE
+        if render_mode not in ("figures", "client"):
+            raise ValueError(f"Unsupported render mode: {render_mode}")
+        if compress_data is None:
+            compress_data = settings.DASHBOARD_COMPRESS_DATA
+        if offline is None:
+            offline = settings.DASHBOARD_OFFLINE
+        client_specs: List[Dict[str, Any]] = []
+
+        # 1. Prepare Overview Data
+        with timer.span("overview"):
+            total_records = len(df)
+            total_columns = len(df.columns)
+            missing_cells = df.isnull().sum().sum()
+            duplicate_rows = df.duplicated().sum()
 
         # 2. Prepare Data Quality Table
-        quality_df = pd.DataFrame({
-            'Column': df.columns,
-            'Type': df.dtypes.astype(str),
-            'Missing (%)': (df.isnull().sum() / len(df) * 100).round(1),
-            'Unique Values': df.nunique(),
-            'Memory Usage (KB)': (df.memory_usage(deep=True)[1:] / 1024).round(1).values
-        })
-        quality_table_html = quality_df.to_html(classes='table table-striped table-hover', index=False)
+        with timer.span("data quality"):
+            quality_df = pd.DataFrame({
+                'Column': df.columns,
+                'Type': df.dtypes.astype(str),
+                'Missing (%)': (df.isnull().sum() / len(df) * 100).round(1),
+                'Unique Values': df.nunique(),
+                'Memory Usage (KB)': (df.memory_usage(deep=True)[1:] / 1024).round(1).values
+            })
+            quality_table_html = quality_df.to_html(classes='table table-striped table-hover', index=False)
+
+        # Filter out identifier columns for analysis
+        analysis_cols = [col for col in df.columns if not self._is_identifier(df, col)]
+        df_analysis = df[analysis_cols]
 
         # 3. Generate Univariate Plots
         univariate_plots = []
-        for col in df.columns[:10]:  # Limit to 10 for performance
-            if pd.api.types.is_numeric_dtype(df[col]):
-                fig = px.histogram(df, x=col, title=f"Distribution of {col}", template="plotly_white")
-                fig.update_layout(margin=dict(l=20, r=20, t=40, b=20), height=300)
-                div = pio.to_html(fig, full_html=False, include_plotlyjs=False)
-                univariate_plots.append({'title': col, 'div': div, 'insight': f"Mean: {df[col].mean():.2f}, Std: {df[col].std():.2f}"})
-            elif df[col].nunique() < 20:
-                # Fix: properly reset index and rename columns for plotly
-                value_counts = df[col].value_counts().reset_index()
-                value_counts.columns = ['category', 'count']
-                fig = px.bar(value_counts, x='category', y='count', title=f"Count of {col}", template="plotly_white")
-                fig.update_layout(margin=dict(l=20, r=20, t=40, b=20), height=300)
-                div = pio.to_html(fig, full_html=False, include_plotlyjs=False)
-                univariate_plots.append({'title': col, 'div': div, 'insight': f"Top category: {df[col].mode()[0]}"})
+        for col in df_analysis.columns[:10]:  # Limit to 10 for performance
+            with timer.span(f"chart:{col}"):
+                spec = self._univariate_spec(df_analysis, col)
+                if spec:
+                    div = self._render_chart(spec, df_analysis, render_mode, client_specs)
+                    univariate_plots.append({'title': spec['title'], 'div': div, 'insight': spec['insight']})
 
         # 4. Generate Bivariate Plots
-        bivariate_plots = []
-        numeric_cols = df.select_dtypes(include=['number']).columns
-        if len(numeric_cols) >= 2:
-            corr = df[numeric_cols].corr().abs()
-            # Find top correlated pairs
-            pairs = (corr.where(np.triu(np.ones(corr.shape), k=1).astype(bool))
-                     .stack()
-                     .sort_values(ascending=False)
-                     .head(6))
-            
-            for (col1, col2), val in pairs.items():
-                fig = px.scatter(df, x=col1, y=col2, title=f"{col1} vs {col2} (Corr: {val:.2f})", template="plotly_white", trendline="ols")
-                fig.update_layout(margin=dict(l=20, r=20, t=40, b=20), height=300)
-                div = pio.to_html(fig, full_html=False, include_plotlyjs=False)
-                bivariate_plots.append({'title': f"{col1} vs {col2}", 'div': div})
+        numeric_cols = df_analysis.select_dtypes(include=['number']).columns.tolist()
+        categorical_cols = df_analysis.select_dtypes(include=['object', 'category']).columns.tolist()
+        categorical_cols = [c for c in categorical_cols if df_analysis[c].nunique() < 10]  # Only low-cardinality categoricals
+
+        with timer.span("bivariate"):
+            bivariate_plots = [
+                {'title': spec['title'], 'div': self._render_chart(spec, df_analysis, render_mode, client_specs)}
+                for spec in self._bivariate_specs(df_analysis, numeric_cols, categorical_cols, settings.DASHBOARD_TRENDLINE)
+            ]
 
         # 5. Generate Correlation Heatmap
-        if len(numeric_cols) > 1:
-            corr_matrix = df[numeric_cols].corr()
-            fig = px.imshow(corr_matrix, text_auto=True, aspect="auto", color_continuous_scale='RdBu_r', title="Correlation Heatmap")
-            fig.update_layout(height=600)
-            correlation_plot = pio.to_html(fig, full_html=False, include_plotlyjs=False)
-        else:
-            correlation_plot = "<p>Not enough numeric columns for correlation analysis.</p>"
-
-        # 6. Render Template (Simple string replacement for now, Jinja2 would be better but keeping dependencies low)
-        # Using simple replace for keys
-        html = self.template
-        html = html.replace('{{ total_records }}', str(total_records))
-        html = html.replace('{{ total_columns }}', str(total_columns))
-        html = html.replace('{{ missing_cells }}', str(missing_cells))
-        html = html.replace('{{ duplicate_rows }}', str(duplicate_rows))
-        
-        # Insights loop (manual)
-        insights_html = ""
-        for insight in insights:
-            insights_html += f'<li class="list-group-item">{insight}</li>'
-        html = html.replace('{% for insight in insights %}\n                                <li class="list-group-item">{{ insight }}</li>\n                                {% endfor %}', insights_html)
-
-        html = html.replace('{{ quality_table }}', quality_table_html)
-        html = html.replace('{{ correlation_plot | safe }}', correlation_plot)
-
-        # Univariate loop (manual)
-        uni_html = ""
-        for plot in univariate_plots:
-            uni_html += f"""
-                        <div class="col-md-6 mb-4">
-                            <div class="card h-100">
-                                <div class="card-header">{plot['title']}</div>
-                                <div class="card-body">
-                                    {plot['div']}
-                                    <div class="mt-3 text-muted small">
-                                        {plot['insight']}
-                                    </div>
-                                </div>
-                            </div>
-                        </div>"""
-        # Regex replacement for the loop block would be safer, but let's try to match the block structure
-        # Actually, since I defined the template string, I can just split it or use Jinja2 if available.
-        # Let's try to use jinja2 if installed, otherwise fallback to replace.
-        # Given the complexity of loops, I'll assume Jinja2 is available (standard in FastAPI/Flask envs).
-        
-        try:
-            from jinja2 import Template
-            t = Template(self.template)
-            html = t.render(
-                total_records=total_records,
-                total_columns=total_columns,
-                missing_cells=missing_cells,
-                duplicate_rows=duplicate_rows,
-                insights=insights,
-                quality_table=quality_table_html,
-                univariate_plots=univariate_plots,
-                bivariate_plots=bivariate_plots,
-                correlation_plot=correlation_plot
-            )
-        except ImportError:
-            # Fallback or error
-            print("Jinja2 not found, falling back to simple replacement (loops will fail)")
-            pass
+        with timer.span("heatmap"):
+            if len(numeric_cols) > 1:
+                correlation_plot = self._render_chart(self._heatmap_spec(df_analysis, numeric_cols), df_analysis, render_mode, client_specs)
+            else:
+                correlation_plot = "<p>Not enough numeric columns for correlation analysis.</p>"
+
+        # 6. Embed data and chart specs for client-side rendering
+        data_block = ""
+        client_script = ""
+        if render_mode == "client":
+            with timer.span("data block"):
+                # allow_nan=False: a non-finite value that slips past _json_safe fails here, not in the browser
+                payload = json.dumps(self._json_safe({
+                    'template': pio.templates['plotly_white'].to_plotly_json(),
+                    'specs': client_specs
+                }), default=str, allow_nan=False)
+                data_block = (self._build_data_block(df_analysis, client_specs, compress_data) +
+                              f'\n    <script type="application/json" id="dashboard-specs">{self._script_json(payload)}</script>')
+                client_script = CLIENT_SCRIPT
+
+        # 7. Render Template using Jinja2
+        with timer.span("render"):
+            if self.compiled_template is not None:
+                from plotly.offline import get_plotlyjs_version
+                html = self.compiled_template.render(
+                    total_records=total_records,
+                    total_columns=total_columns,
+                    missing_cells=missing_cells,
+                    duplicate_rows=duplicate_rows,
+                    insights=insights,
+                    quality_table=quality_table_html,
+                    univariate_plots=univariate_plots,
+                    bivariate_plots=bivariate_plots,
+                    correlation_plot=correlation_plot,
+                    data_block=data_block,
+                    client_script=client_script,
+                    offline=offline,
+                    offline_css=OFFLINE_CSS if offline else "",
+                    plotly_js=_plotly_bundle() if offline else "",
+                    plotly_version=get_plotlyjs_version()
+                )
+            else:
+                print("Jinja2 not found, falling back to simple replacement (loops will fail)")
+                html = self.template
 
-        return io.BytesIO(html.encode('utf-8'))
+        with timer.span("serialization"):
+            buffer = io.BytesIO(html.encode('utf-8'))
+        return buffer
@@ -0,0 +1,104 @@
+import threading
+from typing import Any, Dict, Hashable, Optional
+import razorpay
+import requests
+from requests.adapters import HTTPAdapter
+from backend.app.core.cache import TTLCache
+from backend.app.core.config import settings
+
+
+class PaymentGatewayError(Exception):
+    """The gateway rejected the request or could not be reached"""
+
+    def __init__(self, message: str, unavailable: bool = False):
+        super().__init__(message)
+        self.unavailable = unavailable
+
+
+class _TimeoutSession(requests.Session):
+    """A requests session that applies a default (connect, read) timeout to every call"""
+
+    def __init__(self, timeout):
+        super().__init__()
+        self.timeout = timeout
+
+    def request(self, *args, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        return super().request(*args, **kwargs)
+
+
+class RazorpayGateway:
+    """
+    Razorpay behind the two operations checkout needs. API calls go through one
+    pooled keep-alive session with explicit timeouts. Orders are idempotent per
+    (user, plan): a repeated or concurrent checkout reuses the unpaid order for
+    PAYMENT_ORDER_REUSE_SECONDS instead of creating another (per process).
+    """
+
+    # Order creation for the same key is serialized on one of these locks
+    LOCK_STRIPES = 64
+
+    def __init__(self, key_id: Optional[str] = None, key_secret: Optional[str] = None,
+                 base_url: Optional[str] = None):
+        self.key_id = key_id if key_id is not None else settings.RAZORPAY_KEY_ID
+        self.session = _TimeoutSession((settings.RAZORPAY_CONNECT_TIMEOUT_SECONDS, settings.RAZORPAY_READ_TIMEOUT_SECONDS))
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=settings.RAZORPAY_POOL_SIZE, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.client = razorpay.Client(
+            session=self.session,
+            auth=(self.key_id, key_secret if key_secret is not None else settings.RAZORPAY_KEY_SECRET),
+            base_url=base_url or settings.RAZORPAY_BASE_URL
+        )
+        self.orders = TTLCache("payment_orders", settings.PAYMENT_ORDER_REUSE_SECONDS)
+        self._locks = [threading.Lock() for _ in range(self.LOCK_STRIPES)]
+
+    def _lock_for(self, key: Hashable) -> threading.Lock:
+        return self._locks[hash(key) % self.LOCK_STRIPES]
+
+    def create_order(self, user_id: int, plan_id: str, amount: int, currency: str = "INR",
+                     notes: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """Create (or reuse) the order for this user and plan; amount is in paise"""
+        key = (user_id, plan_id)
+        with self._lock_for(key):
+            order = self.orders.get(key)
+            if order is not None and order['amount'] == amount:
+                return order
+            data = {
+                "amount": amount,
+                "currency": currency,
+                "receipt": f"receipt_order_{user_id}_{plan_id}",
+                "payment_capture": 1,
+                "notes": notes or {}
+            }
+            try:
+                order = self.client.order.create(data=data)
+            except requests.RequestException as e:
+                raise PaymentGatewayError(f"Razorpay unreachable: {e}", unavailable=True)
+            except (razorpay.errors.BadRequestError, razorpay.errors.GatewayError, razorpay.errors.ServerError) as e:
+                raise PaymentGatewayError(str(e), unavailable=not isinstance(e, razorpay.errors.BadRequestError))
+            self.orders.set(key, order)
+            return order
+
+    def order_paid(self, user_id: int, plan_id: str):
+        """Forget the cached order so the next checkout for this plan starts a new one"""
+        self.orders.invalidate((user_id, plan_id))
+
+    def verify_signature(self, order_id: str, payment_id: str, signature: str) -> bool:
+        """Check Checkout's payment signature (a local HMAC; no API call)"""
+        try:
+            self.client.utility.verify_payment_signature({
+                'razorpay_order_id': order_id,
+                'razorpay_payment_id': payment_id,
+                'razorpay_signature': signature
+            })
+        except razorpay.errors.SignatureVerificationError:
+            return False
+        return True
+
+    def close(self):
+        self.session.close()
+
+
+# Shared by the payment routes; replaced wholesale by the load-test stubs
+gateway = RazorpayGateway()
@@ -15,6 +15,7 @@ from pptx.enum.chart import XL_CHART_TYPE
 from pptx.dml.color import RGBColor
 from pptx.enum.text import PP_ALIGN
 from typing import Callable, Optional
+from backend.app.core.instrumentation import PhaseTimer, ensure_timer
 
 class ReportService:
     # Color Schemes
@@ -486,7 +487,65 @@ class ReportService:
                     paragraph.font.name = 'Calibri'
                     paragraph.font.size = PptxInches(0.14)
 
-    def generate_word_report(self, df: pd.DataFrame, stats: Dict[str, Any], insights: List[str], progress_callback: Optional[Callable[[int], None]] = None) -> io.BytesIO:
+    def _add_word_variable_charts(self, doc, df: pd.DataFrame, col: str):
+        """Add the per-variable charts (and frequency table) for the univariate section"""
+        if pd.api.types.is_numeric_dtype(df[col]):
+            # Numeric: Histogram and Box Plot
+            fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(10, 4))
+
+            # Histogram with KDE
+            sns.histplot(df[col].dropna(), kde=True, ax=ax1, color=self.colors['primary'])
+            ax1.set_title(f'Distribution of {col}', color=self.colors['text'])
+
+            # Box plot for outlier detection
+            bp = ax2.boxplot([df[col].dropna()], patch_artist=True)
+            bp['boxes'][0].set_facecolor(self.colors['secondary'])
+            bp['boxes'][0].set_alpha(0.7)
+            bp['medians'][0].set(color=self.colors['primary'], linewidth=2)
+            ax2.set_title(f'Outlier Detection: {col}', color=self.colors['text'])
+            ax2.set_ylabel(col)
+
+            plt.tight_layout()
+            doc.add_picture(self._plot_to_bytes(fig), width=Inches(6))
+        else:
+            # Categorical: Frequency Table
+            doc.add_paragraph("Frequency Table:")
+            counts = df[col].value_counts()
+            percents = (counts / len(df[col].dropna()) * 100).round(1)
+            summary = pd.DataFrame({'Count': counts, 'Percentage': percents}).head(10)
+
+            ftable = doc.add_table(rows=1, cols=3)
+            ftable.style = 'Table Grid'
+            hdr = ftable.rows[0].cells
+            hdr[0].text = 'Category'
+            hdr[1].text = 'Count'
+            hdr[2].text = 'Percentage'
+
+            for idx, row in summary.iterrows():
+                r = ftable.add_row().cells
+                r[0].text = str(idx)
+                r[1].text = str(int(row['Count']))
+                r[2].text = f"{row['Percentage']}%"
+
+            doc.add_paragraph("") # Spacer
+
+            # Categorical: Bar Chart
+            fig, ax = plt.subplots(figsize=(6, 4))
+            top_cats = df[col].value_counts().head(10)
+            sns.barplot(x=top_cats.values, y=[str(x) for x in top_cats.index], ax=ax, palette='viridis')
+            ax.set_title(f'Top Categories in {col}', color=self.colors['text'])
+            doc.add_picture(self._plot_to_bytes(fig), width=Inches(5))
+
+            # Categorical: Pie Chart (if few categories)
+            if len(top_cats) <= 6:
+                fig, ax = plt.subplots(figsize=(5, 5))
+                ax.pie(top_cats.values, labels=[str(x) for x in top_cats.index], autopct='%1.1f%%', colors=self.colors['palette'])
+                ax.set_title(f'Proportion of {col}', color=self.colors['text'])
+                doc.add_picture(self._plot_to_bytes(fig), width=Inches(4))
+
+    def generate_word_report(self, df: pd.DataFrame, stats: Dict[str, Any], insights: List[str], progress_callback: Optional[Callable[[int], None]] = None, timer: Optional[PhaseTimer] = None) -> io.BytesIO:
+        timer = ensure_timer(timer)
+
         # Set styles
         doc = Document()
         style = doc.styles['Normal']
@@ -583,128 +642,81 @@ class ReportService:
             doc.add_paragraph(self._truncate_text(ai_insights['short'], 300), style='Intense Quote')
             doc.add_paragraph(self._truncate_text(ai_insights['long'], 1000))
 
-            if pd.api.types.is_numeric_dtype(df[col]):
-                # Numeric: Histogram and Box Plot
-                fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(10, 4))
-                
-                # Histogram with KDE
-                sns.histplot(df[col].dropna(), kde=True, ax=ax1, color=self.colors['primary'])
-                ax1.set_title(f'Distribution of {col}', color=self.colors['text'])
-                
-                # Box plot for outlier detection
-                bp = ax2.boxplot([df[col].dropna()], patch_artist=True)
-                bp['boxes'][0].set_facecolor(self.colors['secondary'])
-                bp['boxes'][0].set_alpha(0.7)
-                bp['medians'][0].set(color=self.colors['primary'], linewidth=2)
-                ax2.set_title(f'Outlier Detection: {col}', color=self.colors['text'])
-                ax2.set_ylabel(col)
-                
-                plt.tight_layout()
-                doc.add_picture(self._plot_to_bytes(fig), width=Inches(6))
-            else:
-                # Categorical: Frequency Table
-                doc.add_paragraph("Frequency Table:")
-                counts = df[col].value_counts()
-                percents = (counts / len(df[col].dropna()) * 100).round(1)
-                summary = pd.DataFrame({'Count': counts, 'Percentage': percents}).head(10)
-                
-                ftable = doc.add_table(rows=1, cols=3)
-                ftable.style = 'Table Grid'
-                hdr = ftable.rows[0].cells
-                hdr[0].text = 'Category'
-                hdr[1].text = 'Count'
-                hdr[2].text = 'Percentage'
-                
-                for idx, row in summary.iterrows():
-                    r = ftable.add_row().cells
-                    r[0].text = str(idx)
-                    r[1].text = str(int(row['Count']))
-                    r[2].text = f"{row['Percentage']}%"
-                
-                doc.add_paragraph("") # Spacer
-
-                # Categorical: Bar Chart
-                fig, ax = plt.subplots(figsize=(6, 4))
-                top_cats = df[col].value_counts().head(10)
-                sns.barplot(x=top_cats.values, y=[str(x) for x in top_cats.index], ax=ax, palette='viridis')
-                ax.set_title(f'Top Categories in {col}', color=self.colors['text'])
-                doc.add_picture(self._plot_to_bytes(fig), width=Inches(5))
-                
-                # Categorical: Pie Chart (if few categories)
-                if len(top_cats) <= 6:
-                    fig, ax = plt.subplots(figsize=(5, 5))
-                    ax.pie(top_cats.values, labels=[str(x) for x in top_cats.index], autopct='%1.1f%%', colors=self.colors['palette'])
-                    ax.set_title(f'Proportion of {col}', color=self.colors['text'])
-                    doc.add_picture(self._plot_to_bytes(fig), width=Inches(4))
+            with timer.span(f"chart:{col}"):
+                self._add_word_variable_charts(doc, df, col)
 
         # 4. Multivariate Analysis (Heatmap)
         if progress_callback: progress_callback(85)
         doc.add_heading('4. Multivariate Analysis', level=1)
-        heatmap_bytes = self._generate_correlation_heatmap(df)
-        if heatmap_bytes:
-            doc.add_picture(heatmap_bytes, width=Inches(6))
+        with timer.span("heatmap"):
+            heatmap_bytes = self._generate_correlation_heatmap(df)
+            if heatmap_bytes:
+                doc.add_picture(heatmap_bytes, width=Inches(6))
 
         # 5. Key Relationships (Bivariate)
         if progress_callback: progress_callback(90)
         doc.add_heading('5. Key Relationships (Bivariate)', level=1)
         
-        # Numeric-Numeric Relationships
-        doc.add_heading('Numeric Correlations', level=2)
-        bi_plots = self._generate_bivariate_plots(df)
-        for plot_bytes in bi_plots:
-            doc.add_picture(plot_bytes, width=Inches(5))
-        
-        # Categorical-Numeric Relationships
-        doc.add_heading('Categorical vs Numeric Analysis', level=2)
-        categorical_cols = df.select_dtypes(include=['object', 'category']).columns
-        numeric_cols = df.select_dtypes(include=[np.number]).columns
-        
-        # Filter out identifiers
-        from backend.app.services.data_processing import DataProcessor
-        processor = DataProcessor()
-        processor.df = df
-        categorical_cols = [col for col in categorical_cols if not processor.is_identifier(col)]
-        numeric_cols = [col for col in numeric_cols if not processor.is_identifier(col)]
-        
-        # Generate box plots for top 5 categorical-numeric pairs
-        cat_num_count = 0
-        for cat_col in categorical_cols:
-            if cat_num_count >= 5:
-                break
-            for num_col in numeric_cols:
+        with timer.span("bivariate"):
+            # Numeric-Numeric Relationships
+            doc.add_heading('Numeric Correlations', level=2)
+            bi_plots = self._generate_bivariate_plots(df)
+            for plot_bytes in bi_plots:
+                doc.add_picture(plot_bytes, width=Inches(5))
+        
+            # Categorical-Numeric Relationships
+            doc.add_heading('Categorical vs Numeric Analysis', level=2)
+            categorical_cols = df.select_dtypes(include=['object', 'category']).columns
+            numeric_cols = df.select_dtypes(include=[np.number]).columns
+        
+            # Filter out identifiers
+            from backend.app.services.data_processing import DataProcessor
+            processor = DataProcessor()
+            processor.df = df
+            categorical_cols = [col for col in categorical_cols if not processor.is_identifier(col)]
+            numeric_cols = [col for col in numeric_cols if not processor.is_identifier(col)]
+        
+            # Generate box plots for top 5 categorical-numeric pairs
+            cat_num_count = 0
+            for cat_col in categorical_cols:
                 if cat_num_count >= 5:
                     break
-                n_categories = df[cat_col].nunique()
-                if 2 <= n_categories <= 8:
-                    # Create box plot
-                    fig, ax = plt.subplots(figsize=(7, 4))
-                    grouped_data = df.groupby(cat_col)[num_col].apply(list).to_dict()
-                    top_cats = df[cat_col].value_counts().head(8).index
-                    data_to_plot = [grouped_data[cat] for cat in top_cats if cat in grouped_data]
-                    labels = [str(cat)[:20] for cat in top_cats if cat in grouped_data]
+                for num_col in numeric_cols:
+                    if cat_num_count >= 5:
+                        break
+                    n_categories = df[cat_col].nunique()
+                    if 2 <= n_categories <= 8:
+                        # Create box plot
+                        fig, ax = plt.subplots(figsize=(7, 4))
+                        grouped_data = df.groupby(cat_col)[num_col].apply(list).to_dict()
+                        top_cats = df[cat_col].value_counts().head(8).index
+                        data_to_plot = [grouped_data[cat] for cat in top_cats if cat in grouped_data]
+                        labels = [str(cat)[:20] for cat in top_cats if cat in grouped_data]
                     
-                    bp = ax.boxplot(data_to_plot, labels=labels, patch_artist=True)
-                    for patch in bp['boxes']:
-                        patch.set_facecolor(self.colors['secondary'])
-                        patch.set_alpha(0.7)
-                    for median in bp['medians']:
-                        median.set(color=self.colors['primary'], linewidth=2)
+                        bp = ax.boxplot(data_to_plot, labels=labels, patch_artist=True)
+                        for patch in bp['boxes']:
+                            patch.set_facecolor(self.colors['secondary'])
+                            patch.set_alpha(0.7)
+                        for median in bp['medians']:
+                            median.set(color=self.colors['primary'], linewidth=2)
                     
-                    ax.set_xlabel(cat_col)
-                    ax.set_ylabel(num_col)
-                    ax.set_title(f'{num_col} by {cat_col}', color=self.colors['text'])
-                    plt.xticks(rotation=45, ha='right')
-                    plt.tight_layout()
+                        ax.set_xlabel(cat_col)
+                        ax.set_ylabel(num_col)
+                        ax.set_title(f'{num_col} by {cat_col}', color=self.colors['text'])
+                        plt.xticks(rotation=45, ha='right')
+                        plt.tight_layout()
                     
-                    doc.add_picture(self._plot_to_bytes(fig), width=Inches(5.5))
-                    cat_num_count += 1
+                        doc.add_picture(self._plot_to_bytes(fig), width=Inches(5.5))
+                        cat_num_count += 1
 
-        buffer = io.BytesIO()
-        doc.save(buffer)
-        buffer.seek(0)
+        with timer.span("serialization"):
+            buffer = io.BytesIO()
+            doc.save(buffer)
+            buffer.seek(0)
         return buffer
 
-    def generate_ppt_report(self, df: pd.DataFrame, stats: Dict[str, Any], insights: List[str], progress_callback: Optional[Callable[[int], None]] = None) -> io.BytesIO:
+    def generate_ppt_report(self, df: pd.DataFrame, stats: Dict[str, Any], insights: List[str], progress_callback: Optional[Callable[[int], None]] = None, timer: Optional[PhaseTimer] = None) -> io.BytesIO:
+        timer = ensure_timer(timer)
         prs = Presentation()
         from backend.app.services.ai_service import AIService
         ai_service = AIService()
@@ -801,77 +813,81 @@ class ReportService:
             p.font.size = PptxInches(0.14)
 
             # Add Charts based on Type
-            if var_type == 'numerical_continuous':
-                self._add_histogram_slide(prs, df, col)
-                self._apply_chart_style(prs.slides[-1].shapes[-1].chart)
-            elif var_type == 'numerical_discrete':
-                # For discrete, a bar chart of counts might be better than a histogram if few values
-                self._add_categorical_slide(prs, df, col) # Re-use bar chart logic
-                self._apply_chart_style(prs.slides[-1].shapes[-1].chart)
-            elif var_type == 'time_series':
-                self._add_time_series_slide(prs, df, col)
-            else: # Categorical
-                self._add_frequency_table_slide(prs, df, col)
-                self._add_categorical_slide(prs, df, col)
-                self._apply_chart_style(prs.slides[-1].shapes[-1].chart)
+            with timer.span(f"chart:{col}"):
+                if var_type == 'numerical_continuous':
+                    self._add_histogram_slide(prs, df, col)
+                    self._apply_chart_style(prs.slides[-1].shapes[-1].chart)
+                elif var_type == 'numerical_discrete':
+                    # For discrete, a bar chart of counts might be better than a histogram if few values
+                    self._add_categorical_slide(prs, df, col) # Re-use bar chart logic
+                    self._apply_chart_style(prs.slides[-1].shapes[-1].chart)
+                elif var_type == 'time_series':
+                    self._add_time_series_slide(prs, df, col)
+                else: # Categorical
+                    self._add_frequency_table_slide(prs, df, col)
+                    self._add_categorical_slide(prs, df, col)
+                    self._apply_chart_style(prs.slides[-1].shapes[-1].chart)
 
         # Add Section Separator for Relationship Analysis
         if progress_callback: progress_callback(85)
         self._add_section_separator_slide(prs, "Relationship Analysis")
 
         # Heatmap
-        heatmap_bytes = self._generate_correlation_heatmap(df)
-        if heatmap_bytes:
-            slide = prs.slides.add_slide(prs.slide_layouts[5])
-            slide.shapes.title.text = "Correlation Matrix"
-            slide.shapes.add_picture(heatmap_bytes, PptxInches(1), PptxInches(1.5), height=PptxInches(5))
-
-        # Bivariate Plots (Numeric vs Numeric)
-        numeric_df = df.select_dtypes(include=[np.number])
-        
-        # Filter out identifiers from numeric columns
-        from backend.app.services.data_processing import DataProcessor
-        processor = DataProcessor()
-        processor.df = df
-        numeric_cols_filtered = [col for col in numeric_df.columns if not processor.is_identifier(col)]
-        numeric_df = numeric_df[numeric_cols_filtered]
-        
-        if numeric_df.shape[1] >= 2:
-            corr_matrix = numeric_df.corr().abs()
-            pairs = (corr_matrix.where(np.triu(np.ones(corr_matrix.shape), k=1).astype(bool))
-                     .stack()
-                     .sort_values(ascending=False)
-                     .head(20)) # Limit to top 20 significant
+        with timer.span("heatmap"):
+            heatmap_bytes = self._generate_correlation_heatmap(df)
+            if heatmap_bytes:
+                slide = prs.slides.add_slide(prs.slide_layouts[5])
+                slide.shapes.title.text = "Correlation Matrix"
+                slide.shapes.add_picture(heatmap_bytes, PptxInches(1), PptxInches(1.5), height=PptxInches(5))
+
+        with timer.span("bivariate"):
+            # Bivariate Plots (Numeric vs Numeric)
+            numeric_df = df.select_dtypes(include=[np.number])
+        
+            # Filter out identifiers from numeric columns
+            from backend.app.services.data_processing import DataProcessor
+            processor = DataProcessor()
+            processor.df = df
+            numeric_cols_filtered = [col for col in numeric_df.columns if not processor.is_identifier(col)]
+            numeric_df = numeric_df[numeric_cols_filtered]
+        
+            if numeric_df.shape[1] >= 2:
+                corr_matrix = numeric_df.corr().abs()
+                pairs = (corr_matrix.where(np.triu(np.ones(corr_matrix.shape), k=1).astype(bool))
+                         .stack()
+                         .sort_values(ascending=False)
+                         .head(20)) # Limit to top 20 significant
             
-            for (col1, col2), val in pairs.items():
-                self._add_scatter_slide(prs, df, col1, col2)
-                self._apply_chart_style(prs.slides[-1].shapes[-1].chart)
-        
-        # Categorical vs Numeric Analysis
-        categorical_cols = df.select_dtypes(include=['object', 'category']).columns
-        numeric_cols = df.select_dtypes(include=[np.number]).columns
-        
-        # Filter out identifiers
-        from backend.app.services.data_processing import DataProcessor
-        processor = DataProcessor()
-        processor.df = df
-        categorical_cols = [col for col in categorical_cols if not processor.is_identifier(col)]
-        numeric_cols = [col for col in numeric_cols if not processor.is_identifier(col)]
-        
-        # Generate box plots for categorical vs numeric (limit to top 10 combinations)
-        cat_num_pairs = []
-        for cat_col in categorical_cols:
-            for num_col in numeric_cols:
-                # Only include if categorical has reasonable number of categories (2-10)
-                n_categories = df[cat_col].nunique()
-                if 2 <= n_categories <= 10:
-                    cat_num_pairs.append((cat_col, num_col))
-        
-        # Limit to 10 most interesting pairs
-        for cat_col, num_col in cat_num_pairs[:10]:
-            self._add_box_plot_slide(prs, df, cat_col, num_col)
-
-        buffer = io.BytesIO()
-        prs.save(buffer)
-        buffer.seek(0)
+                for (col1, col2), val in pairs.items():
+                    self._add_scatter_slide(prs, df, col1, col2)
+                    self._apply_chart_style(prs.slides[-1].shapes[-1].chart)
+        
+            # Categorical vs Numeric Analysis
+            categorical_cols = df.select_dtypes(include=['object', 'category']).columns
+            numeric_cols = df.select_dtypes(include=[np.number]).columns
+        
+            # Filter out identifiers
+            from backend.app.services.data_processing import DataProcessor
+            processor = DataProcessor()
+            processor.df = df
+            categorical_cols = [col for col in categorical_cols if not processor.is_identifier(col)]
+            numeric_cols = [col for col in numeric_cols if not processor.is_identifier(col)]
+        
+            # Generate box plots for categorical vs numeric (limit to top 10 combinations)
+            cat_num_pairs = []
+            for cat_col in categorical_cols:
+                for num_col in numeric_cols:
+                    # Only include if categorical has reasonable number of categories (2-10)
+                    n_categories = df[cat_col].nunique()
+                    if 2 <= n_categories <= 10:
+                        cat_num_pairs.append((cat_col, num_col))
+        
+            # Limit to 10 most interesting pairs
+            for cat_col, num_col in cat_num_pairs[:10]:
+                self._add_box_plot_slide(prs, df, cat_col, num_col)
+
+        with timer.span("serialization"):
+            buffer = io.BytesIO()
+            prs.save(buffer)
+            buffer.seek(0)
         return buffer
@@ -1,11 +1,17 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from backend.app.api.endpoints import router as api_router
 from backend.app.api.auth import router as auth_router
 from backend.app.api.payment import router as payment_router
 from backend.app.api.admin import router as admin_router
 from backend.app.db.base import Base
-from backend.app.db.session import engine
+from backend.app.db.session import engine, SessionLocal
+from backend.app.core.metrics import REGISTRY, MetricsMiddleware
+from backend.app.core.profiler import ProfilerMiddleware
+from backend.app.core.sweeper import PlanExpirySweeper
+from backend.app.core.config import settings
+from backend.app.api import deps
 
 # Create tables
 Base.metadata.create_all(bind=engine)
@@ -23,17 +29,59 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Total-Count"],
 )
+app.add_middleware(ProfilerMiddleware)
+# Outermost, so latency and sizes cover the whole stack
+app.add_middleware(MetricsMiddleware)
 
 app.include_router(api_router, prefix="/api")
 app.include_router(auth_router, prefix="/api/auth", tags=["auth"])
 app.include_router(payment_router, prefix="/api/payment", tags=["payment"])
 app.include_router(admin_router, prefix="/api/admin", tags=["admin"])
 
+plan_sweeper = PlanExpirySweeper(
+    SessionLocal, settings.PLAN_SWEEP_INTERVAL_SECONDS,
+    on_expired=lambda emails: [deps.invalidate_user(email) for email in emails]
+)
+
+@app.on_event("startup")
+def start_plan_sweeper():
+    plan_sweeper.start()
+
+@app.on_event("shutdown")
+def stop_plan_sweeper():
+    plan_sweeper.stop()
+
+@app.on_event("shutdown")
+def flush_email_queue():
+    from backend.app.services.email_service import email_queue
+    email_queue.stop()
+
+@app.on_event("shutdown")
+def close_payment_gateway():
+    from backend.app.services import payment_gateway
+    payment_gateway.gateway.close()
+
+@app.on_event("shutdown")
+def stop_report_scheduler():
+    from backend.app.api.endpoints import report_scheduler
+    report_scheduler.shutdown(timeout=settings.REPORT_SHUTDOWN_TIMEOUT_SECONDS)
+
+@app.on_event("shutdown")
+def stop_password_hashing():
+    from backend.app.core.security import shutdown_password_hashing
+    shutdown_password_hashing()
+
 @app.get("/")
 async def root():
     return {"message": "Data Analysis API is running"}
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus text exposition of the in-process metrics"""
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -0,0 +1,11 @@
+"""
+Benchmarks for the backend.
+
+    python -m benchmarks                       # service micro-benchmarks, small + medium tiers
+    python -m benchmarks --tiers large --cases excel,dashboard --memory
+    python -m benchmarks --compare old.json new.json
+    python -m benchmarks.load --users 20       # hermetic end-to-end load test
+
+Nothing is imported here: benchmarks.load has to configure the environment
+(database URL, working directory) before the backend is first imported.
+"""
@@ -0,0 +1,49 @@
+import argparse
+import json
+import sys
+import warnings
+from benchmarks.datasets import TIERS
+from benchmarks.runner import run_benchmarks, write_results, compare_results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Service micro-benchmarks")
+    parser.add_argument("--tiers", default="small,medium", help=f"comma-separated tiers ({', '.join(TIERS)})")
+    parser.add_argument("--cases", default="", help="comma-separated substrings of case names to run")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--memory", action="store_true", help="record peak memory with tracemalloc (slower)")
+    parser.add_argument("--output", help="result file (default: benchmarks/results/bench-<time>.json)")
+    parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "CURRENT"), help="compare two result files")
+    parser.add_argument("--threshold", type=float, default=0.15, help="slowdown that counts as a regression")
+    args = parser.parse_args(argv)
+    # pandas/seaborn deprecation warnings repeat per column and bury the timings
+    warnings.simplefilter("ignore")
+
+    if args.compare:
+        with open(args.compare[0]) as f:
+            baseline = json.load(f)
+        with open(args.compare[1]) as f:
+            current = json.load(f)
+        if baseline['meta'].get('memory') != current['meta'].get('memory'):
+            print("Note: only one run traced memory; tracemalloc slows allocation-heavy cases several times over")
+        rows = compare_results(baseline, current, args.threshold)
+        for row in rows:
+            flag = "  REGRESSION" if row['regression'] else ""
+            print(f"{row['tier']:<8} {row['case']:<36} {row['baseline_ms']:>10.1f} -> {row['current_ms']:>10.1f} ms "
+                  f"({row['change']:+.1%}){flag}")
+        return 1 if any(row['regression'] for row in rows) else 0
+
+    tiers = [t.strip() for t in args.tiers.split(",") if t.strip()]
+    unknown = [t for t in tiers if t not in TIERS]
+    if unknown:
+        parser.error(f"unknown tier(s): {', '.join(unknown)}")
+    patterns = [c.strip() for c in args.cases.split(",") if c.strip()]
+
+    document = run_benchmarks(tiers, patterns, repeat=args.repeat, warmup=args.warmup, memory=args.memory)
+    print(f"Results written to {write_results(document, args.output)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+import os
+import tempfile
+from dataclasses import dataclass
+from typing import Callable, Dict, Any, List, Optional
+import pandas as pd
+from backend.app.core.instrumentation import PhaseTimer
+from backend.app.services.data_processing import DataProcessor
+from backend.app.services.data_quality_service import DataQualityService
+from backend.app.services.statistical_tests import StatisticalTestsService
+from backend.app.services.ai_service import AIService
+from backend.app.services.report_service import ReportService
+from backend.app.services.excel_service import ExcelService
+from backend.app.services.html_dashboard_service import HtmlDashboardService
+from benchmarks.datasets import dataset_csv
+
+
+class BenchmarkContext:
+    """Inputs shared by every case for one tier, built once outside the timed region"""
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self.csv = dataset_csv(df)
+        processor = DataProcessor()
+        processor.df = df
+        processor.filename = "benchmark.csv"
+        self.stats = processor.get_statistics()
+        self.insights = AIService().generate_insights(self.stats)
+
+    def processor(self) -> DataProcessor:
+        """A processor holding a private copy, so cleaning cases cannot affect each other"""
+        processor = DataProcessor()
+        processor.df = self.df.copy()
+        processor.filename = "benchmark.csv"
+        return processor
+
+
+@dataclass
+class BenchmarkCase:
+    name: str
+    # fn(context, timer); setup work done before the call is not timed
+    fn: Callable[[BenchmarkContext, PhaseTimer], Any]
+    # Skip tiers above this many rows (report formats that are slow by design)
+    max_rows: Optional[int] = None
+
+
+def _load(ctx: BenchmarkContext, timer: PhaseTimer):
+    DataProcessor().load_data(ctx.csv, "benchmark.csv")
+
+
+def _statistics(ctx: BenchmarkContext, timer: PhaseTimer):
+    ctx.processor().get_statistics()
+
+
+def _clean(action: str, params: Dict[str, Any]):
+    def run(ctx: BenchmarkContext, timer: PhaseTimer):
+        processor = ctx.processor()
+        with timer.span(action):
+            processor.clean_data(action, params)
+    return run
+
+
+def _quality(ctx: BenchmarkContext, timer: PhaseTimer):
+    DataQualityService().analyze_quality(ctx.df)
+
+
+def _stat_test(test: str):
+    def run(ctx: BenchmarkContext, timer: PhaseTimer):
+        service = StatisticalTestsService()
+        if test == "anova":
+            service.run_anova(ctx.df, "category_0", "metric_0")
+        elif test == "t_test":
+            service.run_t_test(ctx.df, "segment", "metric_0")
+        elif test == "normality":
+            service.run_normality_test(ctx.df, "metric_1")
+        elif test == "chi_square":
+            service.run_chi_square_test(ctx.df, "category_0", "category_1")
+    return run
+
+
+def _word(ctx: BenchmarkContext, timer: PhaseTimer):
+    ReportService().generate_word_report(ctx.df, ctx.stats, ctx.insights, timer=timer)
+
+
+def _ppt(ctx: BenchmarkContext, timer: PhaseTimer):
+    ReportService().generate_ppt_report(ctx.df, ctx.stats, ctx.insights, timer=timer)
+
+
+def _excel_in_memory(ctx: BenchmarkContext, timer: PhaseTimer):
+    ExcelService().generate_excel_report(ctx.df, ctx.stats, ctx.insights, timer=timer)
+
+
+def _excel_streaming(ctx: BenchmarkContext, timer: PhaseTimer):
+    fd, path = tempfile.mkstemp(suffix=".xlsx")
+    os.close(fd)
+    try:
+        ExcelService().write_excel_report(ctx.df, ctx.stats, ctx.insights, path, timer=timer)
+    finally:
+        os.remove(path)
+
+
+def _dashboard(render_mode: str):
+    def run(ctx: BenchmarkContext, timer: PhaseTimer):
+        HtmlDashboardService().generate_dashboard(ctx.df, ctx.stats, ctx.insights, timer=timer, render_mode=render_mode)
+    return run
+
+
+CASES: List[BenchmarkCase] = [
+    BenchmarkCase("processor.load_csv", _load),
+    BenchmarkCase("processor.statistics", _statistics),
+    BenchmarkCase("processor.clean.drop_nulls", _clean("drop_nulls", {})),
+    BenchmarkCase("processor.clean.fill_nulls", _clean("fill_nulls", {"value": 0})),
+    BenchmarkCase("processor.clean.smart_impute", _clean("smart_impute", {"column": "metric_1", "strategy": "median"})),
+    BenchmarkCase("processor.clean.remove_outliers", _clean("remove_outliers", {"column": "metric_1", "method": "iqr"})),
+    BenchmarkCase("quality.analyze", _quality),
+    BenchmarkCase("stats.anova", _stat_test("anova")),
+    BenchmarkCase("stats.t_test", _stat_test("t_test")),
+    BenchmarkCase("stats.normality", _stat_test("normality")),
+    BenchmarkCase("stats.chi_square", _stat_test("chi_square")),
+    BenchmarkCase("report.word", _word, max_rows=50_000),
+    BenchmarkCase("report.ppt", _ppt, max_rows=50_000),
+    BenchmarkCase("excel.in_memory", _excel_in_memory),
+    BenchmarkCase("excel.streaming", _excel_streaming),
+    BenchmarkCase("dashboard.figures", _dashboard("figures")),
+    BenchmarkCase("dashboard.client", _dashboard("client")),
+]
@@ -0,0 +1,129 @@
+"""
+SQLite contention benchmark: concurrent user lookups and plan updates against a
+scratch database, once with the default rollback journal and once with the
+WAL pragmas db/session.py applies.
+
+    python -m benchmarks.database --threads 16 --seconds 5 --write-ratio 0.2
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, Any, List
+from sqlalchemy import select, update
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+from backend.app.db.base import Base
+from backend.app.db.session import build_engine
+from backend.app.models.user import User
+
+# name -> build_engine options; both wait up to 5 s for locks (pysqlite's own default)
+CONFIGS: Dict[str, Dict[str, Any]] = {
+    "rollback-journal": {"wal": False, "busy_timeout_ms": 5000},
+    "wal": {"wal": True, "busy_timeout_ms": 5000},
+}
+
+
+def _seed(session_factory, users: int):
+    db = session_factory()
+    db.add_all([
+        User(email=f"user{i}@example.com", hashed_password="x", is_verified=True, is_active=True)
+        for i in range(users)
+    ])
+    db.commit()
+    db.close()
+
+
+def run_config(name: str, threads: int, seconds: float, write_ratio: float, users: int) -> Dict[str, Any]:
+    """Run the mixed workload for one configuration on a fresh database file"""
+    directory = tempfile.mkdtemp(prefix="exceldrill-db-")
+    engine = build_engine(f"sqlite:///{os.path.join(directory, 'bench.db')}", **CONFIGS[name])
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    _seed(session_factory, users)
+
+    lock = threading.Lock()
+    latencies: Dict[str, List[float]] = {"read": [], "write": []}
+    errors = {"read": 0, "write": 0}
+    deadline = time.perf_counter() + seconds
+
+    def worker(seed: int):
+        rng = random.Random(seed)
+        local = {"read": [], "write": []}
+        local_errors = {"read": 0, "write": 0}
+        while time.perf_counter() < deadline:
+            kind = "write" if rng.random() < write_ratio else "read"
+            email = f"user{rng.randrange(users)}@example.com"
+            start = time.perf_counter()
+            db = session_factory()
+            try:
+                if kind == "read":
+                    db.execute(select(User).where(User.email == email)).scalars().first()
+                else:
+                    db.execute(update(User).where(User.email == email).values(is_paid=True, plan_type="monthly"))
+                    db.commit()
+                local[kind].append(time.perf_counter() - start)
+            except OperationalError:
+                db.rollback()
+                local_errors[kind] += 1
+            finally:
+                db.close()
+        with lock:
+            for key in local:
+                latencies[key].extend(local[key])
+                errors[key] += local_errors[key]
+
+    pool = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    started = time.perf_counter()
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    engine.dispose()
+
+    result: Dict[str, Any] = {"config": name, "elapsed_s": round(elapsed, 2)}
+    for kind, values in latencies.items():
+        ordered = sorted(values)
+        result[kind] = {
+            "ops": len(values),
+            "ops_per_s": round(len(values) / elapsed, 1),
+            "p50_ms": round(statistics.median(ordered) * 1000, 2) if ordered else None,
+            "p95_ms": round(ordered[int(0.95 * (len(ordered) - 1))] * 1000, 2) if ordered else None,
+            "errors": errors[kind],
+        }
+    return result
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.database", description="SQLite journal-mode contention benchmark")
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=5.0, help="duration per configuration")
+    parser.add_argument("--write-ratio", type=float, default=0.2, help="fraction of operations that are writes")
+    parser.add_argument("--users", type=int, default=1000, help="rows in the user table")
+    parser.add_argument("--output", help="write the JSON result here")
+    args = parser.parse_args(argv)
+
+    results = []
+    for name in CONFIGS:
+        result = run_config(name, args.threads, args.seconds, args.write_ratio, args.users)
+        results.append(result)
+        print(f"{name:<18} " + "  ".join(
+            f"{kind} {result[kind]['ops_per_s']:>8.1f}/s p95 {result[kind]['p95_ms']} ms errors {result[kind]['errors']}"
+            for kind in ("read", "write")
+        ))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"threads": args.threads, "seconds": args.seconds, "write_ratio": args.write_ratio,
+                       "results": results}, f, indent=2)
+        print(f"Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
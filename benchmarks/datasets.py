@@ -0,0 +1,91 @@
+from dataclasses import dataclass, asdict
+from typing import Dict, Any
+import numpy as np
+import pandas as pd
+
+# Word list for the free-text columns
+_WORDS = np.array([
+    "alpha", "bravo", "charlie", "delta", "echo", "foxtrot", "golf", "hotel", "india", "juliet",
+    "kilo", "lima", "mike", "november", "oscar", "papa", "quebec", "romeo", "sierra", "tango",
+    "uniform", "victor", "whiskey", "xray", "yankee", "zulu"
+])
+
+
+@dataclass(frozen=True)
+class DatasetSpec:
+    """Shape of a synthetic dataset; the same spec and seed always give the same frame"""
+    rows: int
+    numeric: int = 6
+    categorical: int = 3
+    datetime: int = 1
+    text: int = 1
+    null_rate: float = 0.05
+    cardinality: int = 8
+    seed: int = 42
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+# Size tiers used by the runner
+TIERS: Dict[str, DatasetSpec] = {
+    "small": DatasetSpec(rows=2_000),
+    "medium": DatasetSpec(rows=50_000),
+    "large": DatasetSpec(rows=250_000),
+}
+
+
+def make_dataset(spec: DatasetSpec) -> pd.DataFrame:
+    """
+    Build a reproducible DataFrame for spec.
+
+    Column names avoid the identifier keywords (id, name, no, code, ...) so the
+    services treat every column as analysable. "segment" always has exactly two
+    levels for the t-test; the other categoricals have spec.cardinality levels
+    with a skewed (Zipf-like) distribution.
+    """
+    rng = np.random.default_rng(spec.seed)
+    n = spec.rows
+    columns: Dict[str, Any] = {}
+
+    base = rng.normal(size=n)
+    for i in range(spec.numeric):
+        # Mix of correlated, skewed and uniform columns so correlations and outliers are non-trivial
+        if i % 3 == 0:
+            values = base * (i + 1) + rng.normal(scale=0.5, size=n)
+        elif i % 3 == 1:
+            values = rng.lognormal(mean=3, sigma=0.8, size=n)
+        else:
+            values = rng.uniform(0, 1000, size=n)
+        columns[f"metric_{i}"] = values.round(3)
+
+    weights = 1 / np.arange(1, spec.cardinality + 1)
+    weights /= weights.sum()
+    for i in range(spec.categorical):
+        levels = np.array([f"level_{i}_{j}" for j in range(spec.cardinality)])
+        columns[f"category_{i}"] = levels[rng.choice(spec.cardinality, size=n, p=weights)]
+    columns["segment"] = np.where(base + rng.normal(scale=1.0, size=n) > 0, "A", "B")
+
+    start = np.datetime64("2020-01-01")
+    for i in range(spec.datetime):
+        columns[f"date_{i}"] = start + rng.integers(0, 5 * 365, size=n).astype("timedelta64[D]")
+
+    for i in range(spec.text):
+        words = _WORDS[rng.integers(0, len(_WORDS), size=(n, 3))]
+        columns[f"comment_{i}"] = [" ".join(w) for w in words]
+
+    df = pd.DataFrame(columns)
+
+    if spec.null_rate > 0:
+        # Nulls everywhere except "segment", which the t-test needs complete
+        for col in df.columns:
+            if col == "segment":
+                continue
+            mask = rng.random(n) < spec.null_rate
+            df.loc[mask, col] = None
+    return df
+
+
+def dataset_csv(df: pd.DataFrame) -> bytes:
+    """The dataset as an uploaded CSV file, for load benchmarks"""
+    return df.to_csv(index=False).encode("utf-8")
@@ -0,0 +1,285 @@
+"""
+Equivalence harness for optimized analytics code.
+
+Each EquivalenceCase pairs a reference implementation (today's pandas/scipy
+code) with an optional optimized one. Running the harness evaluates both on
+the synthetic corpus and reports every value that differs beyond the case's
+tolerances. Cases without an optimized engine still take part in golden mode:
+
+    python -m benchmarks.equivalence --record        # before: store reference outputs
+    python -m benchmarks.equivalence                 # after: pairs + golden outputs must agree
+
+so a rewrite made in place (same method, new implementation) is checked
+against the numbers the old code produced.
+"""
+import argparse
+import json
+import math
+import os
+import sys
+import warnings
+from dataclasses import dataclass
+from typing import Callable, Dict, Any, List, Optional
+import numpy as np
+import pandas as pd
+from scipy import stats as scipy_stats
+from backend.app.services.data_processing import DataProcessor
+from backend.app.services.data_quality_service import DataQualityService
+from backend.app.services.statistical_tests import StatisticalTestsService
+from backend.app.services.html_dashboard_service import HtmlDashboardService
+from benchmarks.datasets import DatasetSpec, TIERS, make_dataset
+
+GOLDEN_DIR = os.path.join(os.path.dirname(__file__), "golden")
+
+# The size tiers plus edge shapes that optimized code tends to get wrong:
+# heavy nulls, two-level categoricals, and frames too small for some tests
+CORPUS: Dict[str, DatasetSpec] = {
+    **TIERS,
+    "sparse": DatasetSpec(rows=5_000, null_rate=0.4, cardinality=2, seed=7),
+    "tiny": DatasetSpec(rows=12, cardinality=3, seed=3),
+}
+
+
+@dataclass
+class EquivalenceCase:
+    name: str
+    # fn(df) -> JSON-like output; reference is today's behaviour
+    reference: Callable[[pd.DataFrame], Any]
+    optimized: Optional[Callable[[pd.DataFrame], Any]] = None
+    rtol: float = 1e-9
+    atol: float = 1e-12
+
+
+def _processor(df: pd.DataFrame) -> DataProcessor:
+    processor = DataProcessor()
+    processor.df = df.copy()
+    return processor
+
+
+def normalize(value: Any) -> Any:
+    """Convert pandas/numpy output to plain JSON types; dict keys become strings"""
+    if isinstance(value, dict):
+        return {str(k): normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [normalize(v) for v in value]
+    if isinstance(value, np.ndarray):
+        return [normalize(v) for v in value.tolist()]
+    if isinstance(value, (pd.Series, pd.Index)):
+        return [normalize(v) for v in value.tolist()]
+    if isinstance(value, pd.DataFrame):
+        return normalize(value.to_dict())
+    if isinstance(value, np.generic):
+        return normalize(value.item())
+    if isinstance(value, (pd.Timestamp, np.datetime64)):
+        return str(value)
+    if value is pd.NaT:
+        return None
+    return value
+
+
+def _is_missing(value: Any) -> bool:
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+
+def compare_outputs(reference: Any, candidate: Any, rtol: float = 1e-9, atol: float = 1e-12, path: str = "$") -> List[str]:
+    """
+    Structural comparison of two normalized outputs. Floats must agree within
+    rtol/atol (NaN and None count as equal, infinities must match exactly);
+    everything else must be equal. Returns one message per mismatch.
+    """
+    if _is_missing(reference) and _is_missing(candidate):
+        return []
+    if isinstance(reference, bool) or isinstance(candidate, bool):
+        return [] if reference == candidate else [f"{path}: {reference!r} != {candidate!r}"]
+    if isinstance(reference, (int, float)) and isinstance(candidate, (int, float)):
+        if isinstance(reference, float) and isinstance(candidate, float) and math.isinf(reference) and reference == candidate:
+            return []
+        if _is_missing(reference) or _is_missing(candidate) or not math.isclose(reference, candidate, rel_tol=rtol, abs_tol=atol):
+            return [f"{path}: {reference!r} != {candidate!r}"]
+        return []
+    if isinstance(reference, dict) and isinstance(candidate, dict):
+        problems = []
+        missing = sorted(set(reference) - set(candidate))
+        extra = sorted(set(candidate) - set(reference))
+        if missing:
+            problems.append(f"{path}: missing keys {missing[:5]}")
+        if extra:
+            problems.append(f"{path}: unexpected keys {extra[:5]}")
+        for key in reference:
+            if key in candidate:
+                problems.extend(compare_outputs(reference[key], candidate[key], rtol, atol, f"{path}.{key}"))
+        return problems
+    if isinstance(reference, list) and isinstance(candidate, list):
+        if len(reference) != len(candidate):
+            return [f"{path}: length {len(reference)} != {len(candidate)}"]
+        problems = []
+        for i, (a, b) in enumerate(zip(reference, candidate)):
+            problems.extend(compare_outputs(a, b, rtol, atol, f"{path}[{i}]"))
+        return problems
+    return [] if reference == candidate else [f"{path}: {reference!r} != {candidate!r}"]
+
+
+# Reference implementations for code that has already been optimized
+
+def _reference_box_stats(df: pd.DataFrame, cat_col: str, num_col: str) -> Optional[Dict[str, List[Any]]]:
+    """Per-category loop with numpy percentiles; the straightforward version of HtmlDashboardService._box_stats"""
+    data = df[[cat_col, num_col]].dropna()
+    data = data[np.isfinite(data[num_col].to_numpy(dtype=float))]
+    if data.empty:
+        return None
+    result = {'x': [], 'q1': [], 'median': [], 'q3': [], 'mean': [], 'lowerfence': [], 'upperfence': []}
+    for category in pd.unique(data[cat_col]):
+        values = np.sort(data.loc[data[cat_col] == category, num_col].to_numpy(dtype=float))
+        q1, median, q3 = np.percentile(values, [25, 50, 75])
+        iqr = q3 - q1
+        inside = values[(values >= q1 - 1.5 * iqr) & (values <= q3 + 1.5 * iqr)]
+        result['x'].append(str(category))
+        result['q1'].append(q1)
+        result['median'].append(median)
+        result['q3'].append(q3)
+        result['mean'].append(values.mean())
+        result['lowerfence'].append(inside.min())
+        result['upperfence'].append(inside.max())
+    return result
+
+
+def _as_category(df: pd.DataFrame, column: str) -> pd.DataFrame:
+    return df.assign(**{column: df[column].astype("category")})
+
+
+def _with_infinities(df: pd.DataFrame, column: str) -> pd.DataFrame:
+    values = df[column].astype(float).copy()
+    values.iloc[::7] = np.inf
+    values.iloc[3::11] = -np.inf
+    return df.assign(**{column: values})
+
+
+def _reference_trendline(df: pd.DataFrame, x_col: str, y_col: str) -> Dict[str, Any]:
+    """scipy's least-squares regression in place of the closed-form dashboard trendline"""
+    data = df[[x_col, y_col]].dropna()
+    fit = scipy_stats.linregress(data[x_col], data[y_col])
+    line_x = np.array([data[x_col].min(), data[x_col].max()])
+    return {
+        'x': line_x, 'y': fit.intercept + fit.slope * line_x,
+        'slope': fit.slope, 'intercept': fit.intercept, 'r2': fit.rvalue ** 2
+    }
+
+
+def _optimized_trendline(df: pd.DataFrame, x_col: str, y_col: str) -> Dict[str, Any]:
+    fit = HtmlDashboardService()._trendline(df[x_col], df[y_col], "ols")
+    return {key: fit[key] for key in ('x', 'y', 'slope', 'intercept', 'r2')}
+
+
+CASES: List[EquivalenceCase] = [
+    EquivalenceCase("processor.statistics", lambda df: _processor(df).get_statistics()),
+    EquivalenceCase("processor.univariate.numeric", lambda df: _processor(df).get_univariate_analysis("metric_1")),
+    EquivalenceCase("processor.univariate.categorical", lambda df: _processor(df).get_univariate_analysis("category_0")),
+    EquivalenceCase("processor.bivariate.numeric", lambda df: _processor(df).get_bivariate_analysis("metric_0", "metric_3")),
+    EquivalenceCase("processor.bivariate.box", lambda df: _processor(df).get_bivariate_analysis("category_0", "metric_1")),
+    EquivalenceCase("processor.chi_square", lambda df: _processor(df).get_chi_square_test("category_0", "category_1")),
+    EquivalenceCase("processor.multivariate", lambda df: _processor(df).get_multivariate_analysis(
+        [c for c in df.columns if c.startswith("metric_")])),
+    EquivalenceCase("quality.analyze", lambda df: DataQualityService().analyze_quality(df)),
+    EquivalenceCase("stats.anova", lambda df: StatisticalTestsService().run_anova(df, "category_0", "metric_0")),
+    EquivalenceCase("stats.t_test", lambda df: StatisticalTestsService().run_t_test(df, "segment", "metric_0")),
+    EquivalenceCase("stats.normality", lambda df: StatisticalTestsService().run_normality_test(df, "metric_1")),
+    EquivalenceCase("stats.chi_square", lambda df: StatisticalTestsService().run_chi_square_test(df, "category_0", "category_1")),
+    EquivalenceCase("dashboard.box_stats",
+                    lambda df: _reference_box_stats(df, "category_0", "metric_1"),
+                    lambda df: HtmlDashboardService()._box_stats(df, "category_0", "metric_1")),
+    # The generated corpora hold object-dtype categories; uploads can also arrive as pandas "category"
+    EquivalenceCase("dashboard.box_stats.category_dtype",
+                    lambda df: _reference_box_stats(_as_category(df, "category_0"), "category_0", "metric_1"),
+                    lambda df: HtmlDashboardService()._box_stats(_as_category(df, "category_0"), "category_0", "metric_1")),
+    # No finite values at all (the pair is skipped), and infinities mixed into a column
+    EquivalenceCase("dashboard.box_stats.all_null",
+                    lambda df: _reference_box_stats(df.assign(metric_1=np.nan), "category_0", "metric_1"),
+                    lambda df: HtmlDashboardService()._box_stats(df.assign(metric_1=np.nan), "category_0", "metric_1")),
+    EquivalenceCase("dashboard.box_stats.non_finite",
+                    lambda df: _reference_box_stats(_with_infinities(df, "metric_1"), "category_0", "metric_1"),
+                    lambda df: HtmlDashboardService()._box_stats(_with_infinities(df, "metric_1"), "category_0", "metric_1")),
+    EquivalenceCase("dashboard.trendline",
+                    lambda df: _reference_trendline(df, "metric_0", "metric_3"),
+                    lambda df: _optimized_trendline(df, "metric_0", "metric_3"),
+                    rtol=1e-7, atol=1e-9),
+]
+
+
+def _evaluate(fn: Callable[[pd.DataFrame], Any], df: pd.DataFrame) -> Any:
+    try:
+        return normalize(fn(df))
+    except Exception as e:
+        # Errors are outputs too: an optimized engine must fail where the reference fails
+        return {'exception': type(e).__name__}
+
+
+def _golden_path(corpus: str) -> str:
+    return os.path.join(GOLDEN_DIR, f"{corpus}.json")
+
+
+def run_equivalence(corpora: List[str], patterns: Optional[List[str]] = None, record: bool = False) -> List[Dict[str, Any]]:
+    """
+    Evaluate the selected cases on each corpus. Returns one row per check
+    ("pair" or "golden") with its mismatches; with record=True the reference
+    outputs are written as the new golden files instead of being checked.
+    """
+    rows = []
+    for corpus in corpora:
+        df = make_dataset(CORPUS[corpus])
+        print(f"[{corpus}] {len(df)} rows x {len(df.columns)} columns")
+        golden: Dict[str, Any] = {}
+        if not record and os.path.exists(_golden_path(corpus)):
+            with open(_golden_path(corpus)) as f:
+                golden = json.load(f)
+        recorded: Dict[str, Any] = {}
+
+        for case in CASES:
+            if patterns and not any(p in case.name for p in patterns):
+                continue
+            reference = _evaluate(case.reference, df)
+            # Round-trip through JSON so pairs and golden files compare the same representation
+            reference = json.loads(json.dumps(reference, default=str))
+            if record:
+                recorded[case.name] = reference
+            if case.optimized is not None:
+                candidate = json.loads(json.dumps(_evaluate(case.optimized, df), default=str))
+                rows.append({'corpus': corpus, 'case': case.name, 'check': "pair",
+                             'mismatches': compare_outputs(reference, candidate, case.rtol, case.atol)})
+            if case.name in golden:
+                rows.append({'corpus': corpus, 'case': case.name, 'check': "golden",
+                             'mismatches': compare_outputs(golden[case.name], reference, case.rtol, case.atol)})
+
+        if record:
+            os.makedirs(GOLDEN_DIR, exist_ok=True)
+            with open(_golden_path(corpus), "w") as f:
+                json.dump(recorded, f)
+            print(f"  recorded {len(recorded)} reference outputs to {_golden_path(corpus)}")
+    return rows
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.equivalence",
+                                     description="Check optimized analytics against reference outputs")
+    parser.add_argument("--corpus", default="small,sparse,tiny", help=f"comma-separated datasets ({', '.join(CORPUS)})")
+    parser.add_argument("--cases", default="", help="comma-separated substrings of case names to run")
+    parser.add_argument("--record", action="store_true", help="store the reference outputs as golden files")
+    args = parser.parse_args(argv)
+    warnings.simplefilter("ignore")
+
+    corpora = [c.strip() for c in args.corpus.split(",") if c.strip()]
+    unknown = [c for c in corpora if c not in CORPUS]
+    if unknown:
+        parser.error(f"unknown corpus: {', '.join(unknown)}")
+    patterns = [c.strip() for c in args.cases.split(",") if c.strip()]
+
+    rows = run_equivalence(corpora, patterns, record=args.record)
+    for row in rows:
+        status = "ok" if not row['mismatches'] else f"{len(row['mismatches'])} MISMATCHES"
+        print(f"  {row['corpus']:<8} {row['case']:<36} {row['check']:<7} {status}")
+        for message in row['mismatches'][:10]:
+            print(f"      {message}")
+    return 1 if any(row['mismatches'] for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1 @@
+"""Hermetic end-to-end load test; run with python -m benchmarks.load"""
@@ -0,0 +1,46 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+import warnings
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.load",
+                                     description="Concurrent end-to-end load test against stubbed external services")
+    parser.add_argument("--users", type=int, default=10, help="concurrent simulated users")
+    parser.add_argument("--sessions", type=int, default=1, help="sessions per user slot")
+    parser.add_argument("--rows", type=int, default=5000, help="rows in the uploaded dataset")
+    parser.add_argument("--formats", default="html,excel", help="report formats to build per session (word,ppt,excel,html)")
+    parser.add_argument("--plan", default="lifetime", help="plan bought in each session (24h, monthly, lifetime)")
+    parser.add_argument("--output", help="write the JSON result here")
+    args = parser.parse_args(argv)
+    warnings.simplefilter("ignore")
+
+    output = os.path.abspath(args.output) if args.output else None
+    # The database URL is read when the backend is imported, and reports and
+    # profiles are written relative to the working directory: point both at a
+    # scratch directory first so a run never touches the real database.
+    workdir = tempfile.mkdtemp(prefix="exceldrill-load-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'load.db')}"
+    os.environ.setdefault("RAZORPAY_KEY_SECRET", "stub-razorpay-secret")
+    sys.path.insert(0, os.getcwd())
+    os.chdir(workdir)
+
+    from backend.main import app
+    from benchmarks.load.harness import run_load, print_summary
+
+    formats = [f.strip() for f in args.formats.split(",") if f.strip()]
+    result = run_load(app, users=args.users, sessions=args.sessions, rows=args.rows, formats=formats, plan=args.plan)
+    result['meta']['workdir'] = workdir
+    print_summary(result)
+    if output:
+        with open(output, "w") as f:
+            json.dump(result, f, indent=2)
+        print(f"Results written to {output}")
+    return 1 if result['failed_sessions'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
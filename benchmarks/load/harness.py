@@ -0,0 +1,278 @@
+"""
+End-to-end load test: a real uvicorn server on localhost, driven by concurrent
+simulated users over HTTP. External services are replaced by benchmarks.load.stubs,
+so a run needs no network, credentials or mail server.
+
+Note: uploads and analysis share the app's single "default" dataset, so
+concurrent users overwrite each other's data. The harness measures the server
+under that contention; it does not check analysis results.
+"""
+import json
+import socket
+import statistics
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional
+from benchmarks.datasets import DatasetSpec, make_dataset, dataset_csv
+from benchmarks.load.stubs import install, razorpay_signature
+
+REPORT_POLL_INTERVAL = 0.25
+REPORT_TIMEOUT = 300.0
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class ServerThread:
+    """Runs the app under uvicorn in a daemon thread for the duration of a with-block"""
+
+    def __init__(self, app, port: Optional[int] = None):
+        import uvicorn
+        self.port = port or _free_port()
+        config = uvicorn.Config(app, host="127.0.0.1", port=self.port, log_level="warning", access_log=False)
+        self.server = uvicorn.Server(config)
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def __enter__(self):
+        self.thread.start()
+        deadline = time.time() + 30
+        while not self.server.started:
+            if not self.thread.is_alive() or time.time() > deadline:
+                raise RuntimeError("uvicorn did not start")
+            time.sleep(0.05)
+        return self
+
+    def __exit__(self, *exc):
+        self.server.should_exit = True
+        self.thread.join(timeout=10)
+
+
+class Recorder:
+    """Thread-safe latency and error log keyed by route template"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self.reports: Dict[str, List[float]] = defaultdict(list)
+
+    def record(self, route: str, seconds: float, status: int):
+        with self._lock:
+            self.latencies[route].append(seconds)
+            if status >= 400:
+                self.errors[route][str(status)] += 1
+
+    def record_error(self, route: str, kind: str):
+        with self._lock:
+            self.errors[route][kind] += 1
+
+    def record_report(self, report_format: str, seconds: float):
+        with self._lock:
+            self.reports[report_format].append(seconds)
+
+
+class HttpError(Exception):
+    def __init__(self, status: int, body: bytes):
+        super().__init__(f"HTTP {status}: {body[:200]!r}")
+        self.status = status
+
+
+class Client:
+    """Minimal urllib client that times every call under its route template"""
+
+    def __init__(self, base_url: str, recorder: Recorder):
+        self.base_url = base_url
+        self.recorder = recorder
+        self.token: Optional[str] = None
+
+    def request(self, method: str, route: str, path: Optional[str] = None, json_body: Any = None,
+                body: Optional[bytes] = None, content_type: Optional[str] = None) -> bytes:
+        headers = {"Accept-Encoding": "gzip"}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        if json_body is not None:
+            body = json.dumps(json_body).encode()
+            content_type = "application/json"
+        if content_type:
+            headers["Content-Type"] = content_type
+
+        req = urllib.request.Request(self.base_url + (path or route), data=body, headers=headers, method=method)
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(req, timeout=REPORT_TIMEOUT) as response:
+                payload = response.read()
+                status = response.status
+        except urllib.error.HTTPError as e:
+            payload = e.read()
+            status = e.code
+        except OSError as e:
+            self.recorder.record_error(route, type(e).__name__)
+            raise
+        self.recorder.record(route, time.perf_counter() - start, status)
+        if status >= 400:
+            raise HttpError(status, payload)
+        return payload
+
+    def json(self, method: str, route: str, path: Optional[str] = None, json_body: Any = None, **kwargs) -> Any:
+        return json.loads(self.request(method, route, path, json_body=json_body, **kwargs))
+
+    def upload(self, filename: str, content: bytes) -> Any:
+        boundary = uuid.uuid4().hex
+        body = (
+            f"--{boundary}\r\n"
+            f'Content-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+            f"Content-Type: text/csv\r\n\r\n"
+        ).encode() + content + f"\r\n--{boundary}--\r\n".encode()
+        return self.json("POST", "/api/upload", body=body, content_type=f"multipart/form-data; boundary={boundary}")
+
+
+def user_session(client: Client, credential: str, csv: bytes, formats: List[str], plan: str = "lifetime"):
+    """One simulated user: sign in with a Google ID token, pay, upload, explore, then build and fetch each report"""
+    recorder = client.recorder
+    client.token = client.json("POST", "/api/auth/google", json_body={"credential": credential})['access_token']
+    client.json("GET", "/api/auth/me")
+
+    order = client.json("POST", "/api/payment/create-order", json_body={"plan_id": plan})
+    payment_id = f"pay_{uuid.uuid4().hex[:14]}"
+    client.json("POST", "/api/payment/verify-payment", json_body={
+        "razorpay_order_id": order['id'],
+        "razorpay_payment_id": payment_id,
+        "razorpay_signature": razorpay_signature(order['id'], payment_id),
+        "plan_id": plan
+    })
+
+    client.upload("load.csv", csv)
+    client.json("GET", "/api/analyze")
+    client.json("POST", "/api/analyze/univariate", json_body={"column": "metric_0"})
+    client.json("POST", "/api/analyze/bivariate", json_body={"col1": "metric_0", "col2": "metric_1"})
+    client.json("POST", "/api/chart-data", json_body={"x_col": "metric_0", "y_col": "metric_1", "chart_type": "scatter"})
+    client.json("GET", "/api/insights")
+
+    for report_format in formats:
+        started = time.perf_counter()
+        try:
+            job_id = client.json("POST", "/api/report/start/{report_format}",
+                                 f"/api/report/start/{report_format}")['job_id']
+        except HttpError as e:
+            if e.status == 429:
+                # Rejected by the report scheduler's admission control; counted as an error above
+                continue
+            raise
+        while True:
+            status = client.json("GET", "/api/report/status/{job_id}", f"/api/report/status/{job_id}")
+            if status['status'] in ("completed", "failed"):
+                break
+            if time.perf_counter() - started > REPORT_TIMEOUT:
+                recorder.record_error("/api/report/status/{job_id}", "timeout")
+                break
+            time.sleep(REPORT_POLL_INTERVAL)
+        if status['status'] != "completed":
+            recorder.record_error("/api/report/status/{job_id}", f"job_{status['status']}")
+            continue
+        client.request("GET", "/api/report/download/{job_id}", f"/api/report/download/{job_id}")
+        recorder.record_report(report_format, time.perf_counter() - started)
+
+
+def _percentiles(values: List[float]) -> Dict[str, float]:
+    ordered = sorted(values)
+
+    def pick(q: float) -> float:
+        return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+    return {
+        'p50_ms': round(pick(0.50) * 1000, 1),
+        'p95_ms': round(pick(0.95) * 1000, 1),
+        'p99_ms': round(pick(0.99) * 1000, 1),
+        'max_ms': round(ordered[-1] * 1000, 1)
+    }
+
+
+def run_load(app, users: int = 10, sessions: int = 1, rows: int = 5000, formats: Optional[List[str]] = None,
+             plan: str = "lifetime") -> Dict[str, Any]:
+    """
+    Start the app on a local port and run users x sessions user sessions, users
+    at a time. Returns throughput, per-route latency percentiles, error counts
+    and report completion times by format.
+    """
+    from backend.app.core.config import settings
+    formats = formats if formats is not None else ["html", "excel"]
+    stubs = install()
+    csv = dataset_csv(make_dataset(DatasetSpec(rows=rows)))
+    recorder = Recorder()
+    failures: List[str] = []
+    run_id = uuid.uuid4().hex[:8]
+
+    with ServerThread(app) as server:
+        def session(index: int):
+            client = Client(server.base_url, recorder)
+            email = f"load-{run_id}-{index}@example.com"
+            try:
+                user_session(client, stubs['google'].id_token(email, settings.GOOGLE_CLIENT_ID), csv, formats, plan)
+            except Exception as e:
+                failures.append(f"{email}: {e}")
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=users) as pool:
+            list(pool.map(session, range(users * sessions)))
+        elapsed = time.perf_counter() - start
+
+    from backend.app.services.email_service import email_queue
+    email_queue.flush()
+    stubs['smtp'].stop()
+    stubs['razorpay'].stop()
+
+    total_requests = sum(len(v) for v in recorder.latencies.values())
+    routes = {}
+    for route, values in sorted(recorder.latencies.items()):
+        routes[route] = {'count': len(values), **_percentiles(values), 'errors': dict(recorder.errors.get(route, {}))}
+    for route, kinds in recorder.errors.items():
+        if route not in routes:
+            routes[route] = {'count': 0, 'errors': dict(kinds)}
+
+    return {
+        'meta': {'users': users, 'sessions': sessions, 'rows': rows, 'formats': formats, 'plan': plan},
+        'elapsed_s': round(elapsed, 2),
+        'requests': total_requests,
+        'throughput_rps': round(total_requests / elapsed, 2) if elapsed > 0 else 0.0,
+        'failed_sessions': failures,
+        'routes': routes,
+        'reports': {
+            fmt: {'count': len(values), 'median_s': round(statistics.median(values), 2), 'max_s': round(max(values), 2)}
+            for fmt, values in recorder.reports.items()
+        },
+        'stubs': {'orders': len(stubs['razorpay'].orders), 'razorpay_connections': stubs['razorpay'].connections,
+                  'emails': len(stubs['smtp'].messages), 'smtp_connections': stubs['smtp'].connections,
+                  'jwks_fetches': stubs['google'].fetches}
+    }
+
+
+def print_summary(result: Dict[str, Any]):
+    meta = result['meta']
+    print(f"{meta['users']} users x {meta['sessions']} sessions, {meta['rows']} rows, "
+          f"{result['requests']} requests in {result['elapsed_s']} s ({result['throughput_rps']} req/s)")
+    for route, entry in result['routes'].items():
+        errors = ", ".join(f"{k}: {v}" for k, v in entry['errors'].items())
+        if entry['count']:
+            print(f"  {route:<40} n={entry['count']:<5} p50 {entry['p50_ms']:>8.1f}  p95 {entry['p95_ms']:>8.1f}  "
+                  f"p99 {entry['p99_ms']:>8.1f} ms{'  errors ' + errors if errors else ''}")
+        else:
+            print(f"  {route:<40} errors {errors}")
+    for fmt, entry in result['reports'].items():
+        print(f"  report.{fmt:<33} n={entry['count']:<5} median {entry['median_s']} s, max {entry['max_s']} s")
+    print(f"  stubs: {result['stubs']['orders']} orders over {result['stubs']['razorpay_connections']} Razorpay connection(s), "
+          f"{result['stubs']['emails']} emails over {result['stubs']['smtp_connections']} SMTP connection(s), "
+          f"{result['stubs']['jwks_fetches']} Google JWKS fetch(es)")
+    for failure in result['failed_sessions']:
+        print(f"  FAILED {failure}")
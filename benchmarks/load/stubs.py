@@ -0,0 +1,290 @@
+"""
+Local stand-ins for the external services the app talks to, so the load
+harness never reaches Razorpay, a real SMTP server or Google.
+"""
+import base64
+import hashlib
+import hmac
+import http.server
+import itertools
+import json
+import socketserver
+import threading
+import time
+from typing import Dict, Any, List, Optional
+
+STUB_RAZORPAY_KEY_ID = "rzp_test_stub"
+STUB_RAZORPAY_SECRET = "stub-razorpay-secret"
+
+
+def razorpay_signature(order_id: str, payment_id: str, secret: str = STUB_RAZORPAY_SECRET) -> str:
+    """The signature Razorpay Checkout hands back to the browser after payment"""
+    return hmac.new(secret.encode(), f"{order_id}|{payment_id}".encode(), hashlib.sha256).hexdigest()
+
+
+class _RazorpayHandler(http.server.BaseHTTPRequestHandler):
+    """POST /v1/orders with HTTP basic auth, over keep-alive connections"""
+
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def respond(self, status: int, payload: Dict[str, Any]):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        server: "StubRazorpayServer" = self.server
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        expected = "Basic " + base64.b64encode(f"{server.key_id}:{server.secret}".encode()).decode()
+        if self.headers.get("Authorization") != expected:
+            return self.respond(401, {"error": {"code": "BAD_REQUEST_ERROR", "description": "Authentication failed"}})
+        if self.path != "/v1/orders":
+            return self.respond(404, {"error": {"code": "BAD_REQUEST_ERROR", "description": "The requested URL was not found"}})
+        if server.latency:
+            time.sleep(server.latency)
+        data = json.loads(body or b"{}")
+        with server.lock:
+            order_id = f"order_stub{next(server._ids):08d}"
+            order = {"id": order_id, "entity": "order", "amount": data["amount"], "currency": data["currency"],
+                     "receipt": data.get("receipt"), "status": "created", "notes": data.get("notes", {})}
+            server.orders[order_id] = order
+        self.respond(200, order)
+
+
+class StubRazorpayServer(http.server.ThreadingHTTPServer):
+    """
+    A local stand-in for the Razorpay orders API. It checks the API key, records
+    every order and counts TCP connections, so keep-alive reuse is visible.
+    latency adds a fixed delay per order. Use as a context manager or call
+    start()/stop().
+    """
+
+    daemon_threads = True
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, key_id: str = STUB_RAZORPAY_KEY_ID,
+                 secret: str = STUB_RAZORPAY_SECRET, latency: float = 0.0):
+        super().__init__((host, port), _RazorpayHandler)
+        self.key_id = key_id
+        self.secret = secret
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.orders: Dict[str, Dict[str, Any]] = {}
+        self.connections = 0
+        self._ids = itertools.count(1)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.server_address[0]}:{self.server_address[1]}"
+
+    def start(self) -> "StubRazorpayServer":
+        threading.Thread(target=self.serve_forever, name="stub-razorpay", daemon=True).start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    """One SMTP session: EHLO/HELO, AUTH PLAIN, MAIL, RCPT, DATA, RSET, NOOP, QUIT"""
+
+    def reply(self, text: str):
+        self.wfile.write(text.encode() + b"\r\n")
+
+    def handle(self):
+        server: "StubSMTPServer" = self.server
+        with server.lock:
+            server.connections += 1
+        self.reply("220 stub ESMTP ready")
+        mail_from, recipients, delivered = None, [], 0
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode("utf-8", "replace").rstrip("\r\n")
+            verb = command.split(" ", 1)[0].upper()
+            if verb == "EHLO":
+                self.reply("250-stub\r\n250-AUTH PLAIN\r\n250 8BITMIME")
+            elif verb == "HELO":
+                self.reply("250 stub")
+            elif verb == "AUTH":
+                self.reply("235 Authentication successful")
+            elif verb == "MAIL":
+                mail_from, recipients = command[10:].strip(), []
+                self.reply("250 OK")
+            elif verb == "RCPT":
+                recipients.append(command[8:].strip())
+                self.reply("250 OK")
+            elif verb == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                data = []
+                while True:
+                    chunk = self.rfile.readline()
+                    if not chunk or chunk in (b".\r\n", b".\n"):
+                        break
+                    data.append(chunk[1:] if chunk.startswith(b"..") else chunk)
+                with server.lock:
+                    server.messages.append({'from': mail_from, 'to': recipients, 'data': b"".join(data)})
+                self.reply("250 OK queued")
+                delivered += 1
+                if server.drop_after and delivered >= server.drop_after:
+                    # Simulate a server that closes long-lived connections
+                    return
+            elif verb == "RSET":
+                mail_from, recipients = None, []
+                self.reply("250 OK")
+            elif verb == "NOOP":
+                self.reply("250 OK")
+            elif verb == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("502 Command not implemented")
+
+
+class StubSMTPServer(socketserver.ThreadingTCPServer):
+    """
+    A local SMTP server that accepts any login and records every message.
+    drop_after closes each connection after that many messages, to exercise
+    client reconnects. Use as a context manager or call start()/stop().
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, drop_after: Optional[int] = None):
+        super().__init__((host, port), _SMTPHandler)
+        self.drop_after = drop_after
+        self.lock = threading.Lock()
+        self.messages: List[Dict[str, Any]] = []
+        self.connections = 0
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+    def start(self) -> "StubSMTPServer":
+        self._thread = threading.Thread(target=self.serve_forever, name="stub-smtp", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+class StubGoogleKeys:
+    """
+    A local RSA signing key standing in for Google's: jwks() is what the certs
+    endpoint would return, and id_token() signs ID tokens the app's verifier
+    accepts. Tokens signed by a StubGoogleKeys whose JWKS the app has not seen
+    exercise the unknown-key path.
+    """
+
+    def __init__(self, kid: str = "stub-key-1"):
+        from cryptography.hazmat.primitives import serialization
+        from cryptography.hazmat.primitives.asymmetric import rsa
+        from jose import jwk
+
+        self.kid = kid
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        self.private_pem = private_key.private_bytes(
+            serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+        )
+        public_pem = private_key.public_key().public_bytes(
+            serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+        )
+        self.public_jwk = {**jwk.RSAKey(public_pem, "RS256").to_dict(), "kid": kid, "use": "sig"}
+        self.fetches = 0
+
+    def jwks(self) -> Dict[str, Any]:
+        return {"keys": [self.public_jwk]}
+
+    def id_token(self, email: str, audience: str, lifetime: int = 3600, **claims) -> str:
+        from jose import jwt
+        now = int(time.time())
+        payload = {
+            "iss": "https://accounts.google.com",
+            "aud": audience,
+            "sub": hashlib.sha256(email.encode()).hexdigest()[:21],
+            "email": email,
+            "email_verified": True,
+            "name": email.split("@")[0],
+            "iat": now,
+            "exp": now + lifetime,
+            **claims
+        }
+        return jwt.encode(payload, self.private_pem.decode(), algorithm="RS256", headers={"kid": self.kid})
+
+
+class _StubResponse:
+    def __init__(self, status_code: int, payload: Dict[str, Any]):
+        self.status_code = status_code
+        self._payload = payload
+        self.text = json.dumps(payload)
+
+    def json(self):
+        return self._payload
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            import requests
+            raise requests.HTTPError(f"{self.status_code} Error")
+
+
+def install() -> Dict[str, Any]:
+    """
+    Point the app at the stubs: payments go through a fresh RazorpayGateway to a
+    StubRazorpayServer on a local port, mail goes to a StubSMTPServer on a local port, and requests.get serves a
+    StubGoogleKeys JWKS from Google's certs URL. Returns the stubs so the harness
+    can inspect them and sign Google ID tokens.
+    """
+    import requests
+    from backend.app.core.config import settings
+    from backend.app.services import payment_gateway
+
+    razorpay_server = StubRazorpayServer().start()
+    payment_gateway.gateway = payment_gateway.RazorpayGateway(
+        STUB_RAZORPAY_KEY_ID, STUB_RAZORPAY_SECRET, razorpay_server.base_url
+    )
+
+    smtp_server = StubSMTPServer().start()
+    settings.SMTP_HOST = "127.0.0.1"
+    settings.SMTP_PORT = smtp_server.port
+    settings.SMTP_STARTTLS = False
+
+    google_keys = StubGoogleKeys()
+    real_get = requests.get
+
+    def fake_get(url, *args, **kwargs):
+        if url == settings.GOOGLE_JWKS_URL:
+            google_keys.fetches += 1
+            return _StubResponse(200, google_keys.jwks())
+        return real_get(url, *args, **kwargs)
+
+    requests.get = fake_get
+    return {'razorpay': razorpay_server, 'smtp': smtp_server, 'google': google_keys}
@@ -0,0 +1,145 @@
+"""
+Login throughput under load: concurrent password logins against a local
+server, while a probe keeps calling a cheap authenticated route to show
+what the bcrypt work does to the rest of the app.
+
+Accounts are seeded with hashes at --seed-rounds and the server runs with
+BCRYPT_ROUNDS=--rounds, so when the two differ the first wave also measures
+rehash-on-login and the second wave runs at the new cost.
+
+    python -m benchmarks.login --accounts 100 --logins 200 --concurrency 32 --seed-rounds 12 --rounds 10
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any
+
+PASSWORD = "benchmark-password"
+PROBE_INTERVAL = 0.02
+
+
+def run_wave(base_url: str, accounts: int, logins: int, concurrency: int, probe_token: str) -> Dict[str, Any]:
+    """logins password logins, concurrency at a time, with /api/auth/me probed throughout"""
+    from benchmarks.load.harness import Client, HttpError, Recorder, _percentiles
+
+    recorder = Recorder()
+    done = threading.Event()
+
+    def probe():
+        client = Client(base_url, recorder)
+        client.token = probe_token
+        while not done.is_set():
+            client.request("GET", "/api/auth/me")
+            time.sleep(PROBE_INTERVAL)
+
+    def login(index: int):
+        client = Client(base_url, recorder)
+        body = urllib.parse.urlencode({"username": f"login{index % accounts}@example.com", "password": PASSWORD})
+        try:
+            client.request("POST", "/api/auth/login", body=body.encode(), content_type="application/x-www-form-urlencoded")
+        except HttpError:
+            pass
+
+    probe_thread = threading.Thread(target=probe, daemon=True)
+    probe_thread.start()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(login, range(logins)))
+    elapsed = time.perf_counter() - start
+    done.set()
+    probe_thread.join()
+
+    login_latencies = recorder.latencies["/api/auth/login"]
+    errors = dict(recorder.errors.get("/api/auth/login", {}))
+    succeeded = len(login_latencies) - sum(errors.values())
+    return {
+        'elapsed_s': round(elapsed, 2),
+        'logins_per_s': round(succeeded / elapsed, 1),
+        'login': {**_percentiles(login_latencies), 'errors': errors},
+        'probe': {'count': len(recorder.latencies["/api/auth/me"]), **_percentiles(recorder.latencies["/api/auth/me"])}
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.login", description="Password login throughput benchmark")
+    parser.add_argument("--accounts", type=int, default=100, help="seeded user accounts")
+    parser.add_argument("--logins", type=int, default=200, help="logins per wave")
+    parser.add_argument("--concurrency", type=int, default=32, help="concurrent login requests")
+    parser.add_argument("--seed-rounds", type=int, default=12, help="bcrypt cost of the seeded hashes")
+    parser.add_argument("--rounds", type=int, default=12, help="BCRYPT_ROUNDS for the server")
+    parser.add_argument("--workers", type=int, help="PASSWORD_HASH_WORKERS for the server")
+    parser.add_argument("--output", help="write the JSON result here")
+    args = parser.parse_args(argv)
+    warnings.simplefilter("ignore")
+
+    output = os.path.abspath(args.output) if args.output else None
+    # Settings are read when the backend is imported: configure it first, on a scratch database
+    workdir = tempfile.mkdtemp(prefix="exceldrill-login-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'login.db')}"
+    os.environ["BCRYPT_ROUNDS"] = str(args.rounds)
+    if args.workers:
+        os.environ["PASSWORD_HASH_WORKERS"] = str(args.workers)
+    sys.path.insert(0, os.getcwd())
+    os.chdir(workdir)
+
+    import bcrypt
+    from backend.main import app
+    from backend.app.core import security
+    from backend.app.core.config import settings
+    from backend.app.db.session import SessionLocal
+    from backend.app.models.user import User
+    from benchmarks.load.harness import ServerThread
+
+    # One hash for every account: seeding stays fast at any cost
+    seed_hash = bcrypt.hashpw(PASSWORD.encode(), bcrypt.gensalt(rounds=args.seed_rounds)).decode()
+    db = SessionLocal()
+    db.add_all([
+        User(email=f"login{i}@example.com", hashed_password=seed_hash, is_verified=True, is_active=True)
+        for i in range(args.accounts)
+    ])
+    db.commit()
+    db.close()
+    probe_token = security.create_access_token("login0@example.com")
+
+    result: Dict[str, Any] = {
+        'meta': {'accounts': args.accounts, 'logins': args.logins, 'concurrency': args.concurrency,
+                 'seed_rounds': args.seed_rounds, 'rounds': settings.BCRYPT_ROUNDS,
+                 'workers': settings.PASSWORD_HASH_WORKERS},
+        'waves': []
+    }
+    with ServerThread(app) as server:
+        for wave in ("first", "second"):
+            entry = run_wave(server.base_url, args.accounts, args.logins, args.concurrency, probe_token)
+            db = SessionLocal()
+            entry['rehashed_accounts'] = sum(
+                1 for (hashed,) in db.query(User.hashed_password).filter(User.email.like("login%"))
+                if not security.needs_rehash(hashed)
+            ) if args.seed_rounds != args.rounds else 0
+            db.close()
+            result['waves'].append({'wave': wave, **entry})
+
+    meta = result['meta']
+    print(f"{meta['logins']} logins x 2 waves, {meta['concurrency']} concurrent, bcrypt {meta['seed_rounds']} -> "
+          f"{meta['rounds']} rounds, {meta['workers']} hashing worker(s)")
+    for entry in result['waves']:
+        login, probe = entry['login'], entry['probe']
+        errors = ", ".join(f"{k}: {v}" for k, v in login['errors'].items())
+        print(f"  {entry['wave']:<7} {entry['logins_per_s']:>7.1f} logins/s  login p50 {login['p50_ms']:>8.1f} "
+              f"p95 {login['p95_ms']:>8.1f} ms  probe p50 {probe['p50_ms']:>6.1f} p95 {probe['p95_ms']:>6.1f} ms  "
+              f"rehashed {entry['rehashed_accounts']}{'  errors ' + errors if errors else ''}")
+    if output:
+        with open(output, "w") as f:
+            json.dump(result, f, indent=2)
+        print(f"Results written to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
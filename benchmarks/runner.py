@@ -0,0 +1,119 @@
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+import numpy as np
+import pandas as pd
+from backend.app.core.instrumentation import PhaseTimer
+from benchmarks.cases import CASES, BenchmarkCase, BenchmarkContext
+from benchmarks.datasets import TIERS, make_dataset
+
+
+def _selected(case: BenchmarkCase, patterns: Optional[List[str]]) -> bool:
+    return not patterns or any(p in case.name for p in patterns)
+
+
+def _run_case(case: BenchmarkCase, ctx: BenchmarkContext, repeat: int, warmup: int, memory: bool) -> Dict[str, Any]:
+    for _ in range(warmup):
+        case.fn(ctx, PhaseTimer())
+
+    wall, cpu, peaks = [], [], []
+    phases: Dict[str, Dict[str, float]] = {}
+    for _ in range(repeat):
+        with PhaseTimer(trace_memory=memory) as timer:
+            with timer.span("total"):
+                case.fn(ctx, timer)
+        total = timer.spans[-1]
+        wall.append(total['wall_ms'])
+        cpu.append(total['cpu_ms'])
+        if total['peak_memory_mb'] is not None:
+            peaks.append(total['peak_memory_mb'])
+        phases = {name: entry for name, entry in timer.totals().items() if name != "total"}
+
+    return {
+        'wall_ms': wall,
+        'median_ms': round(statistics.median(wall), 2),
+        'min_ms': round(min(wall), 2),
+        'cpu_ms': round(statistics.median(cpu), 2),
+        'peak_memory_mb': max(peaks) if peaks else None,
+        # Phase breakdown of the last repeat
+        'phases': phases
+    }
+
+
+def run_benchmarks(tiers: List[str], patterns: Optional[List[str]] = None, repeat: int = 3, warmup: int = 1,
+                   memory: bool = False) -> Dict[str, Any]:
+    """Run the selected cases on each tier and return a JSON-serializable result document"""
+    results = []
+    for tier in tiers:
+        spec = TIERS[tier]
+        df = make_dataset(spec)
+        ctx = BenchmarkContext(df)
+        print(f"[{tier}] {spec.rows} rows x {len(df.columns)} columns")
+
+        for case in CASES:
+            if not _selected(case, patterns):
+                continue
+            if case.max_rows is not None and spec.rows > case.max_rows:
+                print(f"  {case.name:<36} skipped (> {case.max_rows} rows)")
+                continue
+            try:
+                measured = _run_case(case, ctx, repeat, warmup, memory)
+            except Exception as e:
+                print(f"  {case.name:<36} FAILED: {e}")
+                results.append({'case': case.name, 'tier': tier, 'rows': spec.rows, 'error': str(e)})
+                continue
+            memory_note = f", peak {measured['peak_memory_mb']:.1f} MB" if measured['peak_memory_mb'] is not None else ""
+            print(f"  {case.name:<36} {measured['median_ms']:>10.1f} ms{memory_note}")
+            results.append({'case': case.name, 'tier': tier, 'rows': spec.rows, **measured})
+
+    return {
+        'meta': {
+            'created_at': datetime.utcnow().isoformat(),
+            'python': sys.version.split()[0],
+            'platform': platform.platform(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'repeat': repeat,
+            'warmup': warmup,
+            'memory': memory,
+            'tiers': {tier: TIERS[tier].to_dict() for tier in tiers}
+        },
+        'results': results
+    }
+
+
+def write_results(document: Dict[str, Any], path: Optional[str] = None) -> str:
+    if path is None:
+        directory = os.path.join(os.path.dirname(__file__), "results")
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"bench-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    with open(path, "w") as f:
+        json.dump(document, f, indent=2)
+    return path
+
+
+def compare_results(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float = 0.15) -> List[Dict[str, Any]]:
+    """
+    Compare median wall times case by case. Returns one row per case present in
+    both runs; rows slower than baseline by more than threshold are marked.
+    """
+    before = {(r['case'], r['tier']): r for r in baseline['results'] if 'median_ms' in r}
+    rows = []
+    for result in current['results']:
+        key = (result['case'], result['tier'])
+        if 'median_ms' not in result or key not in before:
+            continue
+        old = before[key]['median_ms']
+        new = result['median_ms']
+        change = (new - old) / old if old > 0 else 0.0
+        rows.append({
+            'case': result['case'], 'tier': result['tier'],
+            'baseline_ms': old, 'current_ms': new, 'change': round(change, 4),
+            'regression': change > threshold
+        })
+    return rows
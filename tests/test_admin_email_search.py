@@ -0,0 +1,44 @@
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+from sqlalchemy.schema import CreateIndex
+
+from backend.app.api.admin import _email_prefix_match
+from backend.app.db.base import Base
+from backend.app.db.session import build_engine
+from backend.app.models.user import User
+
+EMAILS = ["A_B@example.com", "axb@example.com", "a%c@example.com", "abc@example.com", "a\\d@example.com"]
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = build_engine(f"sqlite:///{tmp_path / 'app.db'}")
+    Base.metadata.create_all(bind=engine)
+    with Session(engine) as session:
+        session.add_all(User(email=email, hashed_password="x") for email in EMAILS)
+        session.commit()
+        yield session
+    engine.dispose()
+
+
+# Both forms run against SQLite here: LIKE ... ESCAPE behaves the same on Postgres
+@pytest.mark.parametrize("dialect", ["sqlite", "postgresql"])
+@pytest.mark.parametrize("prefix, expected", [
+    ("a_", ["A_B@example.com"]),
+    ("A%", ["a%c@example.com"]),
+    ("a\\", ["a\\d@example.com"]),
+    ("ab", ["abc@example.com"]),
+    ("a", EMAILS),
+])
+def test_email_prefix_treats_wildcards_literally(db, dialect, prefix, expected):
+    query = select(User.email).where(_email_prefix_match(prefix, dialect))
+    assert sorted(db.scalars(query)) == sorted(expected)
+
+
+def test_postgres_uses_like_and_a_pattern_ops_index():
+    clause = _email_prefix_match("a_", "postgresql").compile(dialect=postgresql.dialect())
+    assert "LIKE" in str(clause) and "ESCAPE" in str(clause)
+    index = next(i for i in User.__table__.indexes if i.name == "ix_user_email_lower")
+    assert "lower(email) text_pattern_ops" in str(CreateIndex(index).compile(dialect=postgresql.dialect()))
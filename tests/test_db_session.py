@@ -0,0 +1,36 @@
+import asyncio
+
+import pytest
+from sqlalchemy import select, text
+
+from backend.app.db.base import Base
+from backend.app.db.session import _async_url, build_async_sessionmaker, build_engine
+from backend.app.models.user import User
+
+
+def test_async_url_maps_drivers_and_sslmode():
+    assert _async_url("sqlite:///./app.db") == "sqlite+aiosqlite:///./app.db"
+    assert _async_url("postgresql://u:p@db:5432/app?sslmode=require") == "postgresql+asyncpg://u:p@db:5432/app?ssl=require"
+    assert _async_url("mysql://u:p@db/app") is None
+
+
+def test_async_session_round_trip(tmp_path):
+    pytest.importorskip("aiosqlite")
+    pytest.importorskip("greenlet")
+    url = f"sqlite:///{tmp_path / 'app.db'}"
+    Base.metadata.create_all(bind=build_engine(url))
+    session_factory = build_async_sessionmaker(url)
+
+    async def run():
+        async with session_factory() as db:
+            db.add(User(email="async@example.com", hashed_password="x", preferred_color_scheme="async"))
+            await db.commit()
+        async with session_factory() as db:
+            user = (await db.execute(select(User).where(User.email == "async@example.com"))).scalar_one()
+            journal_mode = (await db.execute(text("PRAGMA journal_mode"))).scalar_one()
+        await session_factory.kw["bind"].dispose()
+        return user, journal_mode
+
+    user, journal_mode = asyncio.run(run())
+    assert user.preferred_color_scheme == "async"
+    assert journal_mode == "wal"
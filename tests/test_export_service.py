@@ -0,0 +1,39 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.app.services.export_service import ExportService
+
+pq = pytest.importorskip("pyarrow.parquet")
+
+
+def _parquet(service, df):
+    return pq.read_table(io.BytesIO(b"".join(service.stream(df, "parquet")))).to_pandas()
+
+
+def test_parquet_schema_comes_from_a_bounded_sample():
+    service = ExportService()
+    service.SCHEMA_SAMPLE_ROWS = 100
+    service.CHUNK_ROWS = 250
+    df = pd.DataFrame({
+        "amount": np.arange(1000, dtype=float),
+        "late": [None] * 998 + ["only value", None],
+    })
+
+    # The column that is empty in the spread sample contributes its first value
+    assert len(service._schema_sample(df)) == service.SCHEMA_SAMPLE_ROWS + 1
+    pd.testing.assert_frame_equal(_parquet(service, df), df)
+
+
+def test_parquet_chunk_outside_the_sample_names_the_column():
+    service = ExportService()
+    service.SCHEMA_SAMPLE_ROWS = 10
+    service.CHUNK_ROWS = 100
+    values = list(range(1000))
+    values[556] = "not a number"  # not among the sampled rows
+    df = pd.DataFrame({"id": range(1000), "mixed": pd.Series(values, dtype=object)})
+
+    with pytest.raises(ValueError, match="column 'mixed'"):
+        b"".join(service.stream(df, "parquet"))
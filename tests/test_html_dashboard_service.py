@@ -0,0 +1,60 @@
+import json
+import numpy as np
+import pandas as pd
+from backend.app.services.html_dashboard_service import HtmlDashboardService
+
+
+def test_box_stats_skips_pairs_without_finite_values():
+    df = pd.DataFrame({'empty_score': [np.nan] * 50, 'v': np.arange(50.), 'grp': ['a', 'b'] * 25})
+    service = HtmlDashboardService()
+    assert service._box_stats(df, 'grp', 'empty_score') is None
+    assert service.generate_dashboard(df, {}, []).getvalue()
+
+
+def test_box_stats_ignores_infinities():
+    df = pd.DataFrame({'grp': ['a', 'b'] * 5, 'v': [1.0, 2.0, np.inf, 4.0, 5.0, -np.inf, 7.0, 8.0, 9.0, 10.0]})
+    stats = HtmlDashboardService()._box_stats(df, 'grp', 'v')
+    assert stats['x'] == ['a', 'b']
+    assert all(np.isfinite(v) for key in ('q1', 'median', 'q3', 'mean', 'lowerfence', 'upperfence') for v in stats[key])
+    assert stats['mean'] == [np.mean([1.0, 5.0, 7.0, 9.0]), np.mean([2.0, 4.0, 8.0, 10.0])]
+
+
+def _script_json(html: str, element_id: str):
+    start = html.index(f'id="{element_id}">') + len(f'id="{element_id}">')
+    text = html[start:html.index('</script>', start)].replace('<\\/', '</')
+
+    def reject(constant):
+        raise ValueError(f"non-finite {constant} in payload")
+
+    # parse_constant: JSON.parse in the browser rejects NaN/Infinity too
+    return json.loads(text, parse_constant=reject)
+
+
+def test_client_payload_has_no_non_finite_values():
+    rng = np.random.default_rng(0)
+    v = rng.normal(size=200)
+    v[::17] = np.inf
+    # inf in a box-plot column; a constant column gives NaN correlations in the heatmap
+    df = pd.DataFrame({'grp': rng.choice(['a', 'b', 'c'], 200), 'v': v, 'w': rng.normal(size=200), 'flat': 5.0})
+    html = HtmlDashboardService().generate_dashboard(df, {}, [], render_mode="client", compress_data=False).getvalue().decode()
+    specs = _script_json(html, "dashboard-specs")['specs']
+    assert any(spec['kind'] == 'box' for spec in specs)
+    _script_json(html, "dashboard-data")
+
+
+def test_data_block_keeps_small_scale_values():
+    a = np.linspace(1, 2, 50)
+    df = pd.DataFrame({'tiny': a * 1e-8, 'huge': a * 1e12, 'count': np.arange(50) * 1000003})
+    block = HtmlDashboardService()._build_data_block(df, [{'kind': 'scatter', 'x': 'tiny', 'y': 'huge'},
+                                                          {'kind': 'scatter', 'x': 'count', 'y': 'tiny'}], compress=False)
+    data = _script_json(block, "dashboard-data")
+    np.testing.assert_allclose(data['tiny']['v'], a * 1e-8, rtol=1e-6)
+    np.testing.assert_allclose(data['huge']['v'], a * 1e12, rtol=1e-6)
+    assert data['count']['v'] == (np.arange(50) * 1000003).tolist()
+
+
+def test_json_safe_maps_non_finite_to_null():
+    spec = {'mean': [1.5, np.inf, -np.inf, np.float32(np.nan)], 'z': np.array([[0.5, np.nan]]), 'n': np.int64(3)}
+    safe = HtmlDashboardService()._json_safe(spec)
+    assert safe == {'mean': [1.5, None, None, None], 'z': [[0.5, None]], 'n': 3}
+    json.dumps(safe, allow_nan=False)
@@ -0,0 +1,50 @@
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+from backend.app.core.metrics import HTTP_REQUESTS, UNMATCHED_ROUTE, MetricsMiddleware
+
+
+def _app():
+    router = APIRouter()
+
+    @router.get("/files/{name}")
+    def get_file(name: str):
+        return {"name": name}
+
+    @router.post("/files/{name}/tags/{tag}")
+    def tag_file(name: str, tag: str):
+        return {"name": name, "tag": tag}
+
+    app = FastAPI()
+    app.include_router(router, prefix="/metrics-test")
+    app.add_middleware(MetricsMiddleware)
+    return app
+
+
+def _count(method, route, status):
+    return HTTP_REQUESTS._values.get((method, route, str(status)), 0)
+
+
+def test_route_label_is_the_matched_template():
+    client = TestClient(_app())
+    before = _count("GET", "/metrics-test/files/{name}", 200)
+    tag_before = _count("POST", "/metrics-test/files/{name}/tags/{tag}", 200)
+
+    # Parameter values that repeat a literal segment must not leak into the label
+    client.get("/metrics-test/files/files")
+    client.get("/metrics-test/files/1234")
+    client.post("/metrics-test/files/tags/tags/tags")
+
+    assert _count("GET", "/metrics-test/files/{name}", 200) == before + 2
+    assert _count("POST", "/metrics-test/files/{name}/tags/{tag}", 200) == tag_before + 1
+
+
+def test_unmatched_paths_share_one_label():
+    client = TestClient(_app())
+    before = _count("GET", UNMATCHED_ROUTE, 404)
+
+    client.get("/metrics-test/nothing/here")
+    client.get("/some/other/path")
+
+    assert _count("GET", UNMATCHED_ROUTE, 404) == before + 2
+    assert not any(route.startswith("/some") for _, route, _ in HTTP_REQUESTS._values)